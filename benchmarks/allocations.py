@@ -0,0 +1,80 @@
+"""Counts the objects created per breakpoint by the PLF kernels.
+
+The constructors of Point and Line are wrapped to count how many instances each
+kernel creates, which is divided by the number of breakpoints of its inputs.
+
+Usage: PYTHONPATH=src python benchmarks/allocations.py
+"""
+
+import random
+import timeit
+from collections import Counter
+from typing import Callable
+
+from rtcvis.line import Line
+from rtcvis.plf import PLF, match_plf, plf_min_max
+from rtcvis.point import Point
+
+N = 10_000
+REPEAT = 20
+
+
+def _random_plf(seed: int) -> PLF:
+    rng = random.Random(seed)
+    xs = sorted(rng.uniform(0, N) for _ in range(N))
+    return PLF([(x, rng.uniform(-1, 1)) for x in xs])
+
+
+def _count_objects(func: Callable[[], object]) -> Counter:
+    counts: Counter = Counter()
+    originals = {cls: cls.__init__ for cls in (Point, Line)}
+
+    def counting(cls):
+        original = originals[cls]
+
+        def __init__(self, *args, **kwargs):
+            counts[cls.__name__] += 1
+            original(self, *args, **kwargs)
+
+        return __init__
+
+    for cls in originals:
+        cls.__init__ = counting(cls)  # type: ignore[method-assign]
+    try:
+        func()
+    finally:
+        for cls, original in originals.items():
+            cls.__init__ = original  # type: ignore[method-assign]
+    return counts
+
+
+def main() -> None:
+    a, b = _random_plf(1), _random_plf(2)
+    # every third point is on a line with its neighbors
+    collinear = PLF(
+        [
+            (x, a.y[i // 3 * 3] if i % 3 == 1 else y)
+            for i, (x, y) in enumerate(zip(a.x, a.y))
+        ]
+    )
+    # the kernels and the number of breakpoints of their inputs
+    kernels: dict[str, tuple[Callable[[], object], int]] = {
+        "match_plf": (lambda: match_plf(a, b), 2 * N),
+        "plf_min_max": (lambda: plf_min_max(a, b, compute_min=True), 2 * N),
+        "simplified": (
+            lambda: PLF._from_points(list(collinear.points)).simplified(),
+            N,
+        ),
+    }
+    print(f"{'kernel':<12} {'Point/bp':>9} {'Line/bp':>9} {'time':>10}")
+    for name, (func, breakpoints) in kernels.items():
+        counts = _count_objects(func)
+        seconds = timeit.timeit(func, number=REPEAT) / REPEAT
+        print(
+            f"{name:<12} {counts['Point'] / breakpoints:>9.3f}"
+            + f" {counts['Line'] / breakpoints:>9.3f} {seconds * 1e3:>8.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
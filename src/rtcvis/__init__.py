@@ -1,20 +1,88 @@
-from rtcvis.conv import ConvProperties, ConvType, conv, conv_at_x
+from rtcvis.chain import ConvPlan, conv_chain, plan_conv_chain
+from rtcvis.closure import conv_power, subadditive_closure
+from rtcvis.conv import (
+    ConvProperties,
+    ConvProvenance,
+    ConvSweep,
+    ConvType,
+    conv,
+    conv_at_x,
+    conv_at_x_many,
+    conv_properties,
+    conv_with_provenance,
+    iter_conv,
+)
+from rtcvis.deviation import Deviation, horizontal_deviation, vertical_deviation
+from rtcvis.families import RateLatency, TokenBucket
 from rtcvis.plf import PLF
 from rtcvis.point import Point
+from rtcvis.sliding import sliding_window_extremum
+from rtcvis.upp import UltimatelyPeriodicPLF, upp_conv, upp_min_max
 
-try:
-    from rtcvis.plot_conv import plot_conv
-    from rtcvis.plot_plf import plot_plfs
-except ModuleNotFoundError:
-    pass
-
-__all__ = (
+__all__ = [
     "Point",
     "PLF",
     "ConvType",
     "conv",
     "conv_at_x",
-    "plot_plfs",
-    "plot_conv",
+    "conv_at_x_many",
     "ConvProperties",
-)
+    "conv_properties",
+    "ConvProvenance",
+    "conv_with_provenance",
+    "ConvSweep",
+    "iter_conv",
+    "UltimatelyPeriodicPLF",
+    "upp_min_max",
+    "upp_conv",
+    "conv_power",
+    "subadditive_closure",
+    "conv_chain",
+    "plan_conv_chain",
+    "ConvPlan",
+    "Deviation",
+    "vertical_deviation",
+    "horizontal_deviation",
+    "sliding_window_extremum",
+    "RateLatency",
+    "TokenBucket",
+]
+
+# the optional parts are only exported if their dependencies are available, so that
+# "from rtcvis import *" works everywhere
+try:
+    from rtcvis.plot_conv import plot_conv
+    from rtcvis.plot_plf import plot_plfs
+
+    __all__ += ["plot_plfs", "plot_conv"]
+except ModuleNotFoundError:
+    pass
+
+try:
+    from rtcvis.numpy_plf import NumpyPLF
+
+    __all__ += ["NumpyPLF"]
+except ModuleNotFoundError:
+    pass
+
+try:
+    # worker processes are not available everywhere, e.g. in pyodide
+    from rtcvis.parallel import (
+        ConvPool,
+        conv_many,
+        conv_many_unordered,
+        parallel_add,
+        parallel_conv,
+        parallel_min_max,
+    )
+
+    __all__ += [
+        "ConvPool",
+        "conv_many",
+        "conv_many_unordered",
+        "parallel_conv",
+        "parallel_min_max",
+        "parallel_add",
+    ]
+except ModuleNotFoundError:
+    pass
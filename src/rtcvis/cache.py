@@ -0,0 +1,151 @@
+import functools
+import inspect
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, NamedTuple, ParamSpec, TypeVar
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of an LRUCache."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class LRUCache:
+    def __init__(self, maxsize: int = 128) -> None:
+        """A thread-safe mapping that keeps the most recently used entries.
+
+        Args:
+            maxsize (int, optional): The maximum number of entries. If it is 0, nothing
+                is stored. Defaults to 128.
+        """
+        self._lock = threading.Lock()
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        self._maxsize = maxsize
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize: int) -> None:
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict()
+
+    def _evict(self) -> None:
+        """Removes the least recently used entries until the size limit is met."""
+        while len(self._data) > max(self._maxsize, 0):
+            self._data.popitem(last=False)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], R]) -> R:
+        """Returns the stored value for key or computes and stores it.
+
+        The lock is not held while computing the value, so two threads may compute
+        the same value at the same time.
+
+        Args:
+            key (Hashable): The key.
+            compute (Callable[[], R]): Computes the value if it's not stored yet.
+
+        Returns:
+            R: The value.
+        """
+        with self._lock:
+            if key in self._data:
+                self._hits += 1
+                self._data.move_to_end(key)
+                return self._data[key]
+            self._misses += 1
+
+        value = compute()
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._evict()
+        return value
+
+    def info(self) -> CacheInfo:
+        """Returns the statistics of this cache.
+
+        Returns:
+            CacheInfo: The number of hits and misses, the maximum and current size.
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._maxsize, len(self._data))
+
+    def clear(self) -> None:
+        """Removes all entries and resets the statistics."""
+        with self._lock:
+            self._data.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+class Memoized(Generic[P, R]):
+    def __init__(self, func: Callable[P, R], maxsize: int = 128) -> None:
+        """Wraps a function and caches its results in an LRUCache.
+
+        The arguments are normalized using the function's signature, so it doesn't
+        matter whether they are passed by position or by keyword. The key contains the
+        type of each argument as well, since subclasses like RateLatency compare equal
+        to a PLF with the same points but may produce results of another type. Calls
+        with unhashable arguments are not cached. The returned objects are shared
+        between all calls with equal arguments and must not be modified.
+
+        Args:
+            func (Callable[P, R]): The function.
+            maxsize (int, optional): The maximum number of cached results. Defaults
+                to 128.
+        """
+        self._func = func
+        self.__wrapped__ = func
+        self._signature = inspect.signature(func)
+        self.cache = LRUCache(maxsize)
+        functools.update_wrapper(self, func)
+
+    def __call__(self, *args: P.args, **kwargs: P.kwargs) -> R:
+        bound = self._signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = tuple((type(value), value) for value in bound.arguments.values())
+        try:
+            hash(key)
+        except TypeError:
+            return self._func(*args, **kwargs)
+        return self.cache.get_or_compute(key, lambda: self._func(*args, **kwargs))
+
+    def cache_info(self) -> CacheInfo:
+        """Returns the statistics of the cache."""
+        return self.cache.info()
+
+    def cache_clear(self) -> None:
+        """Clears the cache."""
+        self.cache.clear()
+
+
+def memoized(maxsize: int = 128) -> Callable[[Callable[P, R]], Memoized[P, R]]:
+    """Decorator which caches the results of a function in an LRUCache.
+
+    The cached results are shared between all callers and must not be modified.
+
+    Args:
+        maxsize (int, optional): The maximum number of cached results. Defaults to
+            128.
+
+    Returns:
+        Callable[[Callable[P, R]], Memoized[P, R]]: The decorator.
+    """
+
+    def decorator(func: Callable[P, R]) -> Memoized[P, R]:
+        return Memoized(func, maxsize=maxsize)
+
+    return decorator
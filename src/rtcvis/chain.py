@@ -0,0 +1,181 @@
+import heapq
+import math
+from typing import NamedTuple, Optional, Sequence
+
+from rtcvis.conv import ConvType, conv
+from rtcvis.exceptions import RTCVisException, ValidationException
+from rtcvis.plf import PLF
+from rtcvis.point import Point
+
+
+class ConvPlan(NamedTuple):
+    """The evaluation order that conv_chain chose for a part of the chain.
+
+    A plan without children is a leaf: either a single operand or a group of
+    adjacent convex (concave for max-plus) operands which are fused into one slope
+    merge. Otherwise, the results of both children are convolved.
+    """
+
+    operands: tuple[int, ...]
+    """The indices of the operands this part of the chain consists of."""
+    cost: float
+    """The estimated cost of computing this part, including its children."""
+    size: float
+    """The estimated number of points of the result of this part."""
+    left: Optional["ConvPlan"] = None
+    right: Optional["ConvPlan"] = None
+
+    @property
+    def is_fused(self) -> bool:
+        return self.left is None and len(self.operands) > 1
+
+    def __str__(self) -> str:
+        if self.left is None or self.right is None:
+            names = ", ".join(f"c{i}" for i in self.operands)
+            return f"merge({names})" if self.is_fused else names
+        return f"({self.left} * {self.right})"
+
+
+class ConvChainResult(NamedTuple):
+    """The result of conv_chain and the plan that was used to compute it."""
+
+    result: PLF
+    plan: ConvPlan
+
+
+def _is_mergeable(plf: PLF, conv_type: ConvType) -> bool:
+    """Whether the PLF can be convolved with a slope merge."""
+    if conv_type == ConvType.MIN_PLUS_CONV:
+        return plf.is_convex
+    return plf.is_concave
+
+
+def _conv_slope_merge_many(plfs: Sequence[PLF], compute_min: bool) -> PLF:
+    """Convolution of any number of convex (or concave) PLFs.
+
+    Like _conv_slope_merge, but all segments are merged at once, which takes
+    O(n log k) for k PLFs with n points in total.
+    """
+
+    def segments(plf: PLF) -> list[tuple[float, float, float]]:
+        xs, ys = plf.x, plf.y
+        return [
+            (
+                (ys[i + 1] - ys[i]) / (xs[i + 1] - xs[i]),
+                xs[i + 1] - xs[i],
+                ys[i + 1] - ys[i],
+            )
+            for i in range(len(xs) - 1)
+            if xs[i + 1] != xs[i]
+        ]
+
+    x = sum(plf.x_start for plf in plfs)
+    y = sum(plf.y[0] for plf in plfs)
+    points = [Point(x, y)]
+    for _, dx, dy in heapq.merge(
+        *(segments(plf) for plf in plfs),
+        key=lambda s: s[0] if compute_min else -s[0],
+    ):
+        x, y = x + dx, y + dy
+        points.append(Point(x, y))
+    return PLF._from_points(points).simplified()
+
+
+def _pair_estimate(n: float, m: float, mergeable: bool) -> tuple[float, float]:
+    """Estimates the cost and result size of convolving PLFs with n and m points."""
+    if mergeable:
+        return n + m, n + m - 1
+    # the general algorithm creates a candidate segment for each pair of points and
+    # the envelope of these can have as many segments in the worst case
+    return n * m, n * m
+
+
+def plan_conv_chain(plfs: Sequence[PLF], conv_type: ConvType) -> ConvPlan:
+    """Chooses the order in which a chain of convolutions is computed.
+
+    The order is chosen with the dynamic program for matrix chain multiplication.
+    Convolving two PLFs with n and m points is assumed to cost n + m and create
+    n + m - 1 points if both are convex (for min-plus) or concave (for max-plus).
+    Otherwise, the cost and the number of points are assumed to be n * m, which is an
+    upper bound that favors convolving small operands first. A run of k adjacent
+    convex/concave operands with n points in total can also be fused into a single
+    slope merge, which is assumed to cost n * log2(k). It is used if it is at most as
+    expensive as convolving the operands in pairs.
+
+    Args:
+        plfs (Sequence[PLF]): The operands of the chain.
+        conv_type (ConvType): MIN_PLUS_CONV or MAX_PLUS_CONV.
+
+    Returns:
+        ConvPlan: The plan for the whole chain.
+    """
+    if conv_type.is_deconv:
+        raise RTCVisException("Only chains of convolutions are supported.")
+    if len(plfs) == 0:
+        raise ValidationException("The chain must have at least one operand.")
+
+    # best[i][j] is the best plan for the operands i to j
+    n = len(plfs)
+    sizes = [float(len(plf.points)) for plf in plfs]
+    best = [[ConvPlan((i,), 0.0, sizes[i])] * n for i in range(n)]
+    all_mergeable = [[_is_mergeable(plf, conv_type)] * n for plf in plfs]
+    for length in range(2, n + 1):
+        for i in range(n - length + 1):
+            j = i + length - 1
+            all_mergeable[i][j] = all_mergeable[i][j - 1] and all_mergeable[j][j]
+            plan: Optional[ConvPlan] = None
+            if all_mergeable[i][j]:
+                # a k-way merge of the segments of all operands
+                total = sum(sizes[i : j + 1])
+                plan = ConvPlan(
+                    tuple(range(i, j + 1)),
+                    total * math.log2(length),
+                    total - length + 1,
+                )
+            for s in range(i, j):
+                left, right = best[i][s], best[s + 1][j]
+                cost, size = _pair_estimate(
+                    left.size,
+                    right.size,
+                    all_mergeable[i][s] and all_mergeable[s + 1][j],
+                )
+                cost += left.cost + right.cost
+                if plan is None or cost < plan.cost:
+                    plan = ConvPlan(
+                        left.operands + right.operands, cost, size, left, right
+                    )
+            assert plan is not None
+            best[i][j] = plan
+    return best[0][n - 1]
+
+
+def _execute(plan: ConvPlan, plfs: Sequence[PLF], conv_type: ConvType) -> PLF:
+    if plan.left is None or plan.right is None:
+        if plan.is_fused:
+            return _conv_slope_merge_many(
+                [plfs[i] for i in plan.operands],
+                compute_min=conv_type == ConvType.MIN_PLUS_CONV,
+            )
+        return plfs[plan.operands[0]]
+    return conv(
+        _execute(plan.left, plfs, conv_type),
+        _execute(plan.right, plfs, conv_type),
+        conv_type,
+    )
+
+
+def conv_chain(plfs: Sequence[PLF], conv_type: ConvType) -> ConvChainResult:
+    """Computes the convolution of a chain of PLFs, e.g. of service curves in tandem.
+
+    Convolutions are associative, but their cost depends on the size and shape of the
+    operands. The order is chosen by plan_conv_chain.
+
+    Args:
+        plfs (Sequence[PLF]): The operands of the chain.
+        conv_type (ConvType): MIN_PLUS_CONV or MAX_PLUS_CONV.
+
+    Returns:
+        ConvChainResult: The result and the plan that was used.
+    """
+    plan = plan_conv_chain(plfs, conv_type)
+    return ConvChainResult(_execute(plan, plfs, conv_type), plan)
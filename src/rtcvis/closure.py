@@ -0,0 +1,123 @@
+from typing import Optional
+
+from rtcvis.conv import ConvType, conv
+from rtcvis.exceptions import RTCVisException, ValidationException
+from rtcvis.plf import PLF, plf_min_max_merged
+
+
+def _check_conv_type(conv_type: ConvType) -> None:
+    if conv_type.is_deconv:
+        raise RTCVisException("Only convolutions can be applied repeatedly.")
+
+
+def conv_power(
+    a: PLF,
+    n: int,
+    conv_type: ConvType = ConvType.MIN_PLUS_CONV,
+    horizon: Optional[float] = None,
+) -> PLF:
+    """Computes the n-fold convolution of a with itself.
+
+    The power is computed by repeated squaring, so only O(log n) convolutions are
+    needed. Each of them is a convolution of a PLF with itself or with a previous
+    square.
+
+    Args:
+        a (PLF): The PLF.
+        n (int): The number of operands, at least 1.
+        conv_type (ConvType, optional): MIN_PLUS_CONV or MAX_PLUS_CONV. Defaults to
+            ConvType.MIN_PLUS_CONV.
+        horizon (Optional[float], optional): If given, the result is truncated at
+            this x and the intermediate results only contain the parts of the
+            convolutions that are needed for the result until horizon. If a starts
+            at a negative x, these parts extend past horizon. Defaults to None.
+
+    Returns:
+        PLF: The result.
+    """
+    _check_conv_type(conv_type)
+    if n < 1:
+        raise ValidationException("The power must be at least 1.")
+
+    # Every partial power is combined with at most n-1 other operands, each of which
+    # is defined from x_start on, so a negative x_start moves the values that are
+    # needed for the result until horizon to the right.
+    stop = None if horizon is None else horizon - (n - 1) * min(0, a.x_start)
+    base = a if stop is None else a.end_truncated(stop)
+    result: Optional[PLF] = None
+    while True:
+        if n & 1:
+            result = (
+                base if result is None else conv(result, base, conv_type, stop=stop)
+            )
+        n >>= 1
+        if n == 0:
+            break
+        base = conv(base, base, conv_type, stop=stop)
+    assert result is not None
+    return result if horizon is None else result.end_truncated(horizon)
+
+
+def _plf_close(a: PLF, b: PLF) -> bool:
+    """Whether two PLFs have the same values up to rounding errors."""
+    if len(a.points) != len(b.points) and (len(a.points) == 0 or len(b.points) == 0):
+        return False
+    if a.x_start != b.x_start or a.x_end != b.x_end:
+        return False
+    xs = sorted(set(a.x) | set(b.x))
+    xs += [(x0 + x1) / 2 for x0, x1 in zip(xs, xs[1:])]
+    return all(
+        abs(y_a - y_b) <= 1e-9 * max(1.0, abs(y_a))
+        for y_a, y_b in zip(
+            a.evaluate_many_left(xs) + a.evaluate_many_right(xs),
+            b.evaluate_many_left(xs) + b.evaluate_many_right(xs),
+        )
+    )
+
+
+def subadditive_closure(
+    a: PLF,
+    horizon: float,
+    conv_type: ConvType = ConvType.MIN_PLUS_CONV,
+    max_iterations: int = 64,
+) -> PLF:
+    """Computes the sub-additive closure of a until horizon.
+
+    The result is the minimum of all n-fold convolutions of a with itself for n >= 1.
+    For max-plus convolutions, the maximum is computed instead, which is the
+    super-additive closure. The closure is computed by repeated squaring: if c is the
+    minimum of the powers 1 to k, then min(c, c * c) is the minimum of the powers 1
+    to 2k. This stops as soon as the result doesn't change anymore until horizon.
+
+    Args:
+        a (PLF): The PLF. It must not start at a negative x, and the domains of its
+            powers must overlap, so that their minimum doesn't have gaps.
+        horizon (float): The x until which the closure is computed.
+        conv_type (ConvType, optional): MIN_PLUS_CONV or MAX_PLUS_CONV. Defaults to
+            ConvType.MIN_PLUS_CONV.
+        max_iterations (int, optional): The maximum number of squarings. If the
+            result still changes after that, e.g. because a has negative values
+            which make the closure diverge, an RTCVisException is raised. Defaults
+            to 64.
+
+    Returns:
+        PLF: The closure until horizon.
+    """
+    _check_conv_type(conv_type)
+    if a.x_start < 0:
+        # the powers would depend on values of a that are arbitrarily far past horizon
+        raise ValidationException("The PLF must not start at a negative x.")
+    compute_min = conv_type == ConvType.MIN_PLUS_CONV
+    result = a.end_truncated(horizon)
+    for _ in range(max_iterations):
+        square = conv(result, result, conv_type, stop=horizon)
+        if len(square.points) == 0:
+            # the domain of the square starts after horizon
+            return result
+        new_result = plf_min_max_merged(result, square, compute_min=compute_min)
+        if _plf_close(new_result, result):
+            return new_result
+        result = new_result
+    raise RTCVisException(
+        f"The closure did not converge after {max_iterations} iterations."
+    )
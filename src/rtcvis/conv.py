@@ -1,8 +1,28 @@
+import bisect
+import heapq
+import logging
+import math
+import operator
+import threading
+from array import array
 from enum import Enum
-from typing import Optional
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional, Sequence
 
-from rtcvis.plf import PLF, plf_list_min_max
+from rtcvis.cache import memoized
+from rtcvis.envelope import find_dominated, plf_envelope, plf_envelope_sources
+from rtcvis.exceptions import RTCVisException, ValidationException
+from rtcvis.families import (
+    RateLatency,
+    TokenBucket,
+    rate_latency_conv,
+    token_bucket_conv,
+    token_bucket_deconv,
+)
+from rtcvis.plf import PLF, _join_border, _on_line
 from rtcvis.point import Point
+from rtcvis.sliding import sliding_window_extremum
+
+logger = logging.getLogger(__name__)
 
 LAMBDA = r"\lambda"
 DELTA = r"\Delta"
@@ -112,44 +132,205 @@ class ConvAtXResult:
         return self._result
 
 
+class _LazyConvAtXResult(ConvAtXResult):
+    def __init__(
+        self, compute_curves: Callable[[], tuple[PLF, PLF]], result: Point
+    ) -> None:
+        """A ConvAtXResult which only computes transformed_a and sum when needed.
+
+        Args:
+            compute_curves (Callable[[], tuple[PLF, PLF]]): Computes transformed_a
+                and sum.
+            result (Point): The result point.
+        """
+        self._compute_curves = compute_curves
+        self._curves: Optional[tuple[PLF, PLF]] = None
+        self._result = result
+
+    def _get_curves(self) -> tuple[PLF, PLF]:
+        if self._curves is None:
+            self._curves = self._compute_curves()
+        return self._curves
+
+    @property
+    def transformed_a(self) -> PLF:
+        return self._get_curves()[0]
+
+    @property
+    def sum(self) -> PLF:
+        return self._get_curves()[1]
+
+
+class ConvSource(NamedTuple):
+    """Describes where a segment of a convolution result comes from.
+
+    On the segment, the result at delta is the value of the sum (or difference) of
+    conv_at_x at lambda = offset + slope * delta. Either lambda is the x of point
+    b_index of b (and slope is 0) or delta - lambda (delta + lambda for
+    deconvolutions) is the x of point a_index of a. The other index is -1.
+    """
+
+    offset: float
+    slope: float
+    a_index: int
+    b_index: int
+
+    def lambda_at(self, delta_x: float) -> float:
+        """Computes lambda at the given delta."""
+        if self.slope == 0:
+            return self.offset
+        return self.offset + self.slope * delta_x
+
+
+class PruneStats(NamedTuple):
+    """How many candidates of a convolution were pruned before the envelope."""
+
+    candidates: int
+    pruned: int
+
+
+class ConvProvenance:
+    def __init__(
+        self,
+        a: PLF,
+        b: PLF,
+        conv_type: ConvType,
+        result: PLF,
+        sources: list[tuple[float, Optional[ConvSource]]],
+    ) -> None:
+        """The result of a convolution and where each of its segments comes from.
+
+        This allows evaluating conv_at_x with a binary search instead of computing
+        the sum of the transformed a and b.
+
+        Args:
+            a (PLF): PLF a.
+            b (PLF): PLF b.
+            conv_type (ConvType): The type of convolution.
+            result (PLF): The result of the convolution.
+            sources (list[tuple[float, Optional[ConvSource]]]): Tuples (x, source)
+                sorted by x, each source is valid from its x until the next x. None
+                means that the source is unknown.
+        """
+        self._a = a
+        self._b = b
+        self._conv_type = conv_type
+        self._result = result
+        self._xs = [x for x, _ in sources]
+        self._sources = [source for _, source in sources]
+
+    @property
+    def a(self) -> PLF:
+        return self._a
+
+    @property
+    def b(self) -> PLF:
+        return self._b
+
+    @property
+    def conv_type(self) -> ConvType:
+        return self._conv_type
+
+    @property
+    def result(self) -> PLF:
+        return self._result
+
+    def source_at(self, delta_x: float) -> Optional[ConvSource]:
+        """Finds the source of the segment of the result which contains delta_x.
+
+        If delta_x is located between two segments, the source of the right one is
+        returned.
+
+        Args:
+            delta_x (float): The x coordinate.
+
+        Returns:
+            Optional[ConvSource]: The source or None if it is unknown.
+        """
+        idx = bisect.bisect_right(self._xs, delta_x) - 1
+        if idx < 0:
+            return None
+        return self._sources[idx]
+
+    def point_at(self, delta_x: float) -> Optional[Point]:
+        """Computes the result of conv_at_x at the given delta_x.
+
+        The point is only computed between the breakpoints of the result, since the
+        minimum or maximum of the sum may be located elsewhere at the breakpoints.
+
+        Args:
+            delta_x (float): The x at which to evaluate the convolution.
+
+        Returns:
+            Optional[Point]: The point on the sum (or difference) whose y is the result
+                of the convolution, or None if it cannot be computed from the
+                provenance.
+        """
+        xs, ys = self._result.x, self._result.y
+        if not (len(xs) > 0 and xs[0] < delta_x < xs[-1]):
+            return None
+        source = self.source_at(delta_x)
+        if source is None:
+            return None
+        idx = bisect.bisect_left(xs, delta_x)
+        if xs[idx] == delta_x:
+            # At breakpoints, the sum may have its minimum/maximum at a different
+            # lambda than on both adjacent segments (e.g. if a and b have
+            # discontinuities that add up to a single point).
+            return None
+        # same as PLF.get_value
+        slope = (ys[idx] - ys[idx - 1]) / (xs[idx] - xs[idx - 1])
+        y = slope * (delta_x - xs[idx - 1]) + ys[idx - 1]
+        return Point(source.lambda_at(delta_x), y)
+
+
 class ConvProperties:
-    def __init__(self, a: PLF, b: PLF, conv_type: ConvType):
+    def __init__(
+        self, a: PLF, b: PLF, conv_type: ConvType, background: bool = False
+    ) -> None:
         """Computes several properties needed for plotting convolutions.
 
         Computes the min and max values for the slider, x axis and y axis as well as
-        the result of the convolution.
+        the result of the convolution and its provenance, which can be passed to
+        conv_at_x. Only the selected convolution is computed, the y axis limits are
+        derived from the extrema of a and b. The other convolution of the same kind
+        (max-plus for min-plus and vice versa) is only computed when other_result is
+        accessed.
 
         Args:
             a (PLF): PLF a.
             b (PLF): PLF b.
             conv_type (ConvType): The type of convolution.
+            background (bool, optional): Whether other_result should already be
+                computed in a background thread. Defaults to False.
         """
         # allow computing the convolution for all x where a and b overlap
         PADDING = 0.5
-        is_deconv = conv_type in (ConvType.MAX_PLUS_DECONV, ConvType.MIN_PLUS_DECONV)
-        if is_deconv:
-            min_deconv_result = conv(a=a, b=b, conv_type=ConvType.MIN_PLUS_DECONV)
-            max_deconv_result = conv(a=a, b=b, conv_type=ConvType.MAX_PLUS_DECONV)
-            conv_min_y = max_deconv_result.min.y
-            conv_max_y = min_deconv_result.max.y
+        self._a = a
+        self._b = b
+        self.provenance = conv_with_provenance(a=a, b=b, conv_type=conv_type)
+        self.result = self.provenance.result
+        if conv_type.is_deconv:
+            # inf/sup over all differences of a and b
+            conv_min_y = a.min.y - b.max.y
+            conv_max_y = a.max.y - b.min.y
             self.slider_min = a.x_start - b.x_end
             self.slider_max = a.x_end - b.x_start
-            self.result = (
-                min_deconv_result
+            self._other_type = (
+                ConvType.MAX_PLUS_DECONV
                 if conv_type == ConvType.MIN_PLUS_DECONV
-                else max_deconv_result
+                else ConvType.MIN_PLUS_DECONV
             )
         else:
-            min_conv_result = conv(a=a, b=b, conv_type=ConvType.MIN_PLUS_CONV)
-            max_conv_result = conv(a=a, b=b, conv_type=ConvType.MAX_PLUS_CONV)
-            conv_min_y = min_conv_result.min.y
-            conv_max_y = max_conv_result.max.y
+            # inf/sup over all sums of a and b
+            conv_min_y = a.min.y + b.min.y
+            conv_max_y = a.max.y + b.max.y
             self.slider_min = a.x_start + b.x_start
             self.slider_max = b.x_end + a.x_end
-            self.result = (
-                min_conv_result
+            self._other_type = (
+                ConvType.MAX_PLUS_CONV
                 if conv_type == ConvType.MIN_PLUS_CONV
-                else max_conv_result
+                else ConvType.MIN_PLUS_CONV
             )
         self.min_x = (
             min(a.x_start, b.x_start - (a.x_end - a.x_start), self.slider_min) - PADDING
@@ -160,32 +341,434 @@ class ConvProperties:
         self.min_y = min(a.min.y, b.min.y, conv_min_y) - PADDING
         self.max_y = max(a.max.y, b.max.y, conv_max_y) + PADDING
 
+        self._other_result: Optional[PLF] = None
+        self._thread: Optional[threading.Thread] = None
+        if background:
+            self._thread = threading.Thread(target=self._compute_other, daemon=True)
+            self._thread.start()
+
+    def _compute_other(self) -> None:
+        self._other_result = conv(a=self._a, b=self._b, conv_type=self._other_type)
+
+    @property
+    def other_result(self) -> PLF:
+        """The result of the other convolution of the same kind.
 
-def conv_at_x(a: PLF, b: PLF, delta_x: float, conv_type: ConvType) -> ConvAtXResult:
+        This is the max-plus (de-)convolution if the selected type is a min-plus
+        (de-)convolution and vice versa. It is computed when it's first needed.
+        """
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._other_result is None:
+            self._compute_other()
+        assert self._other_result is not None
+        return self._other_result
+
+
+@memoized(maxsize=32)
+def conv_properties(a: PLF, b: PLF, conv_type: ConvType) -> ConvProperties:
+    """Returns the ConvProperties for the given PLFs and type of convolution.
+
+    The results are cached, so calling this again with equal arguments (e.g. when
+    redrawing a plot) doesn't compute anything. The returned object must not be
+    modified.
+
+    Args:
+        a (PLF): PLF a.
+        b (PLF): PLF b.
+        conv_type (ConvType): The type of convolution.
+
+    Returns:
+        ConvProperties: The properties.
+    """
+    return ConvProperties(a=a, b=b, conv_type=conv_type)
+
+
+def _check_provenance(
+    provenance: ConvProvenance, a: PLF, b: PLF, conv_type: ConvType
+) -> None:
+    """Raises an RTCVisException if the provenance belongs to other arguments."""
+    if (
+        provenance.conv_type != conv_type
+        or hash(provenance.a) != hash(a)
+        or hash(provenance.b) != hash(b)
+    ):
+        raise RTCVisException("The provenance belongs to a different convolution.")
+
+
+def _sum_extremum(s: PLF, conv_type: ConvType) -> Point:
+    """Returns the minimum or maximum of the sum, depending on the convolution."""
+    if conv_type == ConvType.MIN_PLUS_CONV or conv_type == ConvType.MAX_PLUS_DECONV:
+        return s.min
+    return s.max
+
+
+def _transformed_a_and_sum(
+    a: PLF, b: PLF, delta_x: float, conv_type: ConvType
+) -> tuple[PLF, PLF]:
+    """Computes the transformed a and its sum with (or difference to) b at delta_x."""
+    if conv_type == ConvType.MIN_PLUS_CONV or conv_type == ConvType.MAX_PLUS_CONV:
+        transformed_a = a.transformed(mirror=True, offset=delta_x)
+        s = transformed_a + b
+    else:
+        transformed_a = a.transformed(mirror=False, offset=-delta_x)
+        s = transformed_a - b
+    return transformed_a, s
+
+
+def conv_at_x(
+    a: PLF,
+    b: PLF,
+    delta_x: float,
+    conv_type: ConvType,
+    provenance: Optional[ConvProvenance] = None,
+) -> ConvAtXResult:
     """Computes the given type of convolution of a and b at the given x.
 
+    If the provenance of the convolution is given, the result is found with a binary
+    search and transformed_a and sum are only computed when they're accessed. Unlike
+    conv_properties, the results are not cached, since they are rarely requested
+    twice for the same delta_x.
+
     Args:
         a (PLF): PLF a
         b (PLF): PLF b
         delta_x (float): The x at which to evaluate the convolution.
         conv_type (ConvType): The type of convolution
+        provenance (Optional[ConvProvenance], optional): The result of
+            conv_with_provenance for the same PLFs and type of convolution. Defaults
+            to None.
 
     Returns:
         ConvAtXResult: An object containing several properties of the result.
     """
-    if conv_type == ConvType.MIN_PLUS_CONV or conv_type == ConvType.MAX_PLUS_CONV:
-        transformed_a = a.transformed(mirror=True, offset=delta_x)
-        s = transformed_a + b
+    if provenance is not None:
+        _check_provenance(provenance, a, b, conv_type)
+        point = provenance.point_at(delta_x)
+        if point is not None:
+            return _LazyConvAtXResult(
+                lambda: _transformed_a_and_sum(a, b, delta_x, conv_type), point
+            )
+
+    transformed_a, s = _transformed_a_and_sum(a, b, delta_x, conv_type)
+    return ConvAtXResult(
+        transformed_a=transformed_a, sum=s, result=_sum_extremum(s, conv_type)
+    )
+
+
+class ConvAtXManyResult(NamedTuple):
+    """The results of conv_at_x_many.
+
+    y contains the results of the convolution, i.e. the y coordinates of the result
+    points, and lambdas their x coordinates (if they were requested). Both arrays have
+    one entry per delta and contain NaN where the convolution is not defined.
+    """
+
+    y: array
+    lambdas: Optional[array]
+
+
+def conv_at_x_many(
+    a: PLF,
+    b: PLF,
+    deltas: Sequence[float],
+    conv_type: ConvType,
+    provenance: Optional[ConvProvenance] = None,
+    with_lambdas: bool = False,
+) -> ConvAtXManyResult:
+    """Computes the results of conv_at_x for many deltas at once.
+
+    The deltas are sorted and then evaluated in a single pass over the provenance of
+    the convolution, so neither the transformed a nor the sum are computed. Only at
+    the breakpoints of the result, where the provenance is ambiguous, the sum is
+    computed as in conv_at_x.
+
+    Args:
+        a (PLF): PLF a
+        b (PLF): PLF b
+        deltas (Sequence[float]): The x coordinates at which to evaluate the
+            convolution, which don't have to be sorted.
+        conv_type (ConvType): The type of convolution
+        provenance (Optional[ConvProvenance], optional): The result of
+            conv_with_provenance for the same PLFs and type of convolution. It is
+            computed if it's not given. Defaults to None.
+        with_lambdas (bool, optional): Whether the x coordinates of the result points
+            should be returned as well. Defaults to False.
+
+    Returns:
+        ConvAtXManyResult: Contiguous arrays of doubles with the results.
+    """
+    if provenance is None:
+        provenance = conv_with_provenance(a=a, b=b, conv_type=conv_type)
     else:
-        transformed_a = a.transformed(mirror=False, offset=-delta_x)
-        s = transformed_a - b
-    if conv_type == ConvType.MIN_PLUS_CONV or conv_type == ConvType.MAX_PLUS_DECONV:
-        result = s.min
+        _check_provenance(provenance, a, b, conv_type)
+
+    n = len(deltas)
+    ys = array("d", [math.nan]) * n
+    lambdas = array("d", [math.nan]) * n if with_lambdas else None
+    xs, rys = provenance.result.x, provenance.result.y
+    source_xs, sources = provenance._xs, provenance._sources
+    if len(xs) == 0:
+        return ConvAtXManyResult(ys, lambdas)
+
+    # idx is the first breakpoint of the result at or after delta (like
+    # bisect_left) and src the last source at or before delta (like bisect_right)
+    idx, src = 0, -1
+    for i in sorted(range(n), key=deltas.__getitem__):
+        delta_x = deltas[i]
+        if not (xs[0] <= delta_x <= xs[-1]):
+            continue
+        while xs[idx] < delta_x:
+            idx += 1
+        while src + 1 < len(source_xs) and source_xs[src + 1] <= delta_x:
+            src += 1
+        source = sources[src] if src >= 0 else None
+        if xs[idx] != delta_x and source is not None:
+            # same as ConvProvenance.point_at
+            slope = (rys[idx] - rys[idx - 1]) / (xs[idx] - xs[idx - 1])
+            ys[i] = slope * (delta_x - xs[idx - 1]) + rys[idx - 1]
+            if lambdas is not None:
+                lambdas[i] = source.lambda_at(delta_x)
+        else:
+            _, s = _transformed_a_and_sum(a, b, delta_x, conv_type)
+            point = _sum_extremum(s, conv_type)
+            ys[i] = point.y
+            if lambdas is not None:
+                lambdas[i] = point.x
+    return ConvAtXManyResult(ys, lambdas)
+
+
+class ConvSweep:
+    def __init__(
+        self,
+        a: PLF,
+        b: PLF,
+        conv_type: ConvType,
+        provenance: Optional[ConvProvenance] = None,
+    ) -> None:
+        """Evaluates conv_at_x for a series of deltas, e.g. while moving a slider.
+
+        Moving delta only shifts the transformed a. For every point of the transformed
+        a, the sweep stores the index of the first point of b which is not left of it,
+        which is the merged order of the breakpoints of both PLFs. It is kept between
+        updates together with two event queues (for moving right and left), so an
+        update only touches the points of a that pass a point of b. This is not an
+        incremental sum, though: every point of the sum moves or changes its value
+        with delta, so the sum is rebuilt in O(n+m) whenever it is accessed. The
+        rebuild is cheaper than in conv_at_x because it is a single merge pass that
+        doesn't have to compare or search any x coordinates. With a provenance, the
+        result point itself is found without the sum.
+
+        Args:
+            a (PLF): PLF a.
+            b (PLF): PLF b.
+            conv_type (ConvType): The type of convolution.
+            provenance (Optional[ConvProvenance], optional): The result of
+                conv_with_provenance for the same arguments. If given, the result point
+                is found with a binary search. Defaults to None.
+        """
+        self._a = a
+        self._b = b
+        self._conv_type = conv_type
+        self._provenance = provenance
+        self._b_x, self._b_y = list(b.x), list(b.y)
+        # The x of point k of the transformed a is self._offsets[k] + self._shift.
+        # Convolutions mirror a, so the shift is delta, for deconvolutions it's -delta.
+        if conv_type.is_deconv:
+            self._offsets = list(a.x)
+            self._a_y = list(a.y)
+            self._direction = -1
+        else:
+            self._offsets = [-x for x in reversed(a.x)]
+            self._a_y = list(reversed(a.y))
+            self._direction = 1
+        self._delta_x = 0.0
+        self._shift = 0.0
+        # index of the first point of b at or after each point of the transformed a
+        self._pos = [bisect.bisect_left(self._b_x, x) for x in self._offsets]
+        # number of updates, so that results can tell whether they're outdated
+        self._step = 0
+        self._init_events()
+
+    def _init_events(self) -> None:
+        """Creates the event queues with one entry per point of the transformed a."""
+        self._version = [0] * len(self._offsets)
+        self._right: list[tuple[float, int, int]] = []
+        self._left: list[tuple[float, int, int]] = []
+        for k in range(len(self._offsets)):
+            self._push_events(k)
+        heapq.heapify(self._right)
+        heapq.heapify(self._left)
+
+    def _push_events(self, k: int) -> None:
+        """Adds the shifts at which point k of the transformed a passes a point of b."""
+        pos, offset, version = self._pos[k], self._offsets[k], self._version[k]
+        if pos < len(self._b_x):
+            heapq.heappush(self._right, (self._b_x[pos] - offset, k, version))
+        if pos > 0:
+            # max-heap
+            heapq.heappush(self._left, (offset - self._b_x[pos - 1], k, version))
+
+    @property
+    def delta_x(self) -> float:
+        return self._delta_x
+
+    def _move(self, delta_x: float) -> None:
+        """Moves the transformed a to delta_x and updates the indices."""
+        shift = self._direction * delta_x
+        # events are processed slightly early, the exact comparison happens below
+        tolerance = 1e-9 * (1 + abs(shift))
+        touched: set[int] = set()
+        right, left, version = self._right, self._left, self._version
+        while right and right[0][0] < shift + tolerance:
+            _, k, v = heapq.heappop(right)
+            if v == version[k]:
+                touched.add(k)
+        while left and -left[0][0] > shift - tolerance:
+            _, k, v = heapq.heappop(left)
+            if v == version[k]:
+                touched.add(k)
+
+        b_x, offsets, pos = self._b_x, self._offsets, self._pos
+        for k in touched:
+            x = offsets[k] + shift
+            while pos[k] < len(b_x) and b_x[pos[k]] < x:
+                pos[k] += 1
+            while pos[k] > 0 and b_x[pos[k] - 1] >= x:
+                pos[k] -= 1
+            version[k] += 1
+            self._push_events(k)
+
+        self._shift = shift
+        self._delta_x = delta_x
+        self._step += 1
+        if len(right) + len(left) > 4 * (len(offsets) + 1):
+            # get rid of outdated events
+            self._init_events()
+
+    def _transformed_a(self) -> PLF:
+        shift = self._shift
+        return PLF._from_points(
+            [Point(x + shift, y) for x, y in zip(self._offsets, self._a_y)]
+        )
+
+    def _sum(self) -> PLF:
+        """Rebuilds the sum (or difference) of the transformed a and b in O(n+m).
+
+        The merge pass follows the stored indices instead of comparing x coordinates.
+        """
+        a_y, b_x, b_y, pos = self._a_y, self._b_x, self._b_y, self._pos
+        shift = self._shift
+        t = [x + shift for x in self._offsets]
+        n, m = len(t), len(b_x)
+        if n == 0 or m == 0:
+            return PLF._from_points([])
+        lo, hi = max(t[0], b_x[0]), min(t[-1], b_x[-1])
+        if lo > hi:
+            return PLF._from_points([])
+        op = operator.sub if self._conv_type.is_deconv else operator.add
+
+        def interpolate(xs: list[float], ys: list[float], i: int, x: float) -> float:
+            # value on the segment from point i - 1 to i, same as PLF.get_value
+            slope = (ys[i] - ys[i - 1]) / (xs[i] - xs[i - 1])
+            return slope * (x - xs[i - 1]) + ys[i - 1]
+
+        points: list[Point] = []
+        k = bisect.bisect_left(t, lo)
+        j = bisect.bisect_left(b_x, lo)
+        while k < n or j < m:
+            # the next point of b is left of the next point of a if pos[k] > j
+            x = t[k] if k < n and (j >= m or pos[k] <= j) else b_x[j]
+            if x > hi:
+                break
+
+            # the indices of the points of a and b at x
+            k0, j0 = k, j
+            while k < n and t[k] == x:
+                k += 1
+            while j < m and b_x[j] == x:
+                j += 1
+            a_values = a_y[k0:k] if k > k0 else [interpolate(t, a_y, k, x)]
+            b_values = b_y[j0:j] if j > j0 else [interpolate(b_x, b_y, j, x)]
+
+            if len(a_values) == len(b_values) == 1:
+                points.append(Point(x, op(a_values[0], b_values[0])))
+                continue
+            # a single value is used for both points of a discontinuity of the other
+            if len(a_values) < len(b_values):
+                a_values *= len(b_values)
+            elif len(b_values) < len(a_values):
+                b_values *= len(a_values)
+            points += [Point(x, op(ya, yb)) for ya, yb in zip(a_values, b_values)]
+
+        return PLF._from_points(points).simplified()
+
+    def update(self, delta_x: float) -> ConvAtXResult:
+        """Moves the sweep to delta_x and computes the convolution there.
+
+        The transformed a and the sum are only computed when they are accessed. If the
+        sweep has been moved again by then, they're computed like in conv_at_x.
+
+        Args:
+            delta_x (float): The x at which to evaluate the convolution.
+
+        Returns:
+            ConvAtXResult: The same result as conv_at_x (up to rounding errors).
+        """
+        self._move(delta_x)
+        step = self._step
+
+        def compute_curves() -> tuple[PLF, PLF]:
+            if step != self._step:
+                return _transformed_a_and_sum(
+                    self._a, self._b, delta_x, self._conv_type
+                )
+            return self._transformed_a(), self._sum()
+
+        point = (
+            self._provenance.point_at(delta_x) if self._provenance is not None else None
+        )
+        if point is None:
+            transformed_a, s = compute_curves()
+            point = _sum_extremum(s, self._conv_type)
+            return ConvAtXResult(transformed_a=transformed_a, sum=s, result=point)
+        return _LazyConvAtXResult(compute_curves, point)
+
+
+def _use_slope_merge(a: PLF, b: PLF, conv_type: ConvType) -> bool:
+    """Whether the convolution can be computed with _conv_slope_merge."""
+    return (conv_type == ConvType.MIN_PLUS_CONV and a.is_convex and b.is_convex) or (
+        conv_type == ConvType.MAX_PLUS_CONV and a.is_concave and b.is_concave
+    )
+
+
+@memoized(maxsize=32)
+def conv_with_provenance(a: PLF, b: PLF, conv_type: ConvType) -> ConvProvenance:
+    """Computes the convolution of two PLFs and records where its segments come from.
+
+    The result is the same as conv(a, b, conv_type). It can be passed to conv_at_x to
+    speed it up.
+
+    Args:
+        a (PLF): The first PLF.
+        b (PLF): The second PLF.
+        conv_type (ConvType): The type of convolution.
+
+    Returns:
+        ConvProvenance: The result and its provenance.
+    """
+    sources: list[tuple[float, Optional[ConvSource]]] = []
+    if _use_slope_merge(a, b, conv_type):
+        result = _conv_slope_merge(
+            a, b, compute_min=conv_type == ConvType.MIN_PLUS_CONV, sources=sources
+        )
     else:
-        result = s.max
-    return ConvAtXResult(transformed_a=transformed_a, sum=s, result=result)
+        result = _conv_general(a, b, conv_type, sources=sources)
+    return ConvProvenance(a, b, conv_type, result.simplified(), sources)
 
 
+@memoized(maxsize=128)
 def conv(
     a: PLF,
     b: PLF,
@@ -195,6 +778,17 @@ def conv(
 ) -> PLF:
     """Computes the convolution of two PLFs.
 
+    If both PLFs are convex (for min-plus convolutions) or concave (for max-plus
+    convolutions), the result is computed in linear time by merging their segments
+    sorted by slope. If one of the PLFs is constant, the result is a minimum or
+    maximum of the other one over a sliding window, which is computed in linear time
+    as well. Convolutions of RateLatency curves, of TokenBucket curves and the
+    deconvolution of a TokenBucket by a RateLatency use closed forms. All other
+    cases use the general algorithm, which only considers the parts of its candidate
+    functions that are needed between start and stop, so its cost depends on the size
+    of that window rather than the whole domain. Results are cached and shared between
+    calls with equal arguments, so they must not be modified.
+
     Args:
         a (PLF): The first PLF.
         b (PLF): The second PLF.
@@ -209,46 +803,471 @@ def conv(
     Returns:
         PLF: The result of the convolution.
     """
-    # create len(a.points) functions by adding b's points to a
-    wsogmm1: list[PLF] = []
-    is_deconv = conv_type in (ConvType.MIN_PLUS_DECONV, ConvType.MAX_PLUS_DECONV)
-    # convolutions mirror a first, which is why we need to add the x coordinates
-    # deconvolutions dont mirror, which is why we need to subtract the x coordinates
-    subtract_x = is_deconv
-    # convolutions add the y values, deconvolutions subtract them
-    subtract_y = is_deconv
-    for p in b.points:
-        wsogmm1.append(
-            a.add_point(other=p, subtract_x=subtract_x, subtract_y=subtract_y)
+    result = _conv_linear(a, b, conv_type)
+    if result is None:
+        result = _conv_general(a, b, conv_type, start=start, stop=stop)
+    elif start is None and stop is None:
+        # keep the parameters if the result is a RateLatency
+        return result
+
+    # Optionally truncate the start/end
+    if start is not None:
+        result = result.start_truncated(start)
+    if stop is not None:
+        result = result.end_truncated(stop)
+
+    # remove redundant points
+    result = result.simplified()
+
+    return result
+
+
+def _conv_linear(a: PLF, b: PLF, conv_type: ConvType) -> Optional[PLF]:
+    """Computes a convolution in linear time if the operands allow it.
+
+    This is the dispatcher shared by conv and iter_conv. Closed forms are used for
+    the families in rtcvis.families, then sliding windows if one operand is constant
+    and then the slope merge for convex (or concave) operands.
+
+    Returns:
+        Optional[PLF]: The simplified result or None if the general algorithm is
+            needed.
+    """
+    closed_form = _conv_closed_form(a, b, conv_type)
+    if closed_form is not None:
+        return closed_form
+    sliding = _conv_sliding_window(a, b, conv_type)
+    if sliding is not None:
+        return sliding.simplified()
+    if _use_slope_merge(a, b, conv_type):
+        return _conv_slope_merge(
+            a, b, compute_min=conv_type == ConvType.MIN_PLUS_CONV
+        ).simplified()
+    return None
+
+
+def _chunk_borders(
+    xs: Iterable[float], x_start: float, x_end: float, chunks: int
+) -> list[float]:
+    """Splits [x_start, x_end] into chunks with about the same number of breakpoints.
+
+    Args:
+        xs (Iterable[float]): The breakpoints.
+        x_start (float): The start of the domain.
+        x_end (float): The end of the domain.
+        chunks (int): The maximum number of chunks.
+
+    Returns:
+        list[float]: The borders of the chunks, starting with x_start and ending with
+            x_end. There may be fewer chunks if there are too few breakpoints.
+    """
+    inner = sorted({x for x in xs if x_start < x < x_end})
+    borders = [x_start]
+    for k in range(1, chunks):
+        idx = len(inner) * k // chunks
+        if idx < len(inner) and inner[idx] > borders[-1]:
+            borders.append(inner[idx])
+    borders.append(x_end)
+    return borders
+
+
+# The number of points of each PLF used to estimate where the breakpoints of a
+# convolution are located, which keeps this estimate below 2**16 positions.
+_MAX_BORDER_SAMPLES = 256
+
+
+def _conv_breakpoints(a: PLF, b: PLF, conv_type: ConvType) -> list[float]:
+    """Estimates where the breakpoints of the candidates of a convolution are located.
+
+    Each pair of points of a and b creates a candidate breakpoint at the sum of their
+    x coordinates (or their difference for deconvolutions). For large PLFs, only
+    every k-th point of each PLF is used, which keeps the distribution of the
+    positions but not their number.
+    """
+    a_x = a.x[:: math.ceil(len(a.x) / _MAX_BORDER_SAMPLES)]
+    b_x = b.x[:: math.ceil(len(b.x) / _MAX_BORDER_SAMPLES)]
+    if conv_type.is_deconv:
+        return [xa - xb for xa in a_x for xb in b_x]
+    return [xa + xb for xa in a_x for xb in b_x]
+
+
+def iter_conv(
+    a: PLF, b: PLF, conv_type: ConvType, windows: Optional[int] = None
+) -> Iterator[Point]:
+    """Computes the convolution of two PLFs and yields its points from left to right.
+
+    The domain of the result is split into windows which are computed one after the
+    other with the windowed algorithm of conv. Each window only creates the parts of
+    the candidate functions that overlap it, which are found with a binary search.
+    The windows are chosen so that they contain about the same number of candidate
+    breakpoints, by default about as many as there are candidates. So the memory
+    needed for a window is bounded by the number of candidates that overlap it, the
+    active frontier, and not by the O(n*m) breakpoints of all candidates. Each point
+    is yielded as soon as it is final, which allows writing long results to a file
+    without creating the whole PLF. Collecting the points gives the same PLF as
+    conv(a, b, conv_type), up to rounding errors. If conv can use a linear-time
+    algorithm, its result is yielded instead.
+
+    Args:
+        a (PLF): The first PLF.
+        b (PLF): The second PLF.
+        conv_type (ConvType): The type of convolution.
+        windows (Optional[int], optional): The maximum number of windows. More windows
+            need less memory but repeat the search for the candidates that overlap
+            each window. If it is None, it is the number of pairs of points of a and b
+            divided by the number of points of both. Defaults to None.
+
+    Returns:
+        Iterator[Point]: The points of the result.
+    """
+    if windows is not None and windows < 1:
+        raise ValidationException("There must be at least one window.")
+    return _iter_conv(a, b, conv_type, windows)
+
+
+def _iter_conv(
+    a: PLF, b: PLF, conv_type: ConvType, windows: Optional[int]
+) -> Iterator[Point]:
+    """The generator returned by iter_conv, which checks the arguments beforehand."""
+    if len(a.points) == 0 or len(b.points) == 0:
+        return
+    linear = _conv_linear(a, b, conv_type)
+    if linear is not None:
+        yield from linear.points
+        return
+
+    if conv_type.is_deconv:
+        x_start, x_end = a.x_start - b.x_end, a.x_end - b.x_start
+    else:
+        x_start, x_end = a.x_start + b.x_start, a.x_end + b.x_end
+    n, m = len(a.points), len(b.points)
+    if windows is None:
+        windows = max(1, n * m // (n + m))
+    borders = _chunk_borders(
+        _conv_breakpoints(a, b, conv_type), x_start, x_end, windows
+    )
+
+    # The last points are kept until the next points show that they're not redundant.
+    # The windows are joined with the same handling of their borders as in plf_join.
+    pending: list[Point] = []
+    for lo, hi in zip(borders, borders[1:]):
+        if hi < lo or (hi == lo and pending):
+            continue
+        piece = _conv_general(a, b, conv_type, start=lo, stop=hi)
+        points = piece.start_truncated(lo).end_truncated(hi).simplified().points
+        if pending and points:
+            points = _join_border(pending, points)
+        for point in points:
+            if pending and point == pending[-1]:
+                continue
+            if len(pending) >= 2 and _on_line(pending[-2], pending[-1], point):
+                pending.pop(-1)
+            pending.append(point)
+            if len(pending) > 3:
+                yield pending.pop(0)
+    yield from pending
+
+
+def _conv_slope_merge(
+    a: PLF,
+    b: PLF,
+    compute_min: bool,
+    sources: Optional[list[tuple[float, Optional[ConvSource]]]] = None,
+) -> PLF:
+    """Convolution of two convex (or two concave) PLFs.
+
+    The min-plus convolution of two convex functions starts at the sum of their start
+    points and consists of all segments of both functions sorted by increasing slope.
+    The same holds for the max-plus convolution of two concave functions with
+    decreasing slopes. This takes O(n+m).
+
+    Args:
+        a (PLF): The first PLF.
+        b (PLF): The second PLF.
+        compute_min (bool): True for a min-plus convolution of convex PLFs, False for
+            a max-plus convolution of concave PLFs.
+        sources (Optional[list[tuple[float, Optional[ConvSource]]]], optional): If
+            given, a tuple (x, source) is appended for every segment of the result.
+            Defaults to None.
+
+    Returns:
+        PLF: The result of the convolution.
+    """
+
+    def segments(plf: PLF) -> list[tuple[float, float, float, int]]:
+        # (slope, dx, dy, index of the start point) of all non-degenerate segments
+        xs, ys = plf.x, plf.y
+        return [
+            (
+                (ys[i + 1] - ys[i]) / (xs[i + 1] - xs[i]),
+                xs[i + 1] - xs[i],
+                ys[i + 1] - ys[i],
+                i,
+            )
+            for i in range(len(xs) - 1)
+            if xs[i + 1] != xs[i]
+        ]
+
+    seg_a, seg_b = segments(a), segments(b)
+    x, y = a.x_start + b.x_start, a.y[0] + b.y[0]
+    points = [Point(x, y)]
+    i = j = 0
+    while i < len(seg_a) or j < len(seg_b):
+        if j == len(seg_b) or (
+            i < len(seg_a)
+            and (
+                seg_a[i][0] <= seg_b[j][0]
+                if compute_min
+                else seg_a[i][0] >= seg_b[j][0]
+            )
+        ):
+            _, dx, dy, _ = seg_a[i]
+            if sources is not None:
+                # b stays at the point where its previous segment ended
+                b_idx = seg_b[j][3] if j < len(seg_b) else len(b.x) - 1
+                sources.append((x, ConvSource(b.x[b_idx], 0, -1, b_idx)))
+            i += 1
+        else:
+            _, dx, dy, _ = seg_b[j]
+            if sources is not None:
+                a_idx = seg_a[i][3] if i < len(seg_a) else len(a.x) - 1
+                sources.append((x, ConvSource(-a.x[a_idx], 1, a_idx, -1)))
+            j += 1
+        x, y = x + dx, y + dy
+        points.append(Point(x, y))
+    if sources is not None:
+        sources.append((x, None))
+
+    return PLF._from_points(points)
+
+
+def _conv_closed_form(a: PLF, b: PLF, conv_type: ConvType) -> Optional[PLF]:
+    """Convolution of two curves of the families in rtcvis.families.
+
+    Returns:
+        Optional[PLF]: The result or None if there is no closed form for the types
+            of the operands.
+    """
+    if conv_type == ConvType.MIN_PLUS_CONV:
+        if isinstance(a, RateLatency) and isinstance(b, RateLatency):
+            return rate_latency_conv(a, b)
+        if isinstance(a, TokenBucket) and isinstance(b, TokenBucket):
+            return token_bucket_conv(a, b)
+    elif conv_type == ConvType.MIN_PLUS_DECONV:
+        if isinstance(a, TokenBucket) and isinstance(b, RateLatency):
+            return token_bucket_deconv(a, b)
+    return None
+
+
+def _conv_sliding_window(a: PLF, b: PLF, conv_type: ConvType) -> Optional[PLF]:
+    """Convolution of a PLF with a constant PLF.
+
+    If b is c on [s, s + w], the min-plus convolution at delta is c plus the minimum
+    of a on [delta - s - w, delta - s], so it is a sliding window minimum of a which is
+    shifted by s and c. The other types of (de-)convolutions are sliding window
+    minima or maxima as well, only with other offsets. If a is constant instead, the
+    operands of a convolution are swapped, while b is mirrored for a deconvolution.
+
+    Args:
+        a (PLF): The first PLF.
+        b (PLF): The second PLF.
+        conv_type (ConvType): The type of convolution.
+
+    Returns:
+        Optional[PLF]: The result or None if neither PLF is constant with a length
+            greater than 0.
+    """
+    # whether the extremum over the window of the non-constant PLF is a minimum
+    compute_min = conv_type in (ConvType.MIN_PLUS_CONV, ConvType.MAX_PLUS_DECONV)
+    if b.x_end > b.x_start and b.is_constant and len(a.points):
+        c, s, w = b.y[0], b.x_start, b.x_end - b.x_start
+        extremum = sliding_window_extremum(a, w, compute_min)
+        if conv_type.is_deconv:
+            dx, factor, dy = -(s + w), 1, -c
+        else:
+            dx, factor, dy = s, 1, c
+    elif a.x_end > a.x_start and a.is_constant and len(b.points):
+        c, s, w = a.y[0], a.x_start, a.x_end - a.x_start
+        if conv_type.is_deconv:
+            mirrored = b.transformed(mirror=True, offset=0)
+            extremum = sliding_window_extremum(mirrored, w, not compute_min)
+            dx, factor, dy = s, -1, c
+        else:
+            extremum = sliding_window_extremum(b, w, compute_min)
+            dx, factor, dy = s, 1, c
+    else:
+        return None
+    return PLF._from_points(
+        [Point(x + dx, factor * y + dy) for x, y in zip(extremum.x, extremum.y)]
+    )
+
+
+def _window_slice(xs: list[float], x_min: float, x_max: float) -> slice:
+    """Finds the points of a PLF which are needed to describe it on [x_min, x_max].
+
+    The slice also contains the last point before x_min and the first point after
+    x_max, so the sliced PLF covers the whole window (as far as the PLF is defined
+    there) and the values left of x_min and right of x_max are still known.
+
+    Args:
+        xs (list[float]): The x coordinates of the PLF.
+        x_min (float): The start of the window.
+        x_max (float): The end of the window.
+
+    Returns:
+        slice: The slice of the PLF's points.
+    """
+    lo = max(bisect.bisect_left(xs, x_min) - 1, 0)
+    hi = min(bisect.bisect_right(xs, x_max) + 1, len(xs))
+    return slice(lo, hi)
+
+
+def _conv_general(
+    a: PLF,
+    b: PLF,
+    conv_type: ConvType,
+    start: Optional[float] = None,
+    stop: Optional[float] = None,
+    sources: Optional[list[tuple[float, Optional[ConvSource]]]] = None,
+    prune_stats: Optional[list[PruneStats]] = None,
+) -> PLF:
+    """Convolution of two arbitrary PLFs.
+
+    The result is the envelope of a shifted by every point of b and of b shifted by
+    every point of a. If a window is given, only the parts of those candidates which
+    are needed inside the window are created. The result may extend slightly beyond
+    the window and must still be truncated by the caller.
+
+    Args:
+        a (PLF): The first PLF.
+        b (PLF): The second PLF.
+        conv_type (ConvType): The type of convolution.
+        start (Optional[float], optional): The start of the window. Defaults to None.
+        stop (Optional[float], optional): The end of the window. Defaults to None.
+        sources (Optional[list[tuple[float, Optional[ConvSource]]]], optional): If
+            given, a tuple (x, source) is appended whenever the candidate that
+            defines the result changes. Defaults to None.
+        prune_stats (Optional[list[PruneStats]], optional): If given, the number of
+            candidates and how many of them were dominated by another one is
+            appended. Defaults to None.
+
+    Returns:
+        PLF: The result of the convolution. It may still contain redundant points.
+    """
+    if len(a.points) == 0 or len(b.points) == 0:
+        return PLF._from_points([])
+    lo = -math.inf if start is None else start
+    hi = math.inf if stop is None else stop
+    if lo > hi:
+        # the result will be empty after truncating it anyways
+        lo, hi = -math.inf, math.inf
+    is_deconv = conv_type.is_deconv
+    a_x, a_y, b_x, b_y = a.x, a.y, b.x, b.y
+
+    # The first kind of candidates are copies of a, shifted by each point of b.
+    # Convolutions mirror a first, which is why we need to add the x coordinates.
+    # Deconvolutions dont mirror, which is why we need to subtract the x coordinates.
+    # Convolutions add the y values, deconvolutions subtract them.
+    # Only the copies that overlap the window are created. The range of b's points is
+    # found with a binary search and widened by one point on both sides to be robust
+    # against rounding, the exact check happens in the loop.
+    if is_deconv:
+        j_range = range(
+            max(bisect.bisect_left(b_x, a.x_start - hi) - 1, 0),
+            min(bisect.bisect_right(b_x, a.x_end - lo) + 1, len(b_x)),
+        )
+    else:
+        j_range = range(
+            max(bisect.bisect_left(b_x, lo - a.x_end) - 1, 0),
+            min(bisect.bisect_right(b_x, hi - a.x_start) + 1, len(b_x)),
         )
+    wsogmm1: list[PLF] = []
+    # the source of each candidate, lambda is always the x of b's point
+    wsogmm1_sources: list[ConvSource] = []
+    for j in j_range:
+        bx, by = b_x[j], b_y[j]
+        if is_deconv:
+            if a.x_start - bx > hi or a.x_end - bx < lo:
+                continue
+            window = _window_slice(a_x, lo + bx, hi + bx)
+            points = [Point(x - bx, y - by) for x, y in zip(a_x[window], a_y[window])]
+        else:
+            if a.x_start + bx > hi or a.x_end + bx < lo:
+                continue
+            window = _window_slice(a_x, lo - bx, hi - bx)
+            points = [Point(x + bx, y + by) for x, y in zip(a_x[window], a_y[window])]
+        wsogmm1.append(PLF._from_points(points))
+        wsogmm1_sources.append(ConvSource(bx, 0, -1, j))
 
     # reverse the list if we're doing a deconvolution because they're currently given
     # in descending of x-coordinates
     if is_deconv:
         wsogmm1 = list(reversed(wsogmm1))
+        wsogmm1_sources = list(reversed(wsogmm1_sources))
 
+    # The second kind of candidates connect the i-th point of each copy of a, which is
+    # the same as shifting (and for deconvolutions mirroring) b by each point of a.
+    # For the convolution of a PLF with itself, these are the same as the first kind.
+    if not is_deconv and (a is b or a == b):
+        i_range = range(0)
+    elif is_deconv:
+        i_range = range(
+            max(bisect.bisect_left(a_x, lo + b.x_start) - 1, 0),
+            min(bisect.bisect_right(a_x, hi + b.x_end) + 1, len(a_x)),
+        )
+    else:
+        i_range = range(
+            max(bisect.bisect_left(a_x, lo - b.x_end) - 1, 0),
+            min(bisect.bisect_right(a_x, hi - b.x_start) + 1, len(a_x)),
+        )
     wsogmm2: list[PLF] = []
-    # now we create new PLFs by connecting the i-th point of each function in the
-    # correct order and we do this for all points those functions
-    for i in range(len(a.points)):
-        wsogmm2.append(PLF([wsogmm1[j].points[i] for j in range(len(b.points))]))
+    # the source of each candidate, lambda is delta - x (or x - delta for
+    # deconvolutions) for the x of a's point
+    wsogmm2_sources: list[ConvSource] = []
+    for i in i_range:
+        ax, ay = a_x[i], a_y[i]
+        if is_deconv:
+            if ax - b.x_end > hi or ax - b.x_start < lo:
+                continue
+            window = _window_slice(b_x, ax - hi, ax - lo)
+            points = [
+                Point(ax - x, ay - y)
+                for x, y in zip(reversed(b_x[window]), reversed(b_y[window]))
+            ]
+        else:
+            if ax + b.x_start > hi or ax + b.x_end < lo:
+                continue
+            window = _window_slice(b_x, lo - ax, hi - ax)
+            points = [Point(ax + x, ay + y) for x, y in zip(b_x[window], b_y[window])]
+        wsogmm2.append(PLF._from_points(points))
+        if is_deconv:
+            wsogmm2_sources.append(ConvSource(ax, -1, i, -1))
+        else:
+            wsogmm2_sources.append(ConvSource(-ax, 1, i, -1))
 
     # Now we just need to compute the minimum or maximum over all those PLFs :)
     compute_min = conv_type in (ConvType.MIN_PLUS_CONV, ConvType.MAX_PLUS_DECONV)
-    plf_list = (
-        (wsogmm1 + wsogmm2)
-        if (a.x_end - a.x_start) > (b.x_end - b.x_start)
-        else (wsogmm2 + wsogmm1)
-    )
-    result: PLF = plf_list_min_max(plf_list, compute_min=compute_min)
-
-    # Optionally truncate the start/end
-    if start is not None:
-        result = result.start_truncated(start)
-    if stop is not None:
-        result = result.end_truncated(stop)
+    if (a.x_end - a.x_start) > (b.x_end - b.x_start):
+        plf_list = wsogmm1 + wsogmm2
+        plf_sources = wsogmm1_sources + wsogmm2_sources
+    else:
+        plf_list = wsogmm2 + wsogmm1
+        plf_sources = wsogmm2_sources + wsogmm1_sources
 
-    # remove redundant points
-    result = result.simplified()
+    # Many candidates are completely above (or below) another one
+    dominated = find_dominated(plf_list, compute_min=compute_min)
+    logger.debug(
+        "Pruned %d of %d candidates before computing the envelope",
+        len(dominated),
+        len(plf_list),
+    )
+    if prune_stats is not None:
+        prune_stats.append(PruneStats(len(plf_list), len(dominated)))
+    plf_list = [plf for i, plf in enumerate(plf_list) if i not in dominated]
+    plf_sources = [src for i, src in enumerate(plf_sources) if i not in dominated]
 
+    if sources is None:
+        return plf_envelope(plf_list, compute_min=compute_min)
+    result, envelope_sources = plf_envelope_sources(plf_list, compute_min=compute_min)
+    sources.extend((x, plf_sources[i] if i >= 0 else None) for x, i in envelope_sources)
     return result
@@ -0,0 +1,141 @@
+import heapq
+import math
+from typing import Iterable, Iterator, NamedTuple, Sequence
+
+from rtcvis.exceptions import RTCVisException, ValidationException
+from rtcvis.plf import PLF
+
+
+class Deviation(NamedTuple):
+    """A deviation between two curves and the point of the first curve where it is
+    attained."""
+
+    value: float
+    """The deviation."""
+    x: float
+    """The x coordinate of the point of the first curve."""
+    y: float
+    """The y coordinate of the point of the first curve."""
+
+
+def _merged(xs0: Sequence[float], xs1: Sequence[float], lo: float, hi: float):
+    """The sorted distinct coordinates of both lists between lo and hi."""
+    result: list[float] = []
+    for x in heapq.merge(xs0, xs1):
+        if lo <= x <= hi and (not result or x != result[-1]):
+            result.append(x)
+    return result
+
+
+def _sweep(
+    xs: Sequence[float], ys: Sequence[float], at: Iterable[float]
+) -> Iterator[tuple[float, float]]:
+    """Yields the value and the right limit of a PLF at increasing x coordinates.
+
+    The PLF is given by its coordinates and is extended with constant values beyond
+    its ends. Since the x coordinates are increasing, a single index is moved along
+    the points, so this takes O(n + len(at)).
+
+    Args:
+        xs (Sequence[float]): The x coordinates of the PLF.
+        ys (Sequence[float]): The y coordinates of the PLF.
+        at (Iterable[float]): The increasing x coordinates.
+
+    Yields:
+        Iterator[tuple[float, float]]: The value and the right limit at each x.
+    """
+    i, n = 0, len(xs)
+    for x in at:
+        while i < n and xs[i] < x:
+            i += 1
+        if i == n:
+            yield ys[-1], ys[-1]
+        elif xs[i] == x:
+            j = i
+            while j + 1 < n and xs[j + 1] == x:
+                j += 1
+            yield ys[i], ys[j]
+        elif i == 0:
+            yield ys[0], ys[0]
+        else:
+            y = ys[i - 1] + (ys[i] - ys[i - 1]) * (x - xs[i - 1]) / (xs[i] - xs[i - 1])
+            yield y, y
+
+
+def vertical_deviation(a: PLF, b: PLF) -> Deviation:
+    """Computes the maximum vertical deviation of a above b.
+
+    For an arrival curve a and a service curve b, this is the backlog bound. If both
+    PLFs are continuous and have the same domain, it is the same as the value of the
+    min-plus deconvolution of a and b at 0, but it is computed with a single sweep
+    over the breakpoints of both PLFs in O(n+m). Only the x coordinates at which both
+    PLFs are defined are considered. At discontinuities, both the values and the right
+    limits are used, except at the end of the common domain, where there is no right
+    limit, so a jump of a or b exactly at the end is ignored.
+
+    Args:
+        a (PLF): The upper curve, e.g. an arrival curve.
+        b (PLF): The lower curve, e.g. a service curve.
+
+    Returns:
+        Deviation: The maximum of a(x) - b(x) and the point of a where it is attained.
+    """
+    lo, hi = max(a.x_start, b.x_start), min(a.x_end, b.x_end)
+    if len(a.points) == 0 or len(b.points) == 0 or lo > hi:
+        raise RTCVisException("The PLFs must be defined at a common x coordinate.")
+
+    at = _merged(a.x, b.x, lo, hi)
+    best = Deviation(-math.inf, lo, 0)
+    for x, (a_y, a_right), (b_y, b_right) in zip(
+        at, _sweep(a.x, a.y, at), _sweep(b.x, b.y, at)
+    ):
+        if a_y - b_y > best.value:
+            best = Deviation(a_y - b_y, x, a_y)
+        if x < hi and a_right - b_right > best.value:
+            best = Deviation(a_right - b_right, x, a_right)
+    return best
+
+
+def horizontal_deviation(a: PLF, b: PLF) -> Deviation:
+    """Computes the maximum horizontal deviation of b to the right of a.
+
+    For an arrival curve a and a service curve b, this is the delay bound: the
+    maximum over all y between the first and the last point of a of the time at which
+    b reaches y minus the time at which a reaches y. Both PLFs must be nondecreasing.
+    Then, the times at which they reach each y are given by their coordinates with x
+    and y swapped, so the deviation is computed with a single sweep over the y
+    coordinates of both PLFs in O(n+m). The deviation is at least 0, and it is
+    infinite if a exceeds the maximum of b.
+
+    Args:
+        a (PLF): The left curve, e.g. an arrival curve.
+        b (PLF): The right curve, e.g. a service curve.
+
+    Returns:
+        Deviation: The deviation and the point of a where it is attained, i.e. where
+            a reaches the y at which the deviation is the largest.
+    """
+    if not a.is_nondecreasing or not b.is_nondecreasing:
+        raise ValidationException(
+            "The horizontal deviation is only defined for nondecreasing PLFs."
+        )
+
+    lo, hi = a.y[0], a.y[-1]
+    if hi > b.y[-1]:
+        # a never reaches the y coordinates above the maximum of b
+        _, x = next(_sweep(a.y, a.x, [b.y[-1]]))
+        return Deviation(math.inf, x, b.y[-1])
+
+    at = _merged(a.y, b.y, lo, hi)
+    best = Deviation(-math.inf, a.x_start, lo)
+    for y, (a_x, a_right), (b_x, b_right) in zip(
+        at, _sweep(a.y, a.x, at), _sweep(b.y, b.x, at)
+    ):
+        if b_x - a_x > best.value:
+            best = Deviation(b_x - a_x, a_x, y)
+        if y < hi and b_right - a_right > best.value:
+            best = Deviation(b_right - a_right, a_right, y)
+    if best.value < 0:
+        # b already reaches every y before a
+        return Deviation(0.0, best.x, best.y)
+    return best
@@ -0,0 +1,351 @@
+import heapq
+import math
+from typing import Optional, Sequence
+
+from rtcvis.exceptions import RTCVisException
+from rtcvis.plf import PLF
+from rtcvis.point import Point
+
+# A linear segment given as (x0, y0, x1, y1, slope) with x0 < x1
+_Segment = tuple[float, float, float, float, float]
+
+
+def _value_at(segment: _Segment, x: float) -> float:
+    """Evaluates the line through a segment at x.
+
+    The end points are returned exactly so that no rounding errors are introduced at
+    breakpoints.
+    """
+    x0, y0, x1, y1, slope = segment
+    if x == x0:
+        return y0
+    if x == x1:
+        return y1
+    return slope * (x - x0) + y0
+
+
+class _EnvelopeSweep:
+    def __init__(self, plfs: Sequence[PLF], compute_min: bool) -> None:
+        """Left-to-right sweep over the segments of several PLFs.
+
+        The currently active segment of each PLF is stored in a leaf of a kinetic
+        tournament tree. Every inner node of that tree knows which of its two children
+        is the minimum (or maximum) at the current x and at which x this will change
+        (the certificate). An event queue contains the starts and ends of segments as
+        well as the failure times of all certificates, so the envelope is found in
+        O(N log N) for N segments (plus the number of envelope changes).
+
+        Args:
+            plfs (Sequence[PLF]): The PLFs. Empty PLFs are ignored.
+            compute_min (bool): Whether the lower (True) or upper (False) envelope
+                should be computed.
+        """
+        # the indices of the non-empty PLFs in plfs
+        self._indices = [i for i, plf in enumerate(plfs) if len(plf.x) > 0]
+        self._plfs = [plfs[i] for i in self._indices]
+        self._sign = 1.0 if compute_min else -1.0
+        self._compute_min = compute_min
+
+        n = len(self._plfs)
+        size = 1
+        while size < n:
+            size *= 2
+        self._size = size
+
+        # state of the leaves
+        self._segments: list[Optional[_Segment]] = [None] * n
+        self._next_idx = [0] * n
+
+        # state of the tournament tree, node 1 is the root and node i has the
+        # children 2i and 2i+1. The leaves are stored at size + i.
+        self._winner = [-1] * (2 * size)
+        self._version = [0] * (2 * size)
+
+        # The event queue contains tuples of (x, node, version). Leaf events use the
+        # version -1 and store the index of the PLF instead of the node.
+        self._events: list[tuple[float, int, int]] = [
+            (plf.x[0], i, -1) for i, plf in enumerate(self._plfs)
+        ]
+        heapq.heapify(self._events)
+        self._remaining = n
+
+        # the x coordinates at which the PLF that defines the envelope changes, along
+        # with the index of the new PLF in plfs (or -1 if there is none)
+        self.sources: list[tuple[float, int]] = []
+
+    def _duel(self, i: int, j: int, x: float) -> tuple[int, float]:
+        """Determines which of two leaves wins at x and when that will change.
+
+        The winner is decided by the intersection of the two lines instead of their
+        values at x, so that the result is consistent with the returned failure time.
+
+        Returns:
+            tuple[int, float]: The winning leaf and the x at which the other leaf will
+                take over (or infinity).
+        """
+        si, sj = self._segments[i], self._segments[j]
+        if si is None:
+            return j, math.inf
+        if sj is None:
+            return i, math.inf
+
+        sign = self._sign
+        mi, mj = si[4], sj[4]
+        if mi == mj:
+            # parallel lines never change their order
+            if sign * _value_at(si, x) <= sign * _value_at(sj, x):
+                return i, math.inf
+            return j, math.inf
+
+        # the same formula as in line_intersection
+        t = (sj[1] - si[1] + mi * si[0] - mj * sj[0]) / (mi - mj)
+        better_slope, other = (i, j) if sign * mi < sign * mj else (j, i)
+        if t <= x:
+            return better_slope, math.inf
+
+        # The order can only change before one of the segments ends. Checking this
+        # with the values at the end prevents events caused by rounding errors when
+        # the lines meet exactly at a breakpoint.
+        end = min(si[2], sj[2])
+        s_better = self._segments[better_slope]
+        s_other = self._segments[other]
+        assert s_better is not None and s_other is not None
+        if sign * _value_at(s_other, end) <= sign * _value_at(s_better, end):
+            return other, math.inf
+        return other, t
+
+    def _recompute(self, dirty: set[int], x: float) -> None:
+        """Recomputes the given inner nodes and all of their ancestors at x."""
+        winner, version, events = self._winner, self._version, self._events
+        queue = [-node for node in dirty]
+        heapq.heapify(queue)
+        while queue:
+            node = -heapq.heappop(queue)
+            if queue and -queue[0] == node:
+                continue
+            left, right = winner[2 * node], winner[2 * node + 1]
+            if left < 0 or right < 0:
+                new_winner, fail = max(left, right), math.inf
+            else:
+                new_winner, fail = self._duel(left, right, x)
+            winner[node] = new_winner
+            version[node] += 1
+            if fail != math.inf:
+                heapq.heappush(events, (fail, node, version[node]))
+            if node > 1:
+                heapq.heappush(queue, -(node // 2))
+
+    def _update_leaf(
+        self, i: int, x: float, starts: list[float], ends: list[float]
+    ) -> None:
+        """Advances the PLF with index i to its next segment after x."""
+        plf = self._plfs[i]
+        xs, ys = plf.x, plf.y
+        first = last = self._next_idx[i]
+        while last + 1 < len(xs) and xs[last + 1] == x:
+            last += 1
+
+        if first == 0:
+            starts.append(ys[first])
+        if last == len(xs) - 1:
+            # this was the last point of the PLF
+            ends.append(ys[last])
+            self._segments[i] = None
+            self._winner[self._size + i] = -1
+            self._remaining -= 1
+            return
+
+        x1, y0, y1 = xs[last + 1], ys[last], ys[last + 1]
+        self._segments[i] = (x, y0, x1, y1, (y1 - y0) / (x1 - x))
+        self._winner[self._size + i] = i
+        self._next_idx[i] = last + 1
+        heapq.heappush(self._events, (x1, i, -1))
+
+    def run(self) -> list[Point]:
+        """Performs the sweep.
+
+        Returns:
+            list[Point]: The points of the envelope. They may still contain redundant
+                points.
+        """
+        op = min if self._compute_min else max
+        events, segments, winner = self._events, self._segments, self._winner
+        points: list[Point] = []
+
+        while events and self._remaining > 0:
+            x = events[0][0]
+
+            root = winner[1]
+            root_segment = segments[root] if root >= 0 else None
+            left = _value_at(root_segment, x) if root_segment is not None else None
+
+            # process all events at this x
+            dirty: set[int] = set()
+            leaf_event = False
+            starts: list[float] = []
+            ends: list[float] = []
+            while events and events[0][0] == x:
+                _, node, version = heapq.heappop(events)
+                if version < 0:
+                    self._update_leaf(node, x, starts, ends)
+                    leaf_event = True
+                    node += self._size
+                elif version != self._version[node]:
+                    # the certificate is outdated
+                    continue
+                else:
+                    dirty.add(node)
+                    continue
+                if node > 1:
+                    dirty.add(node // 2)
+            self._recompute(dirty, x)
+
+            new_root = winner[1]
+            new_segment = segments[new_root] if new_root >= 0 else None
+            source = self._indices[new_root] if new_root >= 0 else -1
+            if not self.sources or self.sources[-1][1] != source:
+                self.sources.append((x, source))
+            if not leaf_event:
+                # only certificates failed, so the envelope is continuous here
+                if new_segment is not root_segment:
+                    assert left is not None
+                    points.append(Point(x, left))
+                continue
+
+            right = _value_at(new_segment, x) if new_segment is not None else None
+            if left is None:
+                # nothing was defined left of x
+                left = op(starts)
+            if right is None:
+                # nothing is defined right of x
+                if not ends:
+                    continue
+                right = op(ends)
+                if self._remaining > 0:
+                    raise RTCVisException(
+                        f"The PLFs are not defined everywhere between {x} and their"
+                        + " end, so their envelope would have a gap."
+                    )
+
+            points.append(Point(x, left))
+            if right != left:
+                points.append(Point(x, right))
+
+        return points
+
+
+def find_dominated(plfs: Sequence[PLF], compute_min: bool) -> set[int]:
+    """Finds the PLFs which can never be part of the envelope.
+
+    A PLF is dominated by another one if the other PLF is defined on its whole domain
+    and the other PLF's maximum is not larger than its minimum (or the other way round
+    for the upper envelope). Removing dominated PLFs doesn't change the envelope. If
+    two PLFs dominate each other, the one with the lower index is kept.
+
+    All PLFs are sorted by their start and a Fenwick tree over their ends keeps the
+    best bound of the PLFs seen so far, so this takes O(N log N) for N PLFs.
+
+    Args:
+        plfs (Sequence[PLF]): The PLFs. Empty PLFs are ignored.
+        compute_min (bool): Whether the PLFs are used for the lower (True) or upper
+            (False) envelope.
+
+    Returns:
+        set[int]: The indices of the dominated PLFs.
+    """
+    sign = 1.0 if compute_min else -1.0
+    candidates = [i for i, plf in enumerate(plfs) if len(plf.x) > 0]
+    # worst and best value of each PLF, so that a dominates b if worst(a) <= best(b)
+    worst = {
+        i: sign * (plfs[i].max.y if compute_min else plfs[i].min.y) for i in candidates
+    }
+    best = {
+        i: sign * (plfs[i].min.y if compute_min else plfs[i].max.y) for i in candidates
+    }
+
+    # the Fenwick tree is indexed by the rank of x_end in descending order, so that a
+    # prefix contains all PLFs that end at or after a given x
+    ends = sorted({plfs[i].x_end for i in candidates}, reverse=True)
+    end_rank = {x: r + 1 for r, x in enumerate(ends)}
+    tree: list[tuple[float, int]] = [(math.inf, -1)] * (len(ends) + 1)
+
+    dominated: set[int] = set()
+    candidates.sort(key=lambda i: plfs[i].x_start)
+    group_start = 0
+    while group_start < len(candidates):
+        x_start = plfs[candidates[group_start]].x_start
+        group_end = group_start
+        while (
+            group_end < len(candidates)
+            and plfs[candidates[group_end]].x_start == x_start
+        ):
+            group_end += 1
+        group = candidates[group_start:group_end]
+
+        # insert all PLFs starting at x_start before querying them, since PLFs with
+        # the same start may dominate each other
+        for i in group:
+            r = end_rank[plfs[i].x_end]
+            while r < len(tree):
+                tree[r] = min(tree[r], (worst[i], i))
+                r += r & -r
+        for i in group:
+            r = end_rank[plfs[i].x_end]
+            bound = (math.inf, -1)
+            while r > 0:
+                bound = min(bound, tree[r])
+                r -= r & -r
+            if bound < (best[i], i):
+                dominated.add(i)
+
+        group_start = group_end
+
+    return dominated
+
+
+def plf_envelope(plfs: Sequence[PLF], compute_min: bool) -> PLF:
+    """Computes the lower or upper envelope of several PLFs.
+
+    The result has the value of the minimum (or maximum) of all PLFs that are defined
+    at a given x. Unlike plf_list_min_max, which folds the PLFs one at a time, this
+    function performs a single sweep over the segments of all PLFs and thus runs in
+    O(N log N) for a total of N points.
+
+    At discontinuities, the left value of the envelope is the minimum/maximum of the
+    left values of all PLFs which are defined left of x and the right value is computed
+    from all PLFs which are defined right of x. Only at the very start and end of the
+    envelope, the values of PLFs that start or end at x are used instead.
+
+    Args:
+        plfs (Sequence[PLF]): The PLFs. Their union must be defined everywhere between
+            the smallest x_start and the largest x_end.
+        compute_min (bool): If True, the lower envelope is computed, else the upper
+            envelope.
+
+    Returns:
+        PLF: The envelope.
+    """
+    return PLF._from_points(_EnvelopeSweep(plfs, compute_min).run()).simplified()
+
+
+def plf_envelope_sources(
+    plfs: Sequence[PLF], compute_min: bool
+) -> tuple[PLF, list[tuple[float, int]]]:
+    """Computes the envelope of several PLFs and which PLF defines it where.
+
+    See plf_envelope for details on the envelope.
+
+    Args:
+        plfs (Sequence[PLF]): The PLFs. Their union must be defined everywhere between
+            the smallest x_start and the largest x_end.
+        compute_min (bool): If True, the lower envelope is computed, else the upper
+            envelope.
+
+    Returns:
+        tuple[PLF, list[tuple[float, int]]]: The envelope and a list of tuples (x, i),
+            sorted by x. Right of each x (until the next one), the envelope is defined
+            by plfs[i]. If i is -1, no PLF is defined right of x.
+    """
+    sweep = _EnvelopeSweep(plfs, compute_min)
+    envelope = PLF._from_points(sweep.run()).simplified()
+    return envelope, sweep.sources
@@ -2,7 +2,7 @@ class RTCVisException(Exception):
     """Base class for all rtcvis exceptions."""
 
 
-class ValidationException(RTCVisException):
+class ValidationException(RTCVisException, ValueError):
     def __init__(self, msg: str):
         """Exception for failed input validation.
 
@@ -0,0 +1,219 @@
+import operator
+from typing import Optional
+
+from rtcvis.exceptions import ValidationException
+from rtcvis.plf import PLF, plf_min_max
+from rtcvis.point import Point
+
+
+class RateLatency(PLF):
+    def __init__(self, rate: float, latency: float, x_end: float) -> None:
+        """A rate-latency service curve rate * max(0, x - latency) on [0, x_end].
+
+        The parameters are kept, so that conv and plf_min_max can use closed forms
+        for these curves. Otherwise, it is an ordinary PLF.
+
+        Args:
+            rate (float): The rate, which must not be negative.
+            latency (float): The latency, which must not be negative.
+            x_end (float): The end of the curve, which must not be before the latency.
+        """
+        if rate < 0 or latency < 0:
+            raise ValidationException("The rate and latency must not be negative.")
+        if x_end < latency:
+            raise ValidationException("The curve must not end before its latency.")
+        points = [Point(0, 0)]
+        if latency > 0:
+            points.append(Point(latency, 0))
+        if x_end > latency:
+            points.append(Point(x_end, rate * (x_end - latency)))
+        self._init_points(points, [p.x for p in points], [p.y for p in points])
+        self._rate = rate
+        self._latency = latency
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    @property
+    def latency(self) -> float:
+        return self._latency
+
+    def __repr__(self) -> str:
+        return f"RateLatency({self._rate!r}, {self._latency!r}, {self.x_end!r})"
+
+    def _min_max_closed_form(self, other: PLF, compute_min: bool) -> Optional[PLF]:
+        if not isinstance(other, RateLatency) or other.x_end != self.x_end:
+            return None
+        compare = operator.le if compute_min else operator.ge
+        # both curves are 0 until their latency and linear afterwards, so one of
+        # them is below the other one everywhere if it is at both of these points
+        for low, high in ((self, other), (other, self)):
+            if compare(high.latency, low.latency) and compare(low.y[-1], high.y[-1]):
+                return low
+        return None
+
+
+class TokenBucket(PLF):
+    def __init__(self, burst: float, rate: float, x_end: float) -> None:
+        """A token bucket arrival curve burst + rate * x on [0, x_end].
+
+        Like in the RTC toolbox, the curve is 0 at x = 0 and jumps to burst right
+        after it. The parameters are kept, so that conv and plf_min_max can use
+        closed forms for these curves. Otherwise, it is an ordinary PLF.
+
+        Args:
+            burst (float): The burst, which must not be negative.
+            rate (float): The rate, which must not be negative.
+            x_end (float): The end of the curve, which must not be negative.
+        """
+        if burst < 0 or rate < 0:
+            raise ValidationException("The burst and rate must not be negative.")
+        if x_end < 0:
+            raise ValidationException("The curve must not end before 0.")
+        points = [Point(0, 0)]
+        if burst > 0:
+            points.append(Point(0, burst))
+        if x_end > 0:
+            points.append(Point(x_end, burst + rate * x_end))
+        self._init_points(points, [p.x for p in points], [p.y for p in points])
+        self._burst = burst
+        self._rate = rate
+
+    @property
+    def burst(self) -> float:
+        return self._burst
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    def __repr__(self) -> str:
+        return f"TokenBucket({self._burst!r}, {self._rate!r}, {self.x_end!r})"
+
+    def _min_max_closed_form(self, other: PLF, compute_min: bool) -> Optional[PLF]:
+        if not isinstance(other, TokenBucket) or other.x_end != self.x_end:
+            return None
+        compare = operator.le if compute_min else operator.ge
+        ext = min if compute_min else max
+        a_end, b_end = self.y[-1], other.y[-1]
+        # both curves are linear after 0, so they cross at most once
+        for low, high in ((self, other), (other, self)):
+            if compare(low.burst, high.burst) and compare(low.y[-1], high.y[-1]):
+                return low
+        d0, d1 = self.burst - other.burst, a_end - b_end
+        s = d0 / (d0 - d1)
+        points = [Point(0, 0)]
+        if ext(self.burst, other.burst) > 0:
+            points.append(Point(0, ext(self.burst, other.burst)))
+        points.append(
+            Point(s * self.x_end, self.burst + s * (a_end - self.burst)),
+        )
+        points.append(Point(self.x_end, ext(a_end, b_end)))
+        return PLF._from_points(points)
+
+
+def rate_latency_conv(a: RateLatency, b: RateLatency) -> PLF:
+    """Computes the min-plus convolution of two rate-latency curves in O(1).
+
+    Both curves are convex, so the result consists of both latencies followed by the
+    rising parts of both curves, sorted by their rates. It is a RateLatency again
+    with the sum of the latencies and the minimum of the rates if only one of the
+    curves has a rising part or if both have the same rate.
+
+    Args:
+        a (RateLatency): The first curve.
+        b (RateLatency): The second curve.
+
+    Returns:
+        PLF: The result.
+    """
+    slow, fast = (a, b) if a.rate <= b.rate else (b, a)
+    latency = a.latency + b.latency
+    x_end = a.x_end + b.x_end
+    slow_len, fast_len = slow.x_end - slow.latency, fast.x_end - fast.latency
+    if slow_len == 0 or fast_len == 0 or slow.rate == fast.rate:
+        rate = fast.rate if slow_len == 0 else slow.rate
+        return RateLatency(rate, latency, x_end)
+    points = [Point(0, 0)]
+    if latency > 0:
+        points.append(Point(latency, 0))
+    points.append(Point(latency + slow_len, slow.y[-1]))
+    points.append(Point(latency + slow_len + fast_len, slow.y[-1] + fast.y[-1]))
+    return PLF._from_points(points).simplified()
+
+
+def _concatenated(a: TokenBucket, b: TokenBucket) -> list[Point]:
+    """The points of b appended to the end of a."""
+    points = list(a.points)
+    offset, y = a.x_end, a.y[-1]
+    for x_b, y_b in zip(b.x[1:], b.y[1:]):
+        points.append(Point(offset + x_b, y + y_b))
+    return points
+
+
+def token_bucket_conv(a: TokenBucket, b: TokenBucket) -> PLF:
+    """Computes the min-plus convolution of two token bucket curves in O(1).
+
+    The sum a(delta - lambda) + b(lambda) is concave in lambda, so its minimum is at
+    one of the ends of the interval of lambdas for which both curves are defined.
+    These are the curves which use as much of a (or b) as possible, i.e. b appended
+    to the end of a or a appended to the end of b, and the result is their minimum.
+    A curve which ends at 0 only has the value 0 there, so the result is the other
+    curve in this case.
+
+    Args:
+        a (TokenBucket): The first curve.
+        b (TokenBucket): The second curve.
+
+    Returns:
+        PLF: The result.
+    """
+    if a.x_end == 0 and b.x_end == 0:
+        # both only consist of their discontinuity at 0, keep the smaller one
+        return a if a.burst <= b.burst else b
+    if a.x_end == 0:
+        return b
+    if b.x_end == 0:
+        return a
+    return plf_min_max(
+        PLF._from_points(_concatenated(a, b)),
+        PLF._from_points(_concatenated(b, a)),
+        compute_min=True,
+    )
+
+
+def token_bucket_deconv(a: TokenBucket, b: RateLatency) -> PLF:
+    """Computes the min-plus deconvolution of a token bucket by a rate-latency curve.
+
+    This is the output arrival curve of a flow with the arrival curve a at a server
+    with the service curve b. The value at delta is the maximum of the concave
+    function a(delta + lambda) - b(lambda) over lambda. It is at lambda = latency
+    (clipped to the interval where both curves are defined) if the rate of a is at
+    most the rate of b, else at the largest possible lambda. This optimal lambda and
+    thus the result only change their slope when delta passes one of at most six
+    points, so the result is computed in O(1) by evaluating it at these.
+
+    Args:
+        a (TokenBucket): The arrival curve.
+        b (RateLatency): The service curve.
+
+    Returns:
+        PLF: The result.
+    """
+    a_end, b_end, latency = a.x_end, b.x_end, b.latency
+    deltas = sorted(
+        {
+            delta
+            for delta in (-b_end, -latency, 0, a_end - b_end, a_end - latency, a_end)
+            if -b_end <= delta <= a_end
+        }
+    )
+    points = []
+    for delta in deltas:
+        lo, hi = max(0.0, -delta), min(b_end, a_end - delta)
+        lam = min(max(latency, lo), hi) if a.rate <= b.rate else hi
+        # a is evaluated with its right limit at 0, which is the supremum there
+        value = a.burst + a.rate * (delta + lam) - b.rate * max(0.0, lam - latency)
+        points.append(Point(delta, value))
+    return PLF._from_points(points).simplified()
@@ -0,0 +1,332 @@
+from typing import Optional, Sequence, Union
+
+import numpy as np
+import numpy.typing as npt
+
+from rtcvis.exceptions import ValidationException
+from rtcvis.plf import PLF
+from rtcvis.point import Point
+
+FloatArray = npt.NDArray[np.float64]
+
+
+class NumpyPLF(PLF):
+    def __init__(self, points: Sequence[Point | tuple[float, float]]) -> None:
+        """A PLF whose points are stored in contiguous NumPy arrays.
+
+        This class can be used instead of PLF for functions with a lot of points. The
+        x and y coordinates are stored in float64 arrays and all operations that
+        create new PLFs from a single PLF (truncating, transforming, simplifying,
+        adding and subtracting) are vectorized. Point objects are only created when the
+        points property is accessed.
+
+        The rules for the points are the same as for PLF.
+
+        Args:
+            points (Sequence[Point | tuple[float, float]]): The points which define the
+                PLF. They must be in the correct order (x may not decrease). The list
+                elements can either be Point instances or tuples of x and y coordinates.
+        """
+        x = np.array([p.x if isinstance(p, Point) else p[0] for p in points], float)
+        y = np.array([p.y if isinstance(p, Point) else p[1] for p in points], float)
+        self._init_arrays(x, y)
+
+    def _init_arrays(self, x: FloatArray, y: FloatArray) -> None:
+        """Validates the coordinates and initializes all attributes."""
+        dx = np.diff(x)
+        if np.any(dx < 0):
+            raise ValidationException("The points must have ascending x coordinates.")
+        if np.any((dx[:-1] == 0) & (dx[1:] == 0)):
+            raise ValidationException(
+                "There may not be more than two points with the same x coordinate."
+            )
+
+        self._xs = np.ascontiguousarray(x, dtype=np.float64)
+        self._ys = np.ascontiguousarray(y, dtype=np.float64)
+        self._lazy_points: Optional[list[Point]] = None
+        self._hash = None
+        self._slopes = None
+        self._shape = None
+
+        if len(x) == 0:
+            self._x_start = 0.0
+            self._x_end = 0.0
+            self._min = Point(0, 0)
+            self._max = Point(0, 0)
+        else:
+            self._x_start = float(x[0])
+            self._x_end = float(x[-1])
+            i_min, i_max = int(np.argmin(y)), int(np.argmax(y))
+            self._min = Point(float(x[i_min]), float(y[i_min]))
+            self._max = Point(float(x[i_max]), float(y[i_max]))
+
+    @classmethod
+    def from_arrays(cls, x: npt.ArrayLike, y: npt.ArrayLike) -> "NumpyPLF":
+        """Creates a NumpyPLF from arrays of x and y coordinates.
+
+        Args:
+            x (npt.ArrayLike): The x coordinates.
+            y (npt.ArrayLike): The y coordinates. Must have the same length as x.
+
+        Returns:
+            NumpyPLF: The new PLF.
+        """
+        x_arr = np.asarray(x, dtype=np.float64).ravel()
+        y_arr = np.asarray(y, dtype=np.float64).ravel()
+        if len(x_arr) != len(y_arr):
+            raise ValidationException("x and y must have the same length.")
+        plf = cls.__new__(cls)
+        plf._init_arrays(x_arr, y_arr)
+        return plf
+
+    @classmethod
+    def from_plf(cls, plf: PLF) -> "NumpyPLF":
+        """Converts a PLF to a NumpyPLF.
+
+        Args:
+            plf (PLF): The PLF to convert.
+
+        Returns:
+            NumpyPLF: The converted PLF. If plf is already a NumpyPLF, it is returned
+                unchanged.
+        """
+        if isinstance(plf, NumpyPLF):
+            return plf
+        return cls.from_arrays(plf.x, plf.y)
+
+    def to_plf(self) -> PLF:
+        """Converts this function to a regular PLF.
+
+        Returns:
+            PLF: The converted PLF.
+        """
+        return PLF(self.points)
+
+    @property
+    def points(self) -> list[Point]:
+        if self._lazy_points is None:
+            self._lazy_points = [
+                Point(x, y) for x, y in zip(self._xs.tolist(), self._ys.tolist())
+            ]
+        return self._lazy_points
+
+    @property
+    def x(self) -> FloatArray:
+        return self._xs
+
+    @property
+    def y(self) -> FloatArray:
+        return self._ys
+
+    @property
+    def slopes(self) -> list[float]:
+        if self._slopes is None:
+            dx, dy = np.diff(self._xs), np.diff(self._ys)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                # like in PLF, identical points get a slope of NaN
+                slopes = np.where(dx != 0, dy / dx, np.sign(dy) * np.inf)
+            self._slopes = slopes.tolist()
+        return self._slopes
+
+    def __repr__(self) -> str:
+        return f"NumpyPLF([{', '.join([repr(point) for point in self.points])}])"
+
+    def start_truncated(self, x_start: float) -> "NumpyPLF":
+        if self.x_start >= x_start:
+            return self
+
+        x, y = self._xs, self._ys
+        idx = int(np.searchsorted(x, x_start, side="left"))
+        if idx == len(x):
+            return NumpyPLF.from_arrays([], [])
+        if x[idx] == x_start:
+            return NumpyPLF.from_arrays(x[idx:], y[idx:])
+        # create a new point at x_start
+        slope = (y[idx] - y[idx - 1]) / (x[idx] - x[idx - 1])
+        new_y = slope * (x_start - x[idx - 1]) + y[idx - 1]
+        return NumpyPLF.from_arrays(
+            np.concatenate(([x_start], x[idx:])), np.concatenate(([new_y], y[idx:]))
+        )
+
+    def end_truncated(self, x_end: float) -> "NumpyPLF":
+        if self.x_end <= x_end:
+            return self
+
+        x, y = self._xs, self._ys
+        idx = int(np.searchsorted(x, x_end, side="right")) - 1
+        if idx < 0:
+            return NumpyPLF.from_arrays([], [])
+        if x[idx] == x_end:
+            return NumpyPLF.from_arrays(x[: idx + 1], y[: idx + 1])
+        # create a new point at x_end
+        slope = (y[idx + 1] - y[idx]) / (x[idx + 1] - x[idx])
+        new_y = slope * (x_end - x[idx]) + y[idx]
+        return NumpyPLF.from_arrays(
+            np.concatenate((x[: idx + 1], [x_end])),
+            np.concatenate((y[: idx + 1], [new_y])),
+        )
+
+    def add_plf(self, other: PLF, subtract_y: bool) -> "NumpyPLF":
+        a, b = match_numpy_plf(self, NumpyPLF.from_plf(other))
+        new_y = a.y - b.y if subtract_y else a.y + b.y
+        return NumpyPLF.from_arrays(a.x, new_y).simplified()
+
+    def __add__(self, other: Union[PLF, Point]) -> "NumpyPLF":
+        if isinstance(other, PLF):
+            return self.add_plf(other, False)
+        return self.add_point(other, False, False)
+
+    def __sub__(self, other: Union[PLF, Point]) -> "NumpyPLF":
+        if isinstance(other, PLF):
+            return self.add_plf(other, subtract_y=True)
+        return self.add_point(other, True, True)
+
+    def transformed(self, mirror: bool, offset: float) -> "NumpyPLF":
+        if mirror:
+            return NumpyPLF.from_arrays(-self._xs[::-1] + offset, self._ys[::-1])
+        return NumpyPLF.from_arrays(self._xs + offset, self._ys)
+
+    def get_value(self, x: float, right: bool = False) -> float:
+        self._check_defined(x, x)
+
+        xs, ys = self._xs, self._ys
+        idx = int(np.searchsorted(xs, x, side="left"))
+        if xs[idx] == x:
+            if right:
+                idx = int(np.searchsorted(xs, x, side="right")) - 1
+            return float(ys[idx])
+        slope = (ys[idx] - ys[idx - 1]) / (xs[idx] - xs[idx - 1])
+        return float(slope * (x - xs[idx - 1]) + ys[idx - 1])
+
+    def _evaluate_many(  # type: ignore[override]
+        self, xs: npt.ArrayLike, right: bool
+    ) -> FloatArray:
+        """Vectorized evaluation using np.searchsorted."""
+        queries = np.asarray(xs, dtype=np.float64)
+        if queries.size == 0:
+            return np.empty(queries.shape)
+        self._check_defined(float(queries.min()), float(queries.max()))
+
+        px, py = self._xs, self._ys
+        if right:
+            idx = np.searchsorted(px, queries, side="right")
+            own = idx - 1
+        else:
+            idx = np.searchsorted(px, queries, side="left")
+            own = np.minimum(idx, len(px) - 1)
+        nxt = np.clip(idx, 1, len(px) - 1)
+        prev = nxt - 1
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slope = (py[nxt] - py[prev]) / (px[nxt] - px[prev])
+            interpolated = slope * (queries - px[prev]) + py[prev]
+        return np.where(px[own] == queries, py[own], interpolated)
+
+    # the vectorized versions return arrays instead of lists
+    def evaluate_many_left(  # type: ignore[override]
+        self, xs: npt.ArrayLike
+    ) -> FloatArray:
+        return self._evaluate_many(xs, right=False)
+
+    evaluate_many = evaluate_many_left
+
+    def evaluate_many_right(  # type: ignore[override]
+        self, xs: npt.ArrayLike
+    ) -> FloatArray:
+        return self._evaluate_many(xs, right=True)
+
+    def simplified(self) -> "NumpyPLF":
+        if len(self._xs) <= 1:
+            return self
+
+        # remove all duplicate points
+        x, y = self._xs, self._ys
+        keep = np.ones(len(x), dtype=bool)
+        keep[1:] = (x[1:] != x[:-1]) | (y[1:] != y[:-1])
+        x, y = x[keep], y[keep]
+
+        if len(x) < 3:
+            return NumpyPLF.from_arrays(x, y)
+
+        # remove all points where the slope doesn't change, vertical segments get a
+        # slope of NaN, which is never equal to any other slope
+        dx, dy = np.diff(x), np.diff(y)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slopes = np.where(dx != 0, dy / dx, np.nan)
+        keep = np.ones(len(x), dtype=bool)
+        keep[1:-1] = slopes[:-1] != slopes[1:]
+        return NumpyPLF.from_arrays(x[keep], y[keep])
+
+    def add_point(self, other: Point, subtract_x: bool, subtract_y: bool) -> "NumpyPLF":
+        new_x = self._xs - other.x if subtract_x else self._xs + other.x
+        new_y = self._ys - other.y if subtract_y else self._ys + other.y
+        return NumpyPLF.from_arrays(new_x, new_y)
+
+
+def _values_on_grid(
+    plf: NumpyPLF,
+    ux: FloatArray,
+    mult: npt.NDArray[np.intp],
+    rank: npt.NDArray[np.intp],
+) -> FloatArray:
+    """Computes the y values of plf on a grid of x coordinates.
+
+    Args:
+        plf (NumpyPLF): The function, which must be defined at all x in the grid.
+        ux (FloatArray): The unique x coordinates of the grid.
+        mult (npt.NDArray[np.intp]): How often each x coordinate occurs in the grid.
+        rank (npt.NDArray[np.intp]): For each grid point, whether it is the first (0)
+            or second (1) point at its x coordinate.
+
+    Returns:
+        FloatArray: The y coordinates for all grid points.
+    """
+    x, y = plf.x, plf.y
+    left = np.searchsorted(x, ux, side="left")
+    right = np.searchsorted(x, ux, side="right")
+    count = right - left
+
+    # interpolate where plf does not have a point, the indices are clipped so that
+    # they're valid for the grid points where plf does have points
+    nxt = np.clip(right, 1, len(x) - 1)
+    prev = nxt - 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = (y[nxt] - y[prev]) / (x[nxt] - x[prev])
+        interpolated = slope * (ux - x[prev]) + y[prev]
+
+    # take the first or second point if plf has points at that x, if there's only one
+    # point, it is used twice
+    own_idx = np.repeat(left, mult) + np.minimum(rank, np.repeat(count, mult) - 1)
+    own = y[np.clip(own_idx, 0, len(y) - 1)]
+    return np.where(np.repeat(count, mult) > 0, own, np.repeat(interpolated, mult))
+
+
+def match_numpy_plf(a: NumpyPLF, b: NumpyPLF) -> tuple[NumpyPLF, NumpyPLF]:
+    """Vectorized version of rtcvis.plf.match_plf for NumpyPLFs.
+
+    After matching the PLFs, they will have the same number of points and the points of
+    those two functions will always be defined at the same x coordinates. The given
+    PLFs will not be modified.
+
+    Returns:
+        tuple[NumpyPLF, NumpyPLF]: The matched functions.
+    """
+    # Truncate the functions so they start/end at the same x coordinates
+    a = a.start_truncated(b.x_start).end_truncated(b.x_end)
+    b = b.start_truncated(a.x_start).end_truncated(a.x_end)
+
+    if len(a.x) == 0 or len(b.x) == 0:
+        # the functions are not overlapping -> return empty PLFs
+        return NumpyPLF.from_arrays([], []), NumpyPLF.from_arrays([], [])
+
+    # every x needs as many points as the PLF with more points at that x has
+    ux = np.union1d(a.x, b.x)
+    count_a = np.searchsorted(a.x, ux, "right") - np.searchsorted(a.x, ux, "left")
+    count_b = np.searchsorted(b.x, ux, "right") - np.searchsorted(b.x, ux, "left")
+    mult = np.maximum(count_a, count_b)
+    grid_x = np.repeat(ux, mult)
+    rank = np.arange(len(grid_x)) - np.repeat(np.cumsum(mult) - mult, mult)
+
+    return (
+        NumpyPLF.from_arrays(grid_x, _values_on_grid(a, ux, mult, rank)),
+        NumpyPLF.from_arrays(grid_x, _values_on_grid(b, ux, mult, rank)),
+    )
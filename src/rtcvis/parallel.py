@@ -0,0 +1,451 @@
+import math
+import os
+import threading
+from array import array
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from typing import Callable, Iterable, Iterator, Optional
+
+from rtcvis.conv import ConvType, _chunk_borders, _conv_breakpoints, conv
+from rtcvis.plf import PLF, plf_join, plf_min_max
+from rtcvis.point import Point
+
+# A PLF with n points is sent to and from the workers as an array of 2n doubles, the
+# x coordinates followed by the y coordinates.
+_EncodedJob = tuple[array, array, int]
+
+
+def encode_plf(plf: PLF) -> array:
+    """Converts a PLF into a compact array of doubles.
+
+    Args:
+        plf (PLF): The PLF.
+
+    Returns:
+        array: The x coordinates followed by the y coordinates.
+    """
+    encoded = array("d", plf.x)
+    encoded.extend(plf.y)
+    return encoded
+
+
+def decode_plf(encoded: array) -> PLF:
+    """Converts the result of encode_plf back into a PLF.
+
+    The points are not validated again, so the array must have been created by
+    encode_plf.
+
+    Args:
+        encoded (array): The encoded PLF.
+
+    Returns:
+        PLF: The PLF.
+    """
+    n = len(encoded) // 2
+    return PLF._from_points(
+        [Point(x, y) for x, y in zip(encoded[:n].tolist(), encoded[n:].tolist())]
+    )
+
+
+def _conv_chunk(chunk: list[_EncodedJob]) -> list[array]:
+    """Computes the convolutions of a chunk of jobs in a worker process."""
+    return [
+        encode_plf(conv(decode_plf(a), decode_plf(b), ConvType(conv_type)))
+        for a, b, conv_type in chunk
+    ]
+
+
+def _conv_window(
+    a: array, b: array, conv_type: int, start: float, stop: float
+) -> array:
+    """Computes a convolution in the window [start, stop] in a worker process."""
+    return encode_plf(
+        conv(decode_plf(a), decode_plf(b), ConvType(conv_type), start=start, stop=stop)
+    )
+
+
+def _min_max_chunk(a: array, b: array, compute_min: bool) -> array:
+    """Computes plf_min_max of a chunk in a worker process."""
+    return encode_plf(plf_min_max(decode_plf(a), decode_plf(b), compute_min))
+
+
+def _add_chunk(a: array, b: array, subtract_y: bool) -> array:
+    """Computes add_plf of a chunk in a worker process."""
+    return encode_plf(decode_plf(a).add_plf(decode_plf(b), subtract_y))
+
+
+def _truncated(plf: PLF, x_start: float, x_end: float) -> PLF:
+    return plf.start_truncated(x_start).end_truncated(x_end)
+
+
+class ConvPool:
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        """A pool of worker processes which compute convolutions.
+
+        The processes are started when they're first needed and kept until shutdown
+        is called, so the pool can be reused for many calls of conv_many. It can also
+        be used as a context manager which shuts it down at the end.
+
+        Args:
+            max_workers (Optional[int], optional): The number of worker processes. If
+                it is None, the number of CPUs is used. Defaults to None.
+        """
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    def shutdown(self) -> None:
+        """Stops the worker processes."""
+        self._executor.shutdown()
+
+    def __enter__(self) -> "ConvPool":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.shutdown()
+
+    def _submit(
+        self, jobs: Iterable[tuple[PLF, PLF, ConvType]], chunksize: Optional[int]
+    ) -> tuple[list[Future], list[int]]:
+        """Splits the jobs into chunks and submits them to the workers.
+
+        Returns:
+            tuple[list[Future], list[int]]: The futures of the chunks and the index of
+                the first job of each chunk.
+        """
+        encoded = [
+            (encode_plf(a), encode_plf(b), conv_type.value) for a, b, conv_type in jobs
+        ]
+        if chunksize is None:
+            chunksize = max(1, math.ceil(len(encoded) / (4 * self._max_workers)))
+        starts = list(range(0, len(encoded), chunksize))
+        futures = [
+            self._executor.submit(_conv_chunk, encoded[start : start + chunksize])
+            for start in starts
+        ]
+        return futures, starts
+
+    def conv_many(
+        self,
+        jobs: Iterable[tuple[PLF, PLF, ConvType]],
+        chunksize: Optional[int] = None,
+    ) -> Iterator[PLF]:
+        """Computes the convolutions of many pairs of PLFs in the worker processes.
+
+        The jobs are split into chunks, each chunk is computed by one worker. All
+        jobs are submitted immediately, the results can then be consumed from the
+        returned iterator in the order of the jobs.
+
+        Args:
+            jobs (Iterable[tuple[PLF, PLF, ConvType]]): The arguments of conv.
+            chunksize (Optional[int], optional): The number of jobs per chunk. If it
+                is None, the jobs are split into about four chunks per worker.
+                Defaults to None.
+
+        Returns:
+            Iterator[PLF]: The results.
+        """
+        futures, _ = self._submit(jobs, chunksize)
+        return self._iter_ordered(futures)
+
+    def conv_many_unordered(
+        self,
+        jobs: Iterable[tuple[PLF, PLF, ConvType]],
+        chunksize: Optional[int] = None,
+    ) -> Iterator[tuple[int, PLF]]:
+        """Like conv_many, but returns the results as soon as their chunk is done.
+
+        Args:
+            jobs (Iterable[tuple[PLF, PLF, ConvType]]): The arguments of conv.
+            chunksize (Optional[int], optional): The number of jobs per chunk.
+                Defaults to None.
+
+        Returns:
+            Iterator[tuple[int, PLF]]: Tuples of the index of a job and its result.
+        """
+        futures, starts = self._submit(jobs, chunksize)
+        return self._iter_completed(futures, starts)
+
+    def _pointwise(
+        self, a: PLF, b: PLF, chunks: Optional[int], fn: Callable, arg: bool
+    ) -> Optional[PLF]:
+        """Computes a pointwise operation in chunks of the domain where a and b overlap.
+
+        Returns:
+            Optional[PLF]: The joined result or None if there's only a single chunk.
+        """
+        x_start, x_end = max(a.x_start, b.x_start), min(a.x_end, b.x_end)
+        if len(a.points) == 0 or len(b.points) == 0 or x_start >= x_end:
+            return None
+        chunks = chunks or self._max_workers
+        borders = _chunk_borders([*a.x, *b.x], x_start, x_end, chunks)
+        if len(borders) <= 2:
+            return None
+        futures = [
+            self._executor.submit(
+                fn,
+                encode_plf(_truncated(a, lo, hi)),
+                encode_plf(_truncated(b, lo, hi)),
+                arg,
+            )
+            for lo, hi in zip(borders, borders[1:])
+        ]
+        return plf_join([decode_plf(future.result()) for future in futures])
+
+    def min_max(
+        self, a: PLF, b: PLF, compute_min: bool, chunks: Optional[int] = None
+    ) -> PLF:
+        """Computes plf_min_max by splitting the domain into chunks.
+
+        The domain where a and b overlap is split into chunks with about the same
+        number of breakpoints. Each chunk is computed by a worker from the truncated
+        PLFs and the results are joined with plf_join.
+
+        Args:
+            a (PLF): First PLF.
+            b (PLF): Second PLF.
+            compute_min (bool): If True, the minimum is computed, else the maximum.
+            chunks (Optional[int], optional): The number of chunks. If it is None,
+                there is a chunk per worker. Defaults to None.
+
+        Returns:
+            PLF: The minimum/maximum of a and b.
+        """
+        result = self._pointwise(a, b, chunks, _min_max_chunk, compute_min)
+        if result is None:
+            return plf_min_max(a, b, compute_min)
+        return result
+
+    def add(
+        self, a: PLF, b: PLF, subtract_y: bool = False, chunks: Optional[int] = None
+    ) -> PLF:
+        """Computes a.add_plf(b, subtract_y) by splitting the domain into chunks.
+
+        This works like min_max.
+
+        Args:
+            a (PLF): First PLF.
+            b (PLF): Second PLF.
+            subtract_y (bool, optional): Whether to subtract b instead of adding it.
+                Defaults to False.
+            chunks (Optional[int], optional): The number of chunks. If it is None,
+                there is a chunk per worker. Defaults to None.
+
+        Returns:
+            PLF: The sum (or difference) of a and b.
+        """
+        result = self._pointwise(a, b, chunks, _add_chunk, subtract_y)
+        if result is None:
+            return a.add_plf(b, subtract_y)
+        return result
+
+    def conv(
+        self, a: PLF, b: PLF, conv_type: ConvType, chunks: Optional[int] = None
+    ) -> PLF:
+        """Computes a single convolution by splitting the domain of the result.
+
+        The domain of the result is split into windows with about the same number of
+        candidate breakpoints, which are the sums (or differences) of the x
+        coordinates of a and b. A worker computes the result in each window with the
+        windowed algorithm of conv, which only uses the candidates that overlap the
+        window, and the windows are joined with plf_join.
+
+        Args:
+            a (PLF): PLF a.
+            b (PLF): PLF b.
+            conv_type (ConvType): The type of convolution.
+            chunks (Optional[int], optional): The maximum number of windows. If it is
+                None, there is a window per worker. Defaults to None.
+
+        Returns:
+            PLF: The result of the convolution.
+        """
+        if conv_type.is_deconv:
+            x_start, x_end = a.x_start - b.x_end, a.x_end - b.x_start
+        else:
+            x_start, x_end = a.x_start + b.x_start, a.x_end + b.x_end
+        if len(a.points) == 0 or len(b.points) == 0 or x_start >= x_end:
+            return conv(a, b, conv_type)
+        borders = _chunk_borders(
+            _conv_breakpoints(a, b, conv_type),
+            x_start,
+            x_end,
+            chunks or self._max_workers,
+        )
+        if len(borders) <= 2:
+            return conv(a, b, conv_type)
+        encoded_a, encoded_b = encode_plf(a), encode_plf(b)
+        futures = [
+            self._executor.submit(
+                _conv_window, encoded_a, encoded_b, conv_type.value, lo, hi
+            )
+            for lo, hi in zip(borders, borders[1:])
+        ]
+        return plf_join([decode_plf(future.result()) for future in futures])
+
+    @staticmethod
+    def _iter_ordered(futures: list[Future]) -> Iterator[PLF]:
+        for future in futures:
+            for result in future.result():
+                yield decode_plf(result)
+
+    @staticmethod
+    def _iter_completed(
+        futures: list[Future], starts: list[int]
+    ) -> Iterator[tuple[int, PLF]]:
+        start_of = dict(zip(futures, starts))
+        for future in as_completed(futures):
+            for i, result in enumerate(future.result()):
+                yield start_of[future] + i, decode_plf(result)
+
+
+_default_pool: Optional[ConvPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_pool(max_workers: Optional[int] = None) -> ConvPool:
+    """Returns the shared ConvPool used by conv_many.
+
+    The pool is created on the first call and replaced if a different number of
+    workers is requested.
+
+    Args:
+        max_workers (Optional[int], optional): The number of worker processes. If it
+            is None, the existing pool is returned or one with a worker per CPU is
+            created. Defaults to None.
+
+    Returns:
+        ConvPool: The pool.
+    """
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is not None and max_workers not in (
+            None,
+            _default_pool.max_workers,
+        ):
+            _default_pool.shutdown()
+            _default_pool = None
+        if _default_pool is None:
+            _default_pool = ConvPool(max_workers)
+        return _default_pool
+
+
+def conv_many(
+    jobs: Iterable[tuple[PLF, PLF, ConvType]],
+    max_workers: Optional[int] = None,
+    chunksize: Optional[int] = None,
+) -> Iterator[PLF]:
+    """Computes the convolutions of many pairs of PLFs on all CPU cores.
+
+    This uses the shared pool returned by get_pool, so the worker processes are only
+    started once. See ConvPool.conv_many for details.
+
+    Args:
+        jobs (Iterable[tuple[PLF, PLF, ConvType]]): The arguments of conv.
+        max_workers (Optional[int], optional): The number of worker processes. If it
+            is None, the number of CPUs is used. Defaults to None.
+        chunksize (Optional[int], optional): The number of jobs per chunk. Defaults
+            to None.
+
+    Returns:
+        Iterator[PLF]: The results in the order of the jobs.
+    """
+    return get_pool(max_workers).conv_many(jobs, chunksize=chunksize)
+
+
+def conv_many_unordered(
+    jobs: Iterable[tuple[PLF, PLF, ConvType]],
+    max_workers: Optional[int] = None,
+    chunksize: Optional[int] = None,
+) -> Iterator[tuple[int, PLF]]:
+    """Like conv_many, but returns the results as soon as they are completed.
+
+    Args:
+        jobs (Iterable[tuple[PLF, PLF, ConvType]]): The arguments of conv.
+        max_workers (Optional[int], optional): The number of worker processes. If it
+            is None, the number of CPUs is used. Defaults to None.
+        chunksize (Optional[int], optional): The number of jobs per chunk. Defaults
+            to None.
+
+    Returns:
+        Iterator[tuple[int, PLF]]: Tuples of the index of a job and its result.
+    """
+    return get_pool(max_workers).conv_many_unordered(jobs, chunksize=chunksize)
+
+
+def parallel_conv(
+    a: PLF,
+    b: PLF,
+    conv_type: ConvType,
+    max_workers: Optional[int] = None,
+    chunks: Optional[int] = None,
+) -> PLF:
+    """Computes a single convolution of large PLFs on all CPU cores.
+
+    See ConvPool.conv for details.
+
+    Args:
+        a (PLF): PLF a.
+        b (PLF): PLF b.
+        conv_type (ConvType): The type of convolution.
+        max_workers (Optional[int], optional): The number of worker processes.
+            Defaults to None.
+        chunks (Optional[int], optional): The number of chunks. Defaults to None.
+
+    Returns:
+        PLF: The result of the convolution.
+    """
+    return get_pool(max_workers).conv(a, b, conv_type, chunks=chunks)
+
+
+def parallel_min_max(
+    a: PLF,
+    b: PLF,
+    compute_min: bool,
+    max_workers: Optional[int] = None,
+    chunks: Optional[int] = None,
+) -> PLF:
+    """Computes the minimum or maximum of two large PLFs on all CPU cores.
+
+    See ConvPool.min_max for details.
+
+    Args:
+        a (PLF): First PLF.
+        b (PLF): Second PLF.
+        compute_min (bool): If True, the minimum is computed, else the maximum.
+        max_workers (Optional[int], optional): The number of worker processes.
+            Defaults to None.
+        chunks (Optional[int], optional): The number of chunks. Defaults to None.
+
+    Returns:
+        PLF: The minimum/maximum of a and b.
+    """
+    return get_pool(max_workers).min_max(a, b, compute_min, chunks=chunks)
+
+
+def parallel_add(
+    a: PLF,
+    b: PLF,
+    subtract_y: bool = False,
+    max_workers: Optional[int] = None,
+    chunks: Optional[int] = None,
+) -> PLF:
+    """Computes the sum or difference of two large PLFs on all CPU cores.
+
+    See ConvPool.add for details.
+
+    Args:
+        a (PLF): First PLF.
+        b (PLF): Second PLF.
+        subtract_y (bool, optional): Whether to subtract b instead of adding it.
+            Defaults to False.
+        max_workers (Optional[int], optional): The number of worker processes.
+            Defaults to None.
+        chunks (Optional[int], optional): The number of chunks. Defaults to None.
+
+    Returns:
+        PLF: The sum (or difference) of a and b.
+    """
+    return get_pool(max_workers).add(a, b, subtract_y, chunks=chunks)
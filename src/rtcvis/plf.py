@@ -1,12 +1,25 @@
 import ast
+import bisect
+import math
 import operator
-from typing import Sequence, Union
+from concurrent.futures import Executor
+from typing import Callable, NamedTuple, Optional, Sequence, Union
 
 from rtcvis.exceptions import RTCVisException, ValidationException
-from rtcvis.line import Line, line_intersection
 from rtcvis.point import Point
 
 
+class _Shape(NamedTuple):
+    """The classification of a PLF, see the properties of the same name in PLF."""
+
+    is_continuous: bool
+    is_convex: bool
+    is_concave: bool
+    is_nondecreasing: bool
+    is_constant: bool
+    is_staircase: bool
+
+
 class PLF:
     def __init__(self, points: Sequence[Point | tuple[float, float]]) -> None:
         """A piecewise linear function defined by a list of points.
@@ -20,11 +33,9 @@ class PLF:
                 PLF. They must be in the correct order (x may not decrease). The list
                 elements can either be Point instances or tuples of x and y coordinates.
         """
-        self._points = _points = [
-            p if isinstance(p, Point) else Point(*p) for p in points
-        ]
-        self._x = _x = [p.x for p in _points]
-        self._y = _y = [p.y for p in _points]
+        _points = [p if isinstance(p, Point) else Point(*p) for p in points]
+        _x = [p.x for p in _points]
+        _y = [p.y for p in _points]
 
         if len(_points) > 1 and not all(
             _x[i] <= _x[i + 1] for i in range(len(_points) - 1)
@@ -38,14 +49,52 @@ class PLF:
                 "There may not be more than two points with the same x coordinate."
             )
 
-        if len(_points) == 0:
+        self._init_points(_points, _x, _y)
+
+    def _init_points(self, points: list[Point], x: list[float], y: list[float]) -> None:
+        """Sets the points of this PLF without validating them."""
+        self._points = points
+        self._x = x
+        self._y = y
+        if len(points) == 0:
             self._x_start = 0.0
             self._x_end = 0.0
+        else:
+            self._x_start = x[0]
+            self._x_end = x[-1]
+        # min, max, the slopes and the shape are computed when they're first needed
+        self._min: Optional[Point] = None
+        self._max: Optional[Point] = None
+        self._hash: Optional[int] = None
+        self._slopes: Optional[list[float]] = None
+        self._shape: Optional[_Shape] = None
+
+    @classmethod
+    def _from_points(cls, points: list[Point]) -> "PLF":
+        """Creates a PLF from points that are already known to be valid.
+
+        This is used for PLFs that are created internally from other PLFs, so the
+        validation in __init__ only happens for PLFs created by the user. The list is
+        used directly and must not be modified afterwards.
+
+        Args:
+            points (list[Point]): The points, which must fulfill all requirements of
+                __init__.
+
+        Returns:
+            PLF: The new PLF.
+        """
+        plf = PLF.__new__(PLF)
+        plf._init_points(points, [p.x for p in points], [p.y for p in points])
+        return plf
+
+    def _compute_extrema(self) -> None:
+        """Computes the minimum and maximum of this PLF."""
+        _x, _y = self._x, self._y
+        if len(_y) == 0:
             self._min = Point(0, 0)
             self._max = Point(0, 0)
         else:
-            self._x_start = _x[0]
-            self._x_end = _x[-1]
             self._min = Point(_x[_y.index(min(_y))], min(_y))
             self._max = Point(_x[_y.index(max(_y))], max(_y))
 
@@ -63,28 +112,149 @@ class PLF:
 
     @property
     def min(self):
+        if self._min is None:
+            self._compute_extrema()
         return self._min
 
     @property
     def max(self):
+        if self._max is None:
+            self._compute_extrema()
         return self._max
 
     @property
     def x(self):
         return self._x
 
+    @property
+    def slopes(self) -> list[float]:
+        """The slope of the segment between each point and the next one.
+
+        The segment between two points at the same x has an infinite slope with the
+        sign of the discontinuity, or nan if both points are identical. The slopes are
+        computed when they're first needed and then stored.
+        """
+        if self._slopes is None:
+            xs, ys = self.x, self.y
+            self._slopes = [
+                (
+                    (y1 - y0) / (x1 - x0)
+                    if x1 != x0
+                    else math.copysign(math.inf, y1 - y0) if y1 != y0 else math.nan
+                )
+                for x0, x1, y0, y1 in zip(xs, xs[1:], ys, ys[1:])
+            ]
+        return self._slopes
+
+    def _get_shape(self) -> _Shape:
+        """Classifies this PLF in a single pass over its slopes and stores the result.
+
+        Returns:
+            _Shape: The classification. Empty PLFs don't fulfill any of its flags.
+        """
+        if self._shape is not None:
+            return self._shape
+        ys = self.y
+        if len(ys) == 0:
+            self._shape = _Shape(False, False, False, False, False, False)
+            return self._shape
+
+        continuous = convex = concave = staircase = True
+        last_slope = None
+        for slope in self.slopes:
+            if not math.isfinite(slope):
+                # a discontinuity or two identical points
+                continuous = continuous and math.isnan(slope)
+                continue
+            if slope != 0:
+                staircase = False
+            if last_slope is not None:
+                convex = convex and slope >= last_slope
+                concave = concave and slope <= last_slope
+            last_slope = slope
+
+        self._shape = _Shape(
+            is_continuous=continuous,
+            is_convex=continuous and convex,
+            is_concave=continuous and concave,
+            is_nondecreasing=all(ys[i] <= ys[i + 1] for i in range(len(ys) - 1)),
+            is_constant=all(y == ys[0] for y in ys),
+            is_staircase=staircase,
+        )
+        return self._shape
+
+    @property
+    def is_continuous(self) -> bool:
+        """Whether this PLF has no discontinuities. Empty PLFs never fulfill this."""
+        return self._get_shape().is_continuous
+
+    @property
+    def is_convex(self) -> bool:
+        """Whether this PLF is continuous and its slopes never decrease."""
+        return self._get_shape().is_convex
+
+    @property
+    def is_concave(self) -> bool:
+        """Whether this PLF is continuous and its slopes never increase."""
+        return self._get_shape().is_concave
+
+    @property
+    def is_constant(self) -> bool:
+        """Whether all points of this PLF have the same y coordinate.
+
+        Empty PLFs never fulfill this.
+        """
+        return self._get_shape().is_constant
+
+    @property
+    def is_nondecreasing(self) -> bool:
+        """Whether the y coordinates of this PLF never decrease, e.g. for RTC curves.
+
+        Discontinuities are allowed as long as they jump upwards. Empty PLFs never
+        fulfill this.
+        """
+        return self._get_shape().is_nondecreasing
+
+    @property
+    def is_staircase(self) -> bool:
+        """Whether this PLF is constant between its discontinuities.
+
+        Empty PLFs never fulfill this.
+        """
+        return self._get_shape().is_staircase
+
     @property
     def y(self):
         return self._y
 
+    def _min_max_closed_form(self, other: "PLF", compute_min: bool) -> Optional["PLF"]:
+        """The minimum or maximum of this PLF and other, if it has a closed form.
+
+        This is used by plf_min_max and may be overridden by subclasses that know the
+        shape of their curves. Returns None if the general algorithm must be used.
+        """
+        return None
+
     def __repr__(self) -> str:
         return f"PLF([{', '.join([repr(point) for point in self.points])}])"
 
     def __eq__(self, other) -> bool:
-        if type(other) is not PLF or len(self.points) != len(other.points):
+        if not isinstance(other, PLF) or len(self.x) != len(other.x):
             return False
 
-        return all(a == b for a, b in zip(self.points, other.points))
+        return all(a == b for a, b in zip(self.x, other.x)) and all(
+            a == b for a, b in zip(self.y, other.y)
+        )
+
+    def __hash__(self) -> int:
+        """Hashes the coordinates of all points.
+
+        The hash only depends on the points, so equal PLFs have the same hash. It is
+        computed when it's first needed and then stored, since PLFs are never modified.
+        """
+        if self._hash is None:
+            self._hash = hash((tuple(self.x), tuple(self.y)))
+        return self._hash
 
     @classmethod
     def from_rtctoolbox(
@@ -206,21 +376,20 @@ class PLF:
         if self.x_start >= x_start:
             return self
 
-        for idx, point in enumerate(self.points):
-            if point.x >= x_start:
-                # This is the first point located after x_start
-                points = []
-                if point.x > x_start:
-                    # create a new point at x_start if there isn't one already
-                    new_point = Line(self.points[idx - 1], self.points[idx]).point_at_x(
-                        x_start
-                    )
-                    assert new_point is not None
-                    points = [new_point]
-                # append all remaining points
-                points += self.points[idx:]
-                return PLF(points)
-        return PLF([])
+        # the first point located at or after x_start
+        idx = bisect.bisect_left(self.x, x_start)
+        if idx == len(self.points):
+            return PLF._from_points([])
+        points = []
+        if self.x[idx] > x_start:
+            # create a new point at x_start if there isn't one already, in the same
+            # way as Line.point_at_x
+            x0, y0 = self.x[idx - 1], self.y[idx - 1]
+            slope = (self.y[idx] - y0) / (self.x[idx] - x0)
+            points = [Point(x_start, slope * (x_start - x0) + y0)]
+        # append all remaining points
+        points += self.points[idx:]
+        return PLF._from_points(points)
 
     def end_truncated(self, x_end: float) -> "PLF":
         """Creates a new PLF that is truncated at the end.
@@ -237,21 +406,20 @@ class PLF:
         if self.x_end <= x_end:
             return self
 
-        for idx, point in reversed(list(enumerate(self.points))):
-            if point.x <= x_end:
-                # This is the first point located before x_start
-                points = []
-                if point.x < x_end:
-                    # create a new point at x_end if there isn't one already
-                    new_point = Line(self.points[idx + 1], self.points[idx]).point_at_x(
-                        x_end
-                    )
-                    assert new_point is not None
-                    points = [new_point]
-                # prepend all remaining points
-                points = list(self.points[: idx + 1]) + points
-                return PLF(points)
-        return PLF([])
+        # the last point located at or before x_end
+        idx = bisect.bisect_right(self.x, x_end) - 1
+        if idx < 0:
+            return PLF._from_points([])
+        points = []
+        if self.x[idx] < x_end:
+            # create a new point at x_end if there isn't one already, in the same way
+            # as Line.point_at_x
+            x0, y0 = self.x[idx], self.y[idx]
+            slope = (self.y[idx + 1] - y0) / (self.x[idx + 1] - x0)
+            points = [Point(x_end, slope * (x_end - x0) + y0)]
+        # prepend all remaining points
+        points = self.points[: idx + 1] + points
+        return PLF._from_points(points)
 
     def __add__(self, other: Union["PLF", Point]) -> "PLF":
         if isinstance(other, PLF):
@@ -275,7 +443,7 @@ class PLF:
         a, b = match_plf(self, other)
         op = operator.sub if subtract_y else operator.add
         new_points = [Point(p1.x, op(p1.y, p2.y)) for p1, p2 in zip(a.points, b.points)]
-        return PLF(new_points).simplified()
+        return PLF._from_points(new_points).simplified()
 
     def __sub__(self, other: Union["PLF", Point]) -> "PLF":
         if isinstance(other, PLF):
@@ -297,48 +465,128 @@ class PLF:
         Returns:
             PLF: The transformed function.
         """
-        new_points: list[Point] = []
         factor = -1 if mirror else 1
         # iterate over the points in the order in which they'll be
         # in the transformed PLF
-        points = iter(self.points) if mirror else reversed(self.points)
-        for point in points:
-            new_x = factor * point.x + offset
-            new_points.insert(0, Point(new_x, point.y))
+        points = reversed(self.points) if mirror else iter(self.points)
+        new_points = [Point(factor * point.x + offset, point.y) for point in points]
 
-        return PLF(new_points)
+        return PLF._from_points(new_points)
 
-    def get_value(self, x: float) -> float:
+    def _check_defined(self, x_min: float, x_max: float) -> None:
+        """Raises an RTCVisException if this PLF is not defined on [x_min, x_max]."""
+        if len(self.x) == 0:
+            raise RTCVisException(
+                "The PLF is undefined everywhere and thus does not have a value"
+                + " anywhere."
+            )
+        for x in (x_min, x_max):
+            if not (x >= self.x_start and x <= self.x_end):
+                raise RTCVisException(
+                    f"The PLF is only defined between {self.x_start} and"
+                    + f" {self.x_end} and thus does not have a value at {x}."
+                )
+
+    def get_value(self, x: float, right: bool = False) -> float:
         """Computes and returns the value of this PLF at the given x.
 
         Note that if there are two points defined at the same x, the value of the first
-        one will be returned.
+        one will be returned, unless right is True. The point is found with a binary
+        search, so this takes O(log n) for n points.
 
         Args:
             x (float): x coordinate
+            right (bool, optional): If True, the value of the last point at x is
+                returned instead, which is the right limit at a discontinuity, e.g.
+                for right-continuous functions like the upper pseudo-inverse.
+                Defaults to False.
 
         Returns:
             float: The result
         """
-        if len(self.points) == 0:
-            raise RTCVisException(
-                "The PLF is undefined everywhere and thus does not have a value"
-                + " anywhere."
-            )
-        if not (x >= self.x_start and x <= self.x_end):
-            raise RTCVisException(
-                f"The PLF is only defined between {self.x_start} and {self.x_end} and"
-                + f" thus does not have a value at {x}."
-            )
+        self._check_defined(x, x)
+
+        xs, ys = self.x, self.y
+        idx = bisect.bisect_left(xs, x)
+        if xs[idx] == x:
+            if right:
+                idx = bisect.bisect_right(xs, x) - 1
+            return ys[idx]
+        # same as Line(self.points[idx - 1], self.points[idx]).point_at_x(x).y
+        slope = (ys[idx] - ys[idx - 1]) / (xs[idx] - xs[idx - 1])
+        return slope * (x - xs[idx - 1]) + ys[idx - 1]
+
+    def _evaluate_many(self, xs: Sequence[float], right: bool) -> list[float]:
+        """Evaluates this PLF at many x in a single merge pass.
+
+        Args:
+            xs (Sequence[float]): The x coordinates in arbitrary order.
+            right (bool): If True, the last point at each x is used instead of the
+                first one.
+
+        Returns:
+            list[float]: The values in the same order as xs.
+        """
+        if len(xs) == 0:
+            return []
+        self._check_defined(min(xs), max(xs))
+
+        px, py = self.x, self.y
+        result = [0.0] * len(xs)
+        idx = 0
+        for i in sorted(range(len(xs)), key=xs.__getitem__):
+            x = xs[i]
+            if right:
+                # move to the first point after x
+                while idx < len(px) and px[idx] <= x:
+                    idx += 1
+                if px[idx - 1] == x:
+                    result[i] = py[idx - 1]
+                    continue
+            else:
+                # move to the first point at or after x
+                while px[idx] < x:
+                    idx += 1
+                if px[idx] == x:
+                    result[i] = py[idx]
+                    continue
+            slope = (py[idx] - py[idx - 1]) / (px[idx] - px[idx - 1])
+            result[i] = slope * (x - px[idx - 1]) + py[idx - 1]
+        return result
+
+    def evaluate_many_left(self, xs: Sequence[float]) -> list[float]:
+        """Computes the values of this PLF at many x coordinates.
+
+        This is equivalent to calling get_value for every x. Since the value at a
+        discontinuity is the one of the first point, these are also the left limits,
+        except at x_start, where there is no left limit. The x coordinates are sorted
+        and then merged with the points of this PLF in a single pure-Python loop, so
+        this takes O(k log k + n) for k x coordinates and n points.
+
+        Args:
+            xs (Sequence[float]): The x coordinates, which don't have to be sorted.
+
+        Returns:
+            list[float]: The values at the given x coordinates.
+        """
+        return self._evaluate_many(xs, right=False)
 
-        for idx, p in enumerate(self.points):
-            if p.x == x:
-                return p.y
-            elif p.x > x:
-                p_at_x = Line(self.points[idx - 1], self.points[idx]).point_at_x(x)
-                assert p_at_x is not None
-                return p_at_x.y
-        assert False, "Did not find points with corresponding x coordinates"
+    # the values are the left limits
+    evaluate_many = evaluate_many_left
+
+    def evaluate_many_right(self, xs: Sequence[float]) -> list[float]:
+        """Computes the right limits of this PLF at many x coordinates.
+
+        At discontinuities, the y coordinate of the second point is returned. At x_end,
+        where there is no right limit, the value of the last point is returned.
+
+        Args:
+            xs (Sequence[float]): The x coordinates, which don't have to be sorted.
+
+        Returns:
+            list[float]: The right limits at the given x coordinates.
+        """
+        return self._evaluate_many(xs, right=True)
 
     def __call__(self, x: float) -> float:
         """Calls self.get_value(x)."""
@@ -358,29 +606,83 @@ class PLF:
             # if we have at most 1 points, there are no redundant points
             return self
 
-        # go over self.points and remove all duplicate points
-        dedup = [self.points[0]]
-        for i in range(len(self.points) - 1):
-            if self.points[i] != self.points[i + 1]:
-                dedup.append(self.points[i + 1])
+        # go over the points and remove all duplicate points
+        xs, ys, points = self.x, self.y, self.points
+        dedup = [0]
+        for i in range(1, len(xs)):
+            if xs[i] != xs[i - 1] or ys[i] != ys[i - 1]:
+                dedup.append(i)
 
         if len(dedup) < 3:
             # if there's at most 2 points left, they cannot be redundant
-            return PLF(dedup)
-
-        # already insert the first point
-        new_points = [dedup[0]]
+            return PLF._from_points([points[i] for i in dedup])
+
+        # the slopes between the remaining points (None for vertical lines), computed
+        # in the same way as in Line
+        slopes: Sequence[Optional[float]]
+        if len(dedup) == len(xs):
+            # there are no identical points, so the stored slopes can be used
+            slopes = self.slopes
+        else:
+            slopes = [
+                (ys[j] - ys[i]) / (xs[j] - xs[i]) if xs[j] != xs[i] else None
+                for i, j in zip(dedup, dedup[1:])
+            ]
+
+        # keep the first and last point and all intermediate points that are not
+        # located on a line with their neighbors
+        new_points = [points[dedup[0]]]
+        for i in range(1, len(dedup) - 1):
+            if slopes[i - 1] != slopes[i]:
+                new_points.append(points[dedup[i]])
+        new_points.append(points[dedup[-1]])
+
+        return PLF._from_points(new_points)
+
+    def pseudo_inverse(self, lower: bool = True) -> "PLF":
+        """Computes the lower or upper pseudo-inverse of this nondecreasing PLF.
+
+        The lower pseudo-inverse is inf{x | f(x) >= y} and the upper one is
+        sup{x | f(x) <= y}. Both are obtained in a single pass by swapping the
+        coordinates of all points, so flat segments become discontinuities and
+        discontinuities become flat segments. They only differ at the y coordinates of
+        flat segments, where the lower pseudo-inverse has the value of the first point
+        and the upper pseudo-inverse the one of the last point. Both points are kept at
+        every such discontinuity, including one at the end, since the first point is
+        the end of the segment before it. The upper pseudo-inverse is right-continuous,
+        so it must be evaluated with get_value(y, right=True) (or evaluate_many_right)
+        to get the last point at a discontinuity.
 
-        # now append all the intermediate points that are not redundant
-        for i in range(len(dedup) - 2):
-            a, b, c = dedup[i], dedup[i + 1], dedup[i + 2]
-            if Line(a, b).slope != Line(b, c).slope:
-                new_points.append(b)
+        Args:
+            lower (bool, optional): Whether the lower (True) or upper (False)
+                pseudo-inverse is computed. Defaults to True.
 
-        # finally append the last point
-        new_points.append(dedup[-1])
+        Returns:
+            PLF: The pseudo-inverse, which is defined from the first to the last y
+                coordinate of this PLF.
+        """
+        if not self.is_nondecreasing:
+            if len(self.points) == 0:
+                return self
+            raise ValidationException(
+                "The pseudo-inverse is only defined for nondecreasing PLFs."
+            )
 
-        return PLF(new_points)
+        points: list[Point] = []
+        for x, y in zip(self.x, self.y):
+            if len(points) >= 2 and points[-2].x == points[-1].x == y:
+                # only keep the first and the last point of a flat segment
+                points[-1] = Point(y, x)
+            else:
+                points.append(Point(y, x))
+        if len(points) >= 2:
+            if lower and points[-2].x == points[-1].x:
+                # the value at the end is the one of the first point anyway
+                points.pop(-1)
+            elif not lower and points[0].x == points[1].x:
+                # the value at the start is the one of the last point
+                points.pop(0)
+        return PLF._from_points(points)
 
     def add_point(self, other: Point, subtract_x: bool, subtract_y: bool) -> "PLF":
         """Adds the given point to all points of self.
@@ -398,7 +700,9 @@ class PLF:
         """
         x_op = operator.sub if subtract_x else operator.add
         y_op = operator.sub if subtract_y else operator.add
-        return PLF([Point(x_op(p.x, other.x), y_op(p.y, other.y)) for p in self.points])
+        return PLF._from_points(
+            [Point(x_op(p.x, other.x), y_op(p.y, other.y)) for p in self.points]
+        )
 
 
 def match_plf(a: "PLF", b: "PLF") -> tuple["PLF", "PLF"]:
@@ -417,54 +721,55 @@ def match_plf(a: "PLF", b: "PLF") -> tuple["PLF", "PLF"]:
 
     if len(a.points) == 0 or len(b.points) == 0:
         # the functions are not overlapping -> return empty PLFs
-        return PLF([]), PLF([])
+        return PLF._from_points([]), PLF._from_points([])
 
     # iterate over the points of a and b, add their points and insert a new point for a
     # or b if it does not have a point at an x where the other PLF does have a point
-    # When inserting a new point, we need to know the previous point so that we can
-    # compute a new point on the line from the previous to the next point
-    # Note that constructing the Line objects here is fine, the two points can never be
-    # at the same x (I think)
+    # When inserting a new point, it is computed on the line from the previous to the
+    # next point in the same way as in Line.point_at_x. These two points can never be
+    # at the same x.
+    a_points, a_xs, a_ys = a.points, a.x, a.y
+    b_points, b_xs, b_ys = b.points, b.x, b.y
     new_a, new_b = [], []
     a_idx, b_idx = 0, 0
-    while a_idx < len(a.points) and b_idx < len(b.points):
-        a_x = a.points[a_idx].x
-        b_x = b.points[b_idx].x
+    while a_idx < len(a_xs) and b_idx < len(b_xs):
+        a_x = a_xs[a_idx]
+        b_x = b_xs[b_idx]
 
         if a_x == b_x:
             # The points are already at the same x coordinate
-            new_a.append(a.points[a_idx])
-            new_b.append(b.points[b_idx])
+            new_a.append(a_points[a_idx])
+            new_b.append(b_points[b_idx])
             a_idx += 1
             b_idx += 1
         elif a_x < b_x:
             # Insert a new point for b
-            new_a.append(a.points[a_idx])
-            new_b.append(
-                Line(b.points[b_idx - 1], b.points[b_idx]).point_at_x(a.points[a_idx].x)
-            )
+            x0, y0 = b_xs[b_idx - 1], b_ys[b_idx - 1]
+            slope = (b_ys[b_idx] - y0) / (b_x - x0)
+            new_a.append(a_points[a_idx])
+            new_b.append(Point(a_x, slope * (a_x - x0) + y0))
             a_idx += 1
         else:
             # Insert a new point for a
-            new_a.append(
-                Line(a.points[a_idx], a.points[a_idx - 1]).point_at_x(b.points[b_idx].x)
-            )
-            new_b.append(b.points[b_idx])
+            x0, y0 = a_xs[a_idx - 1], a_ys[a_idx - 1]
+            slope = (a_ys[a_idx] - y0) / (a_x - x0)
+            new_a.append(Point(b_x, slope * (b_x - x0) + y0))
+            new_b.append(b_points[b_idx])
             b_idx += 1
 
     # If we've reached the end of one PLF, the other one might still have another
     # point at the same x coordinate which we need to append, which also means that
     # we must duplicate the last point of the other PLF
-    if a_idx != len(a.points):
-        assert a_idx == len(a.points) - 1
-        new_a.append(a.points[a_idx])
+    if a_idx != len(a_xs):
+        assert a_idx == len(a_xs) - 1
+        new_a.append(a_points[a_idx])
         new_b.append(new_b[-1])
-    if b_idx != len(b.points):
-        assert b_idx == len(b.points) - 1
-        new_b.append(b.points[b_idx])
+    if b_idx != len(b_xs):
+        assert b_idx == len(b_xs) - 1
+        new_b.append(b_points[b_idx])
         new_a.append(new_a[-1])
 
-    return PLF(new_a), PLF(new_b)
+    return PLF._from_points(new_a), PLF._from_points(new_b)
 
 
 def plf_min_max(a: PLF, b: PLF, compute_min: bool) -> PLF:
@@ -483,6 +788,10 @@ def plf_min_max(a: PLF, b: PLF, compute_min: bool) -> PLF:
     Returns:
         PLF: The minimum/maximum of a and b.
     """
+    closed_form = a._min_max_closed_form(b, compute_min)
+    if closed_form is not None:
+        return closed_form
+
     a, b = match_plf(a, b)
 
     if len(a.points) == 0:
@@ -493,29 +802,32 @@ def plf_min_max(a: PLF, b: PLF, compute_min: bool) -> PLF:
     compare = operator.le if compute_min else operator.ge
 
     new_points = []
+    xs, a_y, b_y = a.x, a.y, b.y
+    a_slopes, b_slopes = a.slopes, b.slopes
 
-    for i in range(len(a.points) - 1):
+    for i in range(len(xs) - 1):
         # append the point with the smaller/greater y
-        if compare(a.y[i], b.y[i]):
+        if compare(a_y[i], b_y[i]):
             new_points.append(a.points[i])
         else:
             new_points.append(b.points[i])
 
         # check for an intersection in the next line segment
-        # Skip this step if a or b have two points at the same x, creating Lines and
-        # checking for intersections wouldn't make sense or even work
-        if a.points[i].x != a.points[i + 1].x and b.points[i].x != b.points[i + 1].x:
-            intersection = line_intersection(
-                Line(a.points[i], a.points[i + 1]), Line(b.points[i], b.points[i + 1])
-            )
-            if intersection and intersection.x > a.x[i] and intersection.x < a.x[i + 1]:
+        # Skip this step if a or b have two points at the same x, checking for
+        # intersections wouldn't make sense there
+        m_a, m_b = a_slopes[i], b_slopes[i]
+        if xs[i] != xs[i + 1] and m_a != m_b:
+            # the same as line_intersection for both segments, since they start at
+            # the same x
+            x = (b_y[i] - a_y[i] + m_a * xs[i] - m_b * xs[i]) / (m_a - m_b)
+            if x > xs[i] and x < xs[i + 1]:
                 # there's an intersection and it's not at the start/end of the segment
-                new_points.append(intersection)
+                new_points.append(Point(x, m_a * (x - xs[i]) + a_y[i]))
 
     # also add the last point
     new_points.append(a.points[-1] if compare(a.y[-1], b.y[-1]) else b.points[-1])
 
-    result = PLF(new_points)
+    result = PLF._from_points(new_points)
 
     # The PLF might still have redundant points, remove them
     return result.simplified()
@@ -578,16 +890,249 @@ def plf_merge(a: PLF, b: PLF) -> PLF:
         middle_points.pop(-1)
 
     # now just concatenate all point lists
-    return PLF(start_points + middle_points + end_points)
+    return PLF._from_points(start_points + middle_points + end_points)
 
 
 def plf_list_min_max(plfs: Sequence[PLF], compute_min: bool) -> PLF:
+    """Computes the minimum or maximum of a list of PLFs by folding it.
+
+    The PLFs are combined one at a time using plf_min_max and plf_merge, so this is
+    slow for many PLFs. It is kept as a simple reference implementation, use
+    rtcvis.envelope.plf_envelope for an efficient sweep-line algorithm.
+
+    Args:
+        plfs (Sequence[PLF]): The PLFs. There must be at least one.
+        compute_min (bool): If True, the minimum is computed, else the maximum.
+
+    Returns:
+        PLF: The minimum/maximum of all PLFs.
+    """
     result = plfs[0]
     for plf in plfs[1:]:
-        new_min_max = plf_min_max(a=result, b=plf, compute_min=compute_min)
-        merged = plf_merge(
-            plf_merge(new_min_max, result),
-            plf,
-        )
-        result = merged
+        result = plf_min_max_merged(a=result, b=plf, compute_min=compute_min)
     return result
+
+
+def plf_min_max_merged(a: PLF, b: PLF, compute_min: bool) -> PLF:
+    """Computes the minimum or maximum of two PLFs on the union of their domains.
+
+    Unlike plf_min_max, the result is also defined where only one of the PLFs is
+    defined and has its value there. a and b must be overlapping or at least
+    touching.
+
+    Args:
+        a (PLF): First PLF.
+        b (PLF): Second PLF.
+        compute_min (bool): If True, the minimum is computed, else the maximum.
+
+    Returns:
+        PLF: The minimum/maximum of a and b.
+    """
+    return plf_merge(plf_merge(plf_min_max(a=a, b=b, compute_min=compute_min), a), b)
+
+
+def plf_tree_reduce(
+    plfs: Sequence[PLF],
+    op: Callable[[PLF, PLF], PLF],
+    executor: Optional[Executor] = None,
+) -> PLF:
+    """Combines a list of PLFs with a binary operator in a balanced tree.
+
+    In each level, neighbouring PLFs are combined in pairs, so there are only
+    O(log k) levels for k PLFs and the intermediate results stay small. The operator
+    must be associative, e.g. functools.partial(plf_min_max_merged, compute_min=True)
+    or PLF.__add__. The order of the PLFs is kept, so it doesn't have to be
+    commutative.
+
+    Args:
+        plfs (Sequence[PLF]): The PLFs. There must be at least one.
+        op (Callable[[PLF, PLF], PLF]): The binary operator.
+        executor (Optional[Executor], optional): If given, the pairs of each level are
+            combined in this thread or process pool. For process pools, op must be
+            picklable. Defaults to None.
+
+    Returns:
+        PLF: The result of combining all PLFs.
+    """
+    if len(plfs) == 0:
+        raise RTCVisException("At least one PLF is required.")
+    level = list(plfs)
+    while len(level) > 1:
+        lefts, rights = level[0:-1:2], level[1::2]
+        combined = (
+            list(executor.map(op, lefts, rights))
+            if executor is not None
+            else [op(left, right) for left, right in zip(lefts, rights)]
+        )
+        if len(level) % 2:
+            # the last PLF has no partner and moves up to the next level
+            combined.append(level[-1])
+        level = combined
+    return level[0]
+
+
+def _on_line(p0: Point, p1: Point, p2: Point) -> bool:
+    """Whether p1 is located on the line from p0 to p2.
+
+    Unlike in PLF.simplified, the slopes are compared with a tolerance, because the
+    borders of joined PLFs are often interpolated points.
+    """
+    if p0.x == p1.x or p1.x == p2.x:
+        return p0.x == p2.x
+    slope0 = (p1.y - p0.y) / (p1.x - p0.x)
+    slope1 = (p2.y - p1.y) / (p2.x - p1.x)
+    return math.isclose(slope0, slope1, rel_tol=1e-9, abs_tol=1e-12)
+
+
+def _join_border(left: list[Point], right: Sequence[Point]) -> Sequence[Point]:
+    """Prepares appending the points of right to the points of left.
+
+    right must start at the x where left ends. The last point of left at this border
+    is removed if left ends with a discontinuity, since the right value is taken from
+    right. If both values at the border are equal up to rounding errors, e.g. because
+    they were interpolated differently, only the point of left is kept, and it is
+    removed as well if it is located on the line between its neighbors.
+
+    Args:
+        left (list[Point]): The points of the left PLF, which are modified in place.
+        right (Sequence[Point]): The points of the right PLF.
+
+    Returns:
+        Sequence[Point]: The points of right that must be appended to left.
+    """
+    border = left[-1].x
+    # keep only the first point of the left PLF at the border
+    if len(left) >= 2 and left[-2].x == border:
+        left.pop(-1)
+    # and only the last point of the right PLF at the border
+    idx = 1 if len(right) >= 2 and right[1].x == border else 0
+    if math.isclose(right[idx].y, left[-1].y, rel_tol=1e-9, abs_tol=1e-12):
+        idx += 1
+        if (
+            len(left) >= 2
+            and idx < len(right)
+            and _on_line(left[-2], left[-1], right[idx])
+        ):
+            left.pop(-1)
+    return right[idx:]
+
+
+def plf_join(plfs: Sequence[PLF]) -> PLF:
+    """Joins PLFs which are defined on subsequent intervals into a single PLF.
+
+    Each PLF must start where the previous one ends. At these borders, the left value
+    is taken from the left PLF and the right value from the right PLF, so a
+    discontinuity remains if they differ. Values that only differ by rounding errors
+    are joined into a single point. Empty PLFs are ignored.
+
+    Args:
+        plfs (Sequence[PLF]): The PLFs, sorted by x.
+
+    Returns:
+        PLF: The joined PLF.
+    """
+    points: list[Point] = []
+    for plf in plfs:
+        if len(plf.points) == 0:
+            continue
+        if not points:
+            points = list(plf.points)
+            continue
+        if plf.x_start != points[-1].x:
+            raise RTCVisException("Each PLF must start where the previous one ends.")
+        points += _join_border(points, plf.points)
+
+    return PLF._from_points(points).simplified()
+
+
+def plf_compose(f: PLF, g: PLF) -> PLF:
+    """Computes the composition f(g(x)).
+
+    The result consists of the points of g and of the points at which g crosses the x
+    coordinates of the points of f. They are found in a single pass over the points
+    of g, during which an index into the points of f follows g up and down, so this
+    takes O(n + m + k) for k crossings. At discontinuities of the result, its left and
+    right limits are exact: if g jumps, the result jumps as well, and where g crosses
+    a discontinuity of f, the result jumps between the limits of f on both sides.
+
+    Args:
+        f (PLF): The outer function. It must be defined for all values of g.
+        g (PLF): The inner function, which defines the domain of the result.
+
+    Returns:
+        PLF: The composition.
+    """
+    if len(f.points) == 0 or len(g.points) == 0:
+        return PLF._from_points([])
+    if min(g.y) < f.x_start or max(g.y) > f.x_end:
+        raise RTCVisException(
+            f"The values of g must be between {f.x_start} and {f.x_end}, where f is"
+            + " defined."
+        )
+
+    # the distinct x coordinates of f with the values of their first and last point
+    fx: list[float] = []
+    first: list[float] = []
+    last: list[float] = []
+    for x, y in zip(f.x, f.y):
+        if fx and fx[-1] == x:
+            last[-1] = y
+        else:
+            fx.append(x)
+            first.append(y)
+            last.append(y)
+
+    # fx[idx] <= u < fx[idx + 1] for the current value u of g
+    idx = 0
+
+    def limits(u: float) -> tuple[float, float]:
+        """Moves idx to u and returns the left and right limit of f at u."""
+        nonlocal idx
+        while idx + 1 < len(fx) and fx[idx + 1] <= u:
+            idx += 1
+        while fx[idx] > u:
+            idx -= 1
+        if fx[idx] == u:
+            return first[idx], last[idx]
+        y = last[idx] + (first[idx + 1] - last[idx]) * (u - fx[idx]) / (
+            fx[idx + 1] - fx[idx]
+        )
+        return y, y
+
+    gx, gy = g.x, g.y
+    points = [Point(gx[0], limits(gy[0])[0])]
+    for i in range(len(gx) - 1):
+        x0, u0, x1, u1 = gx[i], gy[i], gx[i + 1], gy[i + 1]
+        if x0 == x1:
+            # the discontinuities of g are created by the segments around them
+            continue
+        left, right = limits(u0)
+        # the limit of f from the side in which g moves
+        points.append(Point(x0, right if u1 > u0 else left))
+        if u1 > u0:
+            while idx + 1 < len(fx) and fx[idx + 1] < u1:
+                idx += 1
+                x = x0 + (fx[idx] - u0) / (u1 - u0) * (x1 - x0)
+                points += [Point(x, first[idx]), Point(x, last[idx])]
+        elif u1 < u0:
+            if fx[idx] == u0:
+                idx -= 1
+            while idx >= 0 and fx[idx] > u1:
+                x = x0 + (fx[idx] - u0) / (u1 - u0) * (x1 - x0)
+                points += [Point(x, last[idx]), Point(x, first[idx])]
+                idx -= 1
+            idx = max(idx, 0)
+        left, right = limits(u1)
+        points.append(Point(x1, left if u1 >= u0 else right))
+    points.append(Point(gx[-1], limits(gy[-1])[0]))
+
+    # remove duplicates and keep at most two points (the limits) at each x
+    result: list[Point] = []
+    for point in points:
+        if result and result[-1] == point:
+            continue
+        if len(result) >= 2 and result[-2].x == result[-1].x == point.x:
+            result[-1] = point
+        else:
+            result.append(point)
+    return PLF._from_points(result).simplified()
@@ -7,7 +7,7 @@ from matplotlib.backend_bases import MouseEvent
 from matplotlib.figure import Figure
 from matplotlib.widgets import Button, CheckButtons, Slider, TextBox, Widget
 
-from rtcvis.conv import DELTA, LAMBDA, ConvProperties, ConvType, conv_at_x
+from rtcvis.conv import DELTA, LAMBDA, ConvSweep, ConvType, conv_properties
 from rtcvis.plf import PLF
 
 
@@ -149,7 +149,7 @@ def draw_conv(
         tuple[Widget, ...]: References to the widgets created by this function. Store
             them in a local variable so they're not garbage collected!
     """
-    conv_properties = ConvProperties(a=a, b=b, conv_type=conv_type)
+    properties = conv_properties(a=a, b=b, conv_type=conv_type)
 
     color_a = mcolors.TABLEAU_COLORS["tab:cyan"]
     color_trans_a = mcolors.TABLEAU_COLORS["tab:olive"]
@@ -161,15 +161,16 @@ def draw_conv(
     ax_plot.set_aspect("equal", adjustable="box")
 
     # compute initial convolution result
-    initial_x = min(conv_properties.slider_max, max(conv_properties.slider_min, x[0]))
-    conv_result = conv_at_x(a, b, initial_x, conv_type)
+    initial_x = min(properties.slider_max, max(properties.slider_min, x[0]))
+    sweep = ConvSweep(a, b, conv_type, provenance=properties.provenance)
+    conv_result = sweep.update(initial_x)
 
     # Create bottom slider
     deltax_slider = Slider(
         ax=ax_slider,
         label=f"${DELTA}$",
-        valmin=conv_properties.slider_min,
-        valmax=conv_properties.slider_max,
+        valmin=properties.slider_min,
+        valmax=properties.slider_max,
         valinit=initial_x,
         valfmt="%.2f",
     )
@@ -210,7 +211,7 @@ def draw_conv(
     graph_sum_marker.set_visible(visibilities[3])
 
     # plot full result of convolution
-    conv_plf = conv_properties.result
+    conv_plf = properties.result
     (graph_result,) = ax_plot.plot(
         conv_plf.x,
         conv_plf.y,
@@ -233,7 +234,7 @@ def draw_conv(
         x[0] = val
 
         # Recompute convolution
-        conv_result = conv_at_x(a, b, val, conv_type)
+        conv_result = sweep.update(val)
 
         # Update transformed a
         graph_trans_a.set_xdata(conv_result.transformed_a.x)
@@ -313,8 +314,8 @@ def draw_conv(
     check.on_clicked(check_callback)
 
     # set limits, title and xlabel
-    ax_plot.set_xlim(conv_properties.min_x, conv_properties.max_x)
-    ax_plot.set_ylim(conv_properties.min_y, conv_properties.max_y)
+    ax_plot.set_xlim(properties.min_x, properties.max_x)
+    ax_plot.set_ylim(properties.min_y, properties.max_y)
     ax_plot.set_title(
         f"{conv_type}: ${conv_type.operator_desc[1:-1]} = {conv_type.full_desc[1:-1]}$"
     )
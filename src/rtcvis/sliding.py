@@ -0,0 +1,191 @@
+import bisect
+import heapq
+from collections import deque
+from typing import Optional, Sequence
+
+from rtcvis.exceptions import ValidationException
+from rtcvis.plf import PLF
+from rtcvis.point import Point
+
+
+class _MonotoneWindow:
+    def __init__(self, values: Sequence[float], compute_min: bool) -> None:
+        """Minimum or maximum of values[lo:hi] for bounds that never decrease.
+
+        The deque contains the indices of all values in the window that may still
+        become the extremum, so their values are monotone and the extremum is always
+        at the front. Each index is added and removed at most once.
+
+        Args:
+            values (Sequence[float]): The values.
+            compute_min (bool): Whether the minimum (True) or maximum (False) is
+                computed.
+        """
+        self._values = values
+        self._compute_min = compute_min
+        self._deque: deque[int] = deque()
+        self._hi = 0
+
+    def move(self, lo: int, hi: int) -> Optional[float]:
+        """Moves the window to values[lo:hi] and returns its extremum.
+
+        Returns None if the window is empty.
+        """
+        values, window = self._values, self._deque
+        while self._hi < hi:
+            value = values[self._hi]
+            while window and (
+                values[window[-1]] >= value
+                if self._compute_min
+                else values[window[-1]] <= value
+            ):
+                window.pop()
+            window.append(self._hi)
+            self._hi += 1
+        while window and window[0] < lo:
+            window.popleft()
+        return values[window[0]] if window else None
+
+
+def _envelope_points(
+    t0: float,
+    t1: float,
+    lines: list[tuple[float, float]],
+    compute_min: bool,
+) -> list[Point]:
+    """The envelope of a few lines on [t0, t1], given by their values at t0 and t1."""
+    ext = min if compute_min else max
+    # the crossings of all pairs of lines inside the interval
+    fractions = [0.0, 1.0]
+    for i, (p0, p1) in enumerate(lines):
+        for q0, q1 in lines[i + 1 :]:
+            d0, d1 = p0 - q0, p1 - q1
+            if d0 * d1 < 0:
+                fractions.append(d0 / (d0 - d1))
+    fractions.sort()
+    points = [Point(t0, ext(y0 for y0, _ in lines))]
+    for s in fractions[1:-1]:
+        points.append(
+            Point(t0 + s * (t1 - t0), ext(y0 + s * (y1 - y0) for y0, y1 in lines))
+        )
+    points.append(Point(t1, ext(y1 for _, y1 in lines)))
+    return points
+
+
+def sliding_window_extremum(plf: PLF, width: float, compute_min: bool) -> PLF:
+    """Computes the minimum or maximum of a PLF over a sliding window.
+
+    The value of the result at t is the minimum (or maximum) of plf on [t - width, t]
+    as far as plf is defined there, so the result is defined from plf.x_start to
+    plf.x_end + width. This is the same as the min-plus (max-plus) convolution of plf
+    with a PLF which is 0 on [0, width].
+
+    The result only changes its shape when one of the ends of the window passes a
+    breakpoint of plf. Between these events, it's the envelope of the two lines on
+    which the ends of the window move and of the extremum of all breakpoints inside
+    the window. The latter is maintained with a monotone deque, so this takes O(n).
+
+    Args:
+        plf (PLF): The PLF.
+        width (float): The width of the window, which must not be negative.
+        compute_min (bool): Whether the minimum (True) or maximum (False) is
+            computed.
+
+    Returns:
+        PLF: The result.
+    """
+    if width < 0:
+        raise ValidationException("The width of the window must not be negative.")
+    if len(plf.points) == 0 or width == 0:
+        return plf
+    ext = min if compute_min else max
+
+    # the distinct x coordinates and the extremum of the values at each of them
+    bx: list[float] = []
+    bv: list[float] = []
+    for x, y in zip(plf.x, plf.y):
+        if bx and bx[-1] == x:
+            bv[-1] = ext(bv[-1], y)
+        else:
+            bx.append(x)
+            bv.append(y)
+    x_start, x_end = bx[0], bx[-1]
+
+    # The events are the t at which the right or left end of the window is at a
+    # breakpoint. Each one is stored with the left end of the window, which is exact
+    # if it is at a breakpoint. These are sorted first if two events coincide.
+    ts: list[float] = []
+    us: list[float] = []
+    for t, _, u in heapq.merge(
+        ((x + width, 0, x) for x in bx), ((x, 1, x - width) for x in bx)
+    ):
+        if not ts or t != ts[-1]:
+            ts.append(t)
+            us.append(u)
+    n = len(ts)
+
+    # the values at the right end of the window while it is inside the PLF
+    n_right = bisect.bisect_right(ts, x_end)
+    right_left = plf.evaluate_many_left(ts[:n_right])
+    right_right = plf.evaluate_many_right(ts[:n_right])
+    # and at the left end of the window, once it is inside the PLF
+    left_start = bisect.bisect_left(us, x_start)
+    left_left = plf.evaluate_many_left(us[left_start:])
+    left_right = plf.evaluate_many_right(us[left_start:])
+
+    window = _MonotoneWindow(bv, compute_min)
+    # bounds of the breakpoints inside the window, they only move right
+    lo = hi = 0
+    points: list[Point] = []
+    end: Optional[float] = None
+    for k in range(n):
+        t, u = ts[k], us[k]
+        # the value at the event, where only breakpoints inside (u, t) are inner ones
+        while lo < len(bx) and bx[lo] <= u:
+            lo += 1
+        while hi < len(bx) and bx[hi] < t:
+            hi += 1
+        candidates = []
+        inner = window.move(lo, hi)
+        if inner is not None:
+            candidates.append(inner)
+        if k < n_right:
+            candidates.append(right_left[k])
+        if k == 0:
+            # like in conv, a discontinuity at the start belongs to the result
+            candidates.append(right_right[0])
+        if k >= left_start:
+            candidates += [left_left[k - left_start], left_right[k - left_start]]
+        value = ext(candidates)
+        points.append(Point(t, value if end is None else end))
+        if k == n - 1:
+            break
+
+        # the envelope until the next event
+        lines: list[tuple[float, float]] = []
+        if k + 1 < n_right:
+            lines.append((right_right[k], right_left[k + 1]))
+        if k >= left_start:
+            lines.append((left_right[k - left_start], left_left[k + 1 - left_start]))
+        # the breakpoints inside the window are those in [u_next, t]
+        while lo < len(bx) and bx[lo] < us[k + 1]:
+            lo += 1
+        while hi < len(bx) and bx[hi] <= t:
+            hi += 1
+        inner = window.move(lo, hi)
+        if inner is not None:
+            lines.append((inner, inner))
+        segment = _envelope_points(t, ts[k + 1], lines, compute_min)
+        points += segment[:-1]
+        end = segment[-1].y
+
+    # remove duplicates and keep at most two points (the limits) at each x
+    result: list[Point] = []
+    for point in points:
+        if result and result[-1] == point:
+            continue
+        if len(result) >= 2 and result[-2].x == result[-1].x == point.x:
+            result[-1] = point
+        else:
+            result.append(point)
+    return PLF._from_points(result).simplified()
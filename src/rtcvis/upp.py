@@ -0,0 +1,341 @@
+import bisect
+import math
+from fractions import Fraction
+
+from rtcvis.conv import ConvType, conv
+from rtcvis.exceptions import RTCVisException, ValidationException
+from rtcvis.plf import PLF, plf_join, plf_min_max
+from rtcvis.point import Point
+
+
+class UltimatelyPeriodicPLF:
+    def __init__(self, transient: PLF, pattern: PLF, increment: float) -> None:
+        """A PLF which is defined up to infinity and is periodic after its transient.
+
+        The curve has the values of the transient until the transient's end. From
+        there on, the pattern is repeated forever, where each repetition is shifted by
+        the length of the pattern (the period) and the increment. So for all x after
+        the start of the pattern, f(x + period) = f(x) + increment.
+
+        At the start of the pattern, the left value is taken from the transient and
+        the right value from the pattern, like in plf_join. A discontinuity at the end
+        of the pattern is ignored, since the right value there is defined by the next
+        repetition.
+
+        Args:
+            transient (PLF): The transient part. It may be empty, otherwise it must
+                end where the pattern starts.
+            pattern (PLF): The periodic part. It must be longer than 0.
+            increment (float): The change of the y coordinates per period.
+        """
+        if len(pattern.points) < 2 or pattern.x_end <= pattern.x_start:
+            raise ValidationException("The pattern must have a length greater than 0.")
+        if len(transient.points) and transient.x_end != pattern.x_start:
+            raise ValidationException(
+                "The transient must end where the pattern starts."
+            )
+
+        transient_points = list(transient.points)
+        pattern_points = list(pattern.points)
+        if pattern_points[0].x == pattern_points[1].x:
+            # the left value at the start of the pattern belongs to the transient
+            first = pattern_points.pop(0)
+            if not transient_points:
+                transient_points = [first]
+        if pattern_points[-2].x == pattern_points[-1].x:
+            pattern_points.pop(-1)
+
+        self._transient = PLF._from_points(transient_points)
+        self._pattern = PLF._from_points(pattern_points)
+        self._increment = increment
+        self._period = pattern.x_end - pattern.x_start
+
+    @classmethod
+    def from_finite(
+        cls, plf: PLF, periodic_start: float, period: float, increment: float
+    ) -> "UltimatelyPeriodicPLF":
+        """Creates a curve from a finite PLF which contains at least one period.
+
+        Args:
+            plf (PLF): The PLF. It must be defined from at most periodic_start until at
+                least periodic_start + period.
+            periodic_start (float): The x at which the periodic part starts.
+            period (float): The length of the periodic part.
+            increment (float): The change of the y coordinates per period.
+
+        Returns:
+            UltimatelyPeriodicPLF: The curve.
+        """
+        end = periodic_start + period
+        if len(plf.points) == 0 or plf.x_start > periodic_start or plf.x_end < end:
+            raise RTCVisException(
+                f"The PLF must be defined between {periodic_start} and {end}."
+            )
+        transient = plf.end_truncated(periodic_start)
+        if transient.x_start == periodic_start:
+            transient = PLF._from_points([])
+        pattern = plf.start_truncated(periodic_start).end_truncated(end)
+        return cls(transient.simplified(), pattern.simplified(), increment)
+
+    @property
+    def transient(self) -> PLF:
+        return self._transient
+
+    @property
+    def pattern(self) -> PLF:
+        return self._pattern
+
+    @property
+    def increment(self) -> float:
+        return self._increment
+
+    @property
+    def period(self) -> float:
+        return self._period
+
+    @property
+    def periodic_start(self) -> float:
+        """The x at which the periodic part starts."""
+        return self._pattern.x_start
+
+    @property
+    def x_start(self) -> float:
+        """The x at which the curve starts."""
+        if len(self._transient.points):
+            return self._transient.x_start
+        return self._pattern.x_start
+
+    @property
+    def rate(self) -> float:
+        """The long-term slope of the curve, i.e. the increment per unit of x."""
+        return self._increment / self._period
+
+    def __repr__(self) -> str:
+        return (
+            f"UltimatelyPeriodicPLF({self._transient!r}, {self._pattern!r},"
+            + f" {self._increment!r})"
+        )
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, UltimatelyPeriodicPLF)
+            and self._transient == other._transient
+            and self._pattern == other._pattern
+            and self._increment == other._increment
+        )
+
+    def __hash__(self) -> int:
+        return hash((self._transient, self._pattern, self._increment))
+
+    def get_value(self, x: float) -> float:
+        """Computes the value of this curve at the given x.
+
+        Args:
+            x (float): x coordinate
+
+        Returns:
+            float: The result
+        """
+        start = self.periodic_start
+        if x <= start and len(self._transient.points):
+            return self._transient.get_value(x)
+        if x < start:
+            raise RTCVisException(
+                f"The curve is only defined from {start} on and thus does not have a"
+                + f" value at {x}."
+            )
+        k = math.floor((x - start) / self._period)
+        offset = x - k * self._period
+        if k > 0 and offset <= start:
+            # the left value at the start of a period belongs to the previous one
+            k -= 1
+            offset = self._pattern.x_end
+        offset = min(max(offset, start), self._pattern.x_end)
+        # Move the offset to a breakpoint of the pattern if it only missed it because
+        # of rounding errors, so that discontinuities are evaluated correctly.
+        xs = self._pattern.x
+        idx = bisect.bisect_left(xs, offset)
+        for i in (idx - 1, idx):
+            if 0 <= i < len(xs) and abs(xs[i] - offset) <= 1e-9 * max(1.0, abs(x)):
+                offset = xs[i]
+                break
+        return self._pattern.get_value(offset) + k * self._increment
+
+    def __call__(self, x: float) -> float:
+        """Calls self.get_value(x)."""
+        return self.get_value(x)
+
+    def to_finite(self, horizon: float) -> PLF:
+        """Unrolls this curve into a finite PLF which ends at horizon.
+
+        This can be used to display the curve with plot_plfs or plot_conv.
+
+        Args:
+            horizon (float): The end of the PLF.
+
+        Returns:
+            PLF: The PLF, which has the same values as this curve until horizon.
+        """
+        start, period = self.periodic_start, self._period
+        if horizon <= start:
+            return self._transient.end_truncated(horizon)
+        pieces = [self._transient]
+        k = 0
+        while k == 0 or pieces[-1].x_end < horizon:
+            dx, dy = k * period, k * self._increment
+            points = [
+                Point(x + dx, y + dy) for x, y in zip(self._pattern.x, self._pattern.y)
+            ]
+            if k > 0:
+                # start exactly where the previous period ended despite rounding
+                points[0] = Point(pieces[-1].x_end, points[0].y)
+            pieces.append(PLF._from_points(points))
+            k += 1
+        return plf_join(pieces).end_truncated(horizon)
+
+    def negated(self) -> "UltimatelyPeriodicPLF":
+        """Returns the curve with all y coordinates negated."""
+        return UltimatelyPeriodicPLF(
+            _negated(self._transient), _negated(self._pattern), -self._increment
+        )
+
+    def _deviation(self) -> tuple[float, float]:
+        """The minimum and maximum of f(x) - rate * x over the whole curve."""
+        rate = self.rate
+        values = [
+            y - rate * x
+            for plf in (self._transient, self._pattern)
+            for x, y in zip(plf.x, plf.y)
+        ]
+        return min(values), max(values)
+
+    def __add__(self, other: "UltimatelyPeriodicPLF") -> "UltimatelyPeriodicPLF":
+        start = max(self.periodic_start, other.periodic_start)
+        period = _lcm(self._period, other._period)
+        end = start + period
+        increment = _increment_for(self, period) + _increment_for(other, period)
+        return UltimatelyPeriodicPLF.from_finite(
+            self.to_finite(end) + other.to_finite(end), start, period, increment
+        )
+
+
+def _negated(plf: PLF) -> PLF:
+    return PLF._from_points([Point(x, -y) for x, y in zip(plf.x, plf.y)])
+
+
+def _lcm(a: float, b: float) -> float:
+    """The least common multiple of two periods.
+
+    The periods are approximated by fractions with denominators of at most 10^6.
+    """
+    if a == b:
+        return a
+    fa, fb = Fraction(a).limit_denominator(10**6), Fraction(b).limit_denominator(10**6)
+    numerator = math.lcm(fa.numerator * fb.denominator, fb.numerator * fa.denominator)
+    return float(Fraction(numerator, fa.denominator * fb.denominator))
+
+
+def _align(curve: UltimatelyPeriodicPLF, x: float) -> float:
+    """Rounds x up to the start of a period of the curve.
+
+    This avoids rounding errors by using the breakpoints of the curve's pattern.
+    """
+    k = max(0, math.ceil((x - curve.periodic_start) / curve.period))
+    return curve.periodic_start + k * curve.period
+
+
+def _increment_for(curve: UltimatelyPeriodicPLF, period: float) -> float:
+    """The increment of the curve over a multiple of its period."""
+    return curve.increment * round(period / curve.period)
+
+
+def upp_min_max(
+    a: UltimatelyPeriodicPLF, b: UltimatelyPeriodicPLF, compute_min: bool
+) -> UltimatelyPeriodicPLF:
+    """Computes the minimum or maximum of two ultimately periodic curves.
+
+    If both curves have the same rate, the result is periodic with the least common
+    multiple of their periods once both are periodic. Otherwise, the curve with the
+    smaller (for the minimum) rate is below the other one after some x, which is
+    found from the deviations of both curves from their rates. In both cases, only
+    the part up to the end of the first period of the result is computed.
+
+    Args:
+        a (UltimatelyPeriodicPLF): First curve.
+        b (UltimatelyPeriodicPLF): Second curve.
+        compute_min (bool): If True, the minimum is computed, else the maximum.
+
+    Returns:
+        UltimatelyPeriodicPLF: The minimum/maximum of a and b.
+    """
+    if not compute_min:
+        return upp_min_max(a.negated(), b.negated(), compute_min=True).negated()
+
+    start = max(a.periodic_start, b.periodic_start)
+    if a.rate == b.rate:
+        period = _lcm(a.period, b.period)
+        increment = _increment_for(a, period)
+    else:
+        low, high = (a, b) if a.rate < b.rate else (b, a)
+        low_max = low._deviation()[1]
+        high_min = high._deviation()[0]
+        # from here on, low.rate * x + low_max <= high.rate * x + high_min
+        start = _align(low, max(start, (low_max - high_min) / (high.rate - low.rate)))
+        period, increment = low.period, low.increment
+
+    end = start + period
+    result = plf_min_max(a.to_finite(end), b.to_finite(end), compute_min=True)
+    return UltimatelyPeriodicPLF.from_finite(result, start, period, increment)
+
+
+def upp_conv(
+    a: UltimatelyPeriodicPLF, b: UltimatelyPeriodicPLF, conv_type: ConvType
+) -> UltimatelyPeriodicPLF:
+    """Computes the min-plus or max-plus convolution of two ultimately periodic curves.
+
+    The result is ultimately periodic as well. If both curves have the same rate, its
+    period is the least common multiple of their periods and it is periodic after
+    the sum of their periodic starts plus that period. Otherwise, the curve with the
+    smaller (for min-plus) rate determines the period. The optimal split of delta
+    then never uses more than a bounded part of the faster curve, which yields the
+    start of the periodic part. The convolution is then only computed on finite
+    curves up to the end of the first period of the result.
+
+    Args:
+        a (UltimatelyPeriodicPLF): The first curve.
+        b (UltimatelyPeriodicPLF): The second curve.
+        conv_type (ConvType): MIN_PLUS_CONV or MAX_PLUS_CONV.
+
+    Returns:
+        UltimatelyPeriodicPLF: The result of the convolution.
+    """
+    if conv_type == ConvType.MAX_PLUS_CONV:
+        return upp_conv(a.negated(), b.negated(), ConvType.MIN_PLUS_CONV).negated()
+    if conv_type != ConvType.MIN_PLUS_CONV:
+        raise RTCVisException(
+            "Only convolutions of ultimately periodic curves are supported."
+        )
+
+    if a.rate == b.rate:
+        period = _lcm(a.period, b.period)
+        increment = _increment_for(a, period)
+        start = a.periodic_start + b.periodic_start + period
+    else:
+        slow, fast = (a, b) if a.rate < b.rate else (b, a)
+        slow_min, slow_max = slow._deviation()
+        fast_min = fast._deviation()[0]
+        # The split of delta into slow(delta - s) + fast(s) with s at the start of
+        # fast is always better than any s greater than this bound.
+        s0 = fast.x_start
+        bound = (
+            slow_max - slow_min + fast.get_value(s0) - fast_min - slow.rate * s0
+        ) / (fast.rate - slow.rate)
+        start = _align(slow, max(bound, s0) + slow.periodic_start)
+        period, increment = slow.period, slow.increment
+
+    end = start + period
+    # the values up to end only depend on the curves up to these horizons
+    result = conv(
+        a.to_finite(end - b.x_start), b.to_finite(end - a.x_start), conv_type
+    ).end_truncated(end)
+    return UltimatelyPeriodicPLF.from_finite(result, start, period, increment)
@@ -0,0 +1,20 @@
+import pytest
+
+from rtcvis import PLF
+
+
+def assert_plf_approx(result: PLF, expected: PLF) -> None:
+    """Asserts that two PLFs have the same domain and the same values up to rounding.
+
+    The values and the right limits are compared at the breakpoints of both PLFs and
+    halfway between them, so the points of the PLFs may differ.
+    """
+    assert result.x_start == expected.x_start and result.x_end == expected.x_end
+    xs = sorted(set(result.x) | set(expected.x))
+    xs += [(x0 + x1) / 2 for x0, x1 in zip(xs, xs[1:])]
+    assert result.evaluate_many_left(xs) == pytest.approx(
+        expected.evaluate_many_left(xs)
+    )
+    assert result.evaluate_many_right(xs) == pytest.approx(
+        expected.evaluate_many_right(xs)
+    )
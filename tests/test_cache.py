@@ -0,0 +1,85 @@
+import pytest
+
+from rtcvis import PLF, ConvType, RateLatency, conv, conv_properties
+from rtcvis.cache import CacheInfo, LRUCache, memoized
+
+
+def test_lru_cache():
+    cache = LRUCache(maxsize=2)
+    assert cache.get_or_compute("a", lambda: 1) == 1
+    assert cache.get_or_compute("b", lambda: 2) == 2
+    assert cache.get_or_compute("a", lambda: 3) == 1
+    # b is the least recently used entry
+    assert cache.get_or_compute("c", lambda: 4) == 4
+    assert cache.get_or_compute("b", lambda: 5) == 5
+    assert cache.info() == CacheInfo(hits=1, misses=4, maxsize=2, currsize=2)
+
+    cache.maxsize = 1
+    assert cache.info().currsize == 1
+    cache.clear()
+    assert cache.info() == CacheInfo(hits=0, misses=0, maxsize=1, currsize=0)
+
+
+def test_lru_cache_disabled():
+    cache = LRUCache(maxsize=0)
+    assert cache.get_or_compute("a", lambda: 1) == 1
+    assert cache.get_or_compute("a", lambda: 2) == 2
+    assert cache.info() == CacheInfo(hits=0, misses=2, maxsize=0, currsize=0)
+
+
+def test_memoized():
+    calls = []
+
+    @memoized(maxsize=4)
+    def add(x: int, y: int = 1) -> int:
+        """Adds two numbers."""
+        calls.append((x, y))
+        return x + y
+
+    assert add(1) == 2
+    assert add(1, 1) == 2
+    assert add(x=1, y=1) == 2
+    assert add(2, y=3) == 5
+    assert calls == [(1, 1), (2, 3)]
+    assert add.cache_info() == CacheInfo(hits=2, misses=2, maxsize=4, currsize=2)
+    assert add.__doc__ == "Adds two numbers."
+
+    # unhashable arguments are not cached
+    assert add([1], [2]) == [1, 2]  # type: ignore[arg-type]
+    assert add.cache_info().misses == 2
+
+    add.cache_clear()
+    assert add.cache_info().currsize == 0
+
+
+@pytest.mark.parametrize("conv_type", list(ConvType))
+def test_conv_cache(conv_type: ConvType):
+    a = PLF([(0, 0), (1, 2), (3, 3)])
+    b = PLF([(0, 1), (2, 1), (2, 3), (4, 4)])
+    conv.cache_clear()
+    conv_properties.cache_clear()
+
+    result = conv(a, b, conv_type)
+    # equal PLFs are found in the cache
+    assert conv(PLF(a.points), PLF(b.points), conv_type=conv_type) is result
+    assert conv.cache_info().hits == 1
+    # a different window is a different entry
+    assert conv(a, b, conv_type, start=1) != result
+
+    properties = conv_properties(a, b, conv_type)
+    assert conv_properties(a=a, b=b, conv_type=conv_type) is properties
+    # the properties record the provenance, which plain convolutions don't
+    assert properties.result == result
+
+
+def test_conv_cache_subclasses():
+    a, b = RateLatency(1, 1, 5), RateLatency(1, 2, 5)
+    conv.cache_clear()
+
+    plain = conv(PLF(a.points), PLF(b.points), ConvType.MIN_PLUS_CONV)
+    result = conv(a, b, ConvType.MIN_PLUS_CONV)
+    # equal PLFs of another type are a different entry
+    assert conv.cache_info().hits == 0
+    assert type(plain) is PLF
+    assert isinstance(result, RateLatency)
+    assert result == plain
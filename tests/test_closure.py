@@ -0,0 +1,87 @@
+import pytest
+from helpers import assert_plf_approx
+
+from rtcvis import PLF, ConvType, conv, conv_at_x
+from rtcvis.closure import conv_power, subadditive_closure
+from rtcvis.exceptions import RTCVisException, ValidationException
+from rtcvis.plf import plf_list_min_max
+
+plfs = [
+    PLF([(0, 0), (1, 2), (3, 3)]),
+    PLF([(0, 1), (1, 1), (1, 2), (2, 2), (2, 3), (3, 3)]),
+    PLF([(0, 0.5), (0.5, 2), (1, 1), (2, 4)]),
+    PLF([(0.5, 1), (1.5, 0.5), (2, 3)]),
+]
+
+
+def naive_power(a: PLF, n: int, conv_type: ConvType) -> PLF:
+    result = a
+    for _ in range(n - 1):
+        result = conv(result, a, conv_type)
+    return result
+
+
+@pytest.mark.parametrize("a", plfs)
+@pytest.mark.parametrize("conv_type", [ConvType.MIN_PLUS_CONV, ConvType.MAX_PLUS_CONV])
+def test_self_conv(a: PLF, conv_type: ConvType):
+    result = conv(a, a, conv_type)
+    xs = sorted(set(result.x))
+    for x0, x1 in zip(xs, xs[1:]):
+        x = (x0 + x1) / 2
+        expected = conv_at_x(a, a, x, conv_type).result.y
+        assert result.get_value(x) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("a", plfs)
+@pytest.mark.parametrize("n", [1, 2, 3, 5, 6])
+@pytest.mark.parametrize("conv_type", [ConvType.MIN_PLUS_CONV, ConvType.MAX_PLUS_CONV])
+def test_conv_power(a: PLF, n: int, conv_type: ConvType):
+    expected = naive_power(a, n, conv_type)
+    assert_plf_approx(conv_power(a, n, conv_type), expected)
+    assert_plf_approx(conv_power(a, n, conv_type, horizon=4), expected.end_truncated(4))
+
+
+@pytest.mark.parametrize("n", [2, 3, 5])
+def test_conv_power_negative_start(n: int):
+    a = PLF([(-2, 0), (0, 10), (3, 10)])
+    expected = naive_power(a, n, ConvType.MIN_PLUS_CONV).end_truncated(1)
+    assert_plf_approx(conv_power(a, n, horizon=1), expected)
+
+
+def test_conv_power_negative_start_value():
+    # the value at 1 is a(-2) + a(3), which is only found if a isn't truncated at 1
+    assert conv_power(PLF([(-2, 0), (0, 10), (3, 10)]), 2, horizon=1).get_value(1) == 10
+
+
+def test_conv_power_invalid():
+    with pytest.raises(ValidationException):
+        conv_power(plfs[0], 0)
+    with pytest.raises(RTCVisException):
+        conv_power(plfs[0], 2, ConvType.MIN_PLUS_DECONV)
+
+
+@pytest.mark.parametrize("a", plfs)
+@pytest.mark.parametrize("conv_type", [ConvType.MIN_PLUS_CONV, ConvType.MAX_PLUS_CONV])
+def test_subadditive_closure(a: PLF, conv_type: ConvType):
+    horizon = 7
+    powers = [naive_power(a, n, conv_type).end_truncated(horizon) for n in range(1, 15)]
+    expected = plf_list_min_max(
+        [p for p in powers if len(p.points)],
+        compute_min=conv_type == ConvType.MIN_PLUS_CONV,
+    )
+    if conv_type == ConvType.MAX_PLUS_CONV and a.x_start == 0 and a.get_value(0) > 0:
+        # the super-additive closure diverges if a(0) is positive
+        with pytest.raises(RTCVisException):
+            subadditive_closure(a, horizon, conv_type)
+        return
+    assert_plf_approx(subadditive_closure(a, horizon, conv_type), expected)
+
+
+def test_subadditive_closure_negative_start():
+    with pytest.raises(ValidationException):
+        subadditive_closure(PLF([(-2, 0), (0, 10), (3, 10)]), 1)
+
+
+def test_subadditive_closure_diverges():
+    with pytest.raises(RTCVisException):
+        subadditive_closure(PLF([(0, -1), (1, -1)]), 3, max_iterations=5)
@@ -1,6 +1,7 @@
 import pytest
 
 from rtcvis import PLF, ConvType, conv, conv_at_x
+from rtcvis.conv import PruneStats, _conv_general
 
 min_conv_test_cases = [
     (
@@ -159,3 +160,54 @@ def test_min_plus_deconv_at_x(a: PLF, b: PLF, expected: PLF):
 @pytest.mark.parametrize("a,b,expected", max_deconv_test_cases)
 def test_max_plus_deconv_at_x(a: PLF, b: PLF, expected: PLF):
     conv_at_x_helper(a=a, b=b, expected=expected, conv_type=ConvType.MAX_PLUS_DECONV)
+
+
+convex_plfs = [
+    PLF([(0, 0), (2, 0), (5, 3)]),
+    PLF([(1, 1), (2, 1.5), (3, 3), (4, 6)]),
+    PLF([(0, 2), (1, 0), (3, 0), (4, 2)]),
+    PLF([(0.5, 1)]),
+]
+
+concave_plfs = [
+    PLF([(0, 0), (3, 3), (5, 3)]),
+    PLF([(1, 1), (2, 3), (3, 4), (4, 4.5)]),
+    PLF([(0, 0), (1, 2), (3, 2), (4, 0)]),
+    PLF([(0.5, 1)]),
+]
+
+
+@pytest.mark.parametrize(
+    "a,b,conv_type",
+    [(a, b, ConvType.MIN_PLUS_CONV) for a in convex_plfs for b in convex_plfs]
+    + [(a, b, ConvType.MAX_PLUS_CONV) for a in concave_plfs for b in concave_plfs],
+)
+def test_conv_slope_merge(a: PLF, b: PLF, conv_type: ConvType):
+    expected = _conv_general(a, b, conv_type).simplified()
+    assert conv(a, b, conv_type) == expected
+
+
+@pytest.mark.parametrize(
+    "a,b",
+    [(a, b) for a, b, _ in min_conv_test_cases + max_deconv_test_cases],
+)
+@pytest.mark.parametrize("conv_type", list(ConvType))
+@pytest.mark.parametrize("start,stop", [(1, 3), (-2, 0.5), (2.5, 2.5), (4, 100)])
+def test_conv_window(a: PLF, b: PLF, conv_type: ConvType, start: float, stop: float):
+    expected = (
+        _conv_general(a, b, conv_type)
+        .start_truncated(start)
+        .end_truncated(stop)
+        .simplified()
+    )
+    assert conv(a, b, conv_type, start=start, stop=stop) == expected
+
+
+def test_conv_prune_dominated():
+    # e.g. b shifted by (1, 0) is never below a, which is 0 on the whole domain
+    a = PLF([(0, 0), (1, 0), (2, 0), (3, 0)])
+    b = PLF([(0, 0), (1, 5), (2, 6)])
+    prune_stats: list[PruneStats] = []
+    result = _conv_general(a, b, ConvType.MIN_PLUS_CONV, prune_stats=prune_stats)
+    assert prune_stats == [PruneStats(candidates=7, pruned=2)]
+    assert result.simplified() == PLF([(0, 0), (3, 0), (4, 5), (5, 6)])
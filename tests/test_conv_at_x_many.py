@@ -0,0 +1,67 @@
+import math
+
+import pytest
+
+from rtcvis import PLF, ConvType, conv_at_x, conv_at_x_many, conv_with_provenance
+from rtcvis.exceptions import RTCVisException
+
+plf_pairs = [
+    (PLF([(0, 2), (5, 4.5)]), PLF([(0, 0), (1, 0), (2, 1), (3, 1), (4, 2), (5, 2)])),
+    (PLF([(0, 0), (2.5, 1), (5, 6)]), PLF([(0, 0), (4, 2), (5, 3)])),
+    (
+        PLF([(0, 1.5), (0, 2), (1, 1), (2, 1)]),
+        PLF([(0, 0.5), (0.5, 1), (1, 0), (2, 0)]),
+    ),
+    (
+        PLF([(0, 0), (1, 0), (1, 1), (2, 1), (2, 2), (3, 2), (3, 3), (5, 3)]),
+        PLF([(0, 0), (1, 0), (8, 7)]),
+    ),
+    (PLF([(-1, 3), (2, -1), (4, 2)]), PLF([(1, 1), (2, -2), (2, 0), (3, 4)])),
+]
+
+
+@pytest.mark.parametrize("a,b", plf_pairs)
+@pytest.mark.parametrize("conv_type", list(ConvType))
+def test_conv_at_x_many(a: PLF, b: PLF, conv_type: ConvType):
+    provenance = conv_with_provenance(a, b, conv_type)
+    xs = provenance.result.x
+    inner = [x0 + (x1 - x0) * t for x0, x1 in zip(xs, xs[1:]) for t in (0.3, 0.7)]
+    # unsorted, with duplicates and breakpoints of the result
+    deltas = list(reversed(inner)) + xs + inner[:3]
+    result = conv_at_x_many(a, b, deltas, conv_type, with_lambdas=True)
+    assert result.lambdas is not None
+    assert len(result.y) == len(result.lambdas) == len(deltas)
+    for delta_x, y, lambda_x in zip(deltas, result.y, result.lambdas):
+        expected = conv_at_x(a, b, delta_x, conv_type)
+        assert y == pytest.approx(expected.result.y)
+        # the result point must be located on the sum, possibly at a discontinuity
+        limits = expected.sum.evaluate_many_left(
+            [lambda_x]
+        ) + expected.sum.evaluate_many_right([lambda_x])
+        assert y in [pytest.approx(limit) for limit in limits]
+
+
+@pytest.mark.parametrize("conv_type", list(ConvType))
+def test_conv_at_x_many_outside(conv_type: ConvType):
+    a, b = plf_pairs[1]
+    provenance = conv_with_provenance(a, b, conv_type)
+    deltas = [provenance.result.x_start - 1, provenance.result.x_end + 1]
+    result = conv_at_x_many(a, b, deltas, conv_type, provenance=provenance)
+    assert result.lambdas is None
+    assert all(math.isnan(y) for y in result.y)
+
+
+def test_conv_at_x_many_empty():
+    a, b = plf_pairs[0]
+    result = conv_at_x_many(a, b, [], ConvType.MIN_PLUS_CONV, with_lambdas=True)
+    assert len(result.y) == 0 and result.lambdas is not None
+    assert len(result.lambdas) == 0
+    result = conv_at_x_many(PLF([]), b, [1, 2], ConvType.MIN_PLUS_CONV)
+    assert all(math.isnan(y) for y in result.y)
+
+
+def test_conv_at_x_many_wrong_provenance():
+    a, b = plf_pairs[0]
+    provenance = conv_with_provenance(a, b, ConvType.MIN_PLUS_CONV)
+    with pytest.raises(RTCVisException):
+        conv_at_x_many(a, b, [1], ConvType.MAX_PLUS_CONV, provenance=provenance)
@@ -0,0 +1,94 @@
+import math
+
+import pytest
+from helpers import assert_plf_approx
+
+from rtcvis import PLF, ConvType, conv
+from rtcvis.chain import conv_chain, plan_conv_chain
+from rtcvis.exceptions import RTCVisException, ValidationException
+
+convex = [
+    PLF([(0, 0), (1, 0), (3, 2), (4, 5)]),
+    PLF([(0, 1), (2, 1.5), (3, 4)]),
+    PLF([(1, 0), (2, 3)]),
+]
+concave = [
+    PLF([(0, 0), (1, 2), (3, 3), (4, 3)]),
+    PLF([(0, 1), (2, 4), (3, 4.5)]),
+]
+# a large convex operand between two small ones
+parabola = PLF([(x, x * x) for x in range(11)])
+small = [PLF([(0, 0), (1, 2)]), PLF([(0, 1), (2, 2)])]
+other = [
+    PLF([(0, 0), (1, 2), (1, 3), (2, 1), (4, 2)]),
+    PLF([(0, 1), (0.5, 0), (2, 2), (2.5, 1.5)]),
+    PLF([(0, 0), (1, 1), (2, 0), (3, 1), (4, 0), (5, 1), (6, 0), (7, 1), (8, 0)]),
+]
+
+chains = [
+    [convex[0]],
+    [convex[0], convex[1], convex[2]],
+    [other[0], convex[0], convex[1], other[1]],
+    [other[2], other[0], other[1]],
+    [concave[0], other[1], concave[1], convex[2]],
+    [convex[2], other[2], concave[0], concave[1], other[0], convex[0]],
+    [other[1], small[0], parabola, small[1]],
+]
+
+
+@pytest.mark.parametrize("plfs", chains)
+@pytest.mark.parametrize("conv_type", [ConvType.MIN_PLUS_CONV, ConvType.MAX_PLUS_CONV])
+def test_conv_chain(plfs: list[PLF], conv_type: ConvType):
+    expected = plfs[0]
+    for plf in plfs[1:]:
+        expected = conv(expected, plf, conv_type)
+    result, plan = conv_chain(plfs, conv_type)
+    assert_plf_approx(result, expected)
+    assert plan.operands == tuple(range(len(plfs)))
+
+
+@pytest.mark.parametrize(
+    "plfs,conv_type,expected",
+    [
+        ([convex[0]], ConvType.MIN_PLUS_CONV, "c0"),
+        # for a few operands of similar size, merging in pairs is cheaper
+        (convex, ConvType.MIN_PLUS_CONV, "(c0 * merge(c1, c2))"),
+        # convolving in pairs would merge the segments of the large operand twice
+        (
+            [small[0], parabola, small[1]],
+            ConvType.MIN_PLUS_CONV,
+            "merge(c0, c1, c2)",
+        ),
+        (
+            [other[1], small[0], parabola, small[1]],
+            ConvType.MIN_PLUS_CONV,
+            "(c0 * merge(c1, c2, c3))",
+        ),
+        (convex, ConvType.MAX_PLUS_CONV, "(c0 * (c1 * c2))"),
+        (
+            [other[0], convex[0], convex[1], other[1]],
+            ConvType.MIN_PLUS_CONV,
+            "(c0 * (merge(c1, c2) * c3))",
+        ),
+        # the small operands are convolved first
+        ([other[2], other[0], other[1]], ConvType.MIN_PLUS_CONV, "(c0 * (c1 * c2))"),
+        (concave, ConvType.MAX_PLUS_CONV, "merge(c0, c1)"),
+    ],
+)
+def test_plan_conv_chain(plfs: list[PLF], conv_type: ConvType, expected: str):
+    assert str(plan_conv_chain(plfs, conv_type)) == expected
+
+
+def test_plan_conv_chain_cost():
+    plan = plan_conv_chain([small[0], parabola, small[1]], ConvType.MIN_PLUS_CONV)
+    # a single k-way merge of all 15 points
+    assert plan.is_fused
+    assert plan.cost == pytest.approx(15 * math.log2(3))
+    assert plan.size == 13
+
+
+def test_conv_chain_invalid():
+    with pytest.raises(ValidationException):
+        conv_chain([], ConvType.MIN_PLUS_CONV)
+    with pytest.raises(RTCVisException):
+        conv_chain(convex, ConvType.MIN_PLUS_DECONV)
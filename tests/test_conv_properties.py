@@ -0,0 +1,39 @@
+import pytest
+
+from rtcvis import PLF, ConvProperties, ConvType, conv
+
+plf_pairs = [
+    (PLF([(0, 2), (5, 4.5)]), PLF([(0, 0), (1, 0), (2, 1), (3, 1), (4, 2), (5, 2)])),
+    (PLF([(0, 1.5), (0, 2), (1, 1), (2, 1)]), PLF([(0, 0.5), (0.5, 1), (1, 0)])),
+    (PLF([(-1, 3), (2, -1), (4, 2)]), PLF([(1, 1), (2, -2), (2, 0), (3, 4)])),
+]
+
+other_types = {
+    ConvType.MIN_PLUS_CONV: ConvType.MAX_PLUS_CONV,
+    ConvType.MAX_PLUS_CONV: ConvType.MIN_PLUS_CONV,
+    ConvType.MIN_PLUS_DECONV: ConvType.MAX_PLUS_DECONV,
+    ConvType.MAX_PLUS_DECONV: ConvType.MIN_PLUS_DECONV,
+}
+
+
+@pytest.mark.parametrize("a,b", plf_pairs)
+@pytest.mark.parametrize("conv_type", list(ConvType))
+@pytest.mark.parametrize("background", [True, False])
+def test_conv_properties(a: PLF, b: PLF, conv_type: ConvType, background: bool):
+    properties = ConvProperties(a, b, conv_type, background=background)
+    assert properties.result == conv(a, b, conv_type)
+    assert properties.other_result == conv(a, b, other_types[conv_type])
+
+    # the y limits must contain a, b and both convolutions
+    for plf in (a, b, properties.result, properties.other_result):
+        assert properties.min_y <= plf.min.y - 0.5
+        assert properties.max_y >= plf.max.y + 0.5
+    assert properties.slider_min == properties.result.x_start
+    assert properties.slider_max == properties.result.x_end
+
+
+def test_conv_properties_lazy():
+    a, b = plf_pairs[0]
+    properties = ConvProperties(a, b, ConvType.MIN_PLUS_CONV)
+    assert properties._other_result is None
+    assert properties.other_result is properties.other_result
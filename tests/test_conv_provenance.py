@@ -0,0 +1,70 @@
+import sys
+
+import pytest
+
+from rtcvis import PLF, ConvType, conv, conv_at_x, conv_with_provenance
+from rtcvis.exceptions import RTCVisException
+
+conv_module = sys.modules["rtcvis.conv"]
+
+plf_pairs = [
+    (PLF([(0, 2), (5, 4.5)]), PLF([(0, 0), (1, 0), (2, 1), (3, 1), (4, 2), (5, 2)])),
+    (PLF([(0, 0), (2.5, 1), (5, 6)]), PLF([(0, 0), (4, 2), (5, 3)])),
+    (
+        PLF([(0, 1.5), (0, 2), (1, 1), (2, 1)]),
+        PLF([(0, 0.5), (0.5, 1), (1, 0), (2, 0)]),
+    ),
+    (
+        PLF([(0, 0), (1, 0), (1, 1), (2, 1), (2, 2), (3, 2), (3, 3), (5, 3)]),
+        PLF([(0, 0), (1, 0), (8, 7)]),
+    ),
+    (PLF([(-1, 3), (2, -1), (4, 2)]), PLF([(1, 1), (2, -2), (2, 0), (3, 4)])),
+]
+
+
+@pytest.mark.parametrize("a,b", plf_pairs)
+@pytest.mark.parametrize("conv_type", list(ConvType))
+def test_conv_at_x_provenance(a: PLF, b: PLF, conv_type: ConvType):
+    provenance = conv_with_provenance(a, b, conv_type)
+    assert provenance.result == conv(a, b, conv_type)
+
+    xs = provenance.result.x
+    steps = [x0 + (x1 - x0) * t for x0, x1 in zip(xs, xs[1:]) for t in (0, 0.3, 0.7)]
+    for x in steps + [xs[-1], xs[0] - 1, xs[-1] + 1]:
+        expected = conv_at_x(a, b, x, conv_type)
+        result = conv_at_x(a, b, x, conv_type, provenance=provenance)
+        assert result.result.y == pytest.approx(expected.result.y)
+        if expected.sum.x and result.result.x not in expected.sum.x:
+            # the point must be located on the sum
+            assert expected.sum.get_value(result.result.x) == pytest.approx(
+                result.result.y
+            )
+        assert result.transformed_a == expected.transformed_a
+        assert result.sum == expected.sum
+
+
+def test_conv_at_x_provenance_lazy():
+    a, b = plf_pairs[1]
+    provenance = conv_with_provenance(a, b, ConvType.MIN_PLUS_CONV)
+    result = conv_at_x(a, b, 3.3, ConvType.MIN_PLUS_CONV, provenance=provenance)
+    assert result._curves is None  # type: ignore[attr-defined]
+    assert result.sum.min.y == result.result.y
+
+
+def test_conv_at_x_provenance_mismatch():
+    a, b = plf_pairs[0]
+    provenance = conv_with_provenance(a, b, ConvType.MIN_PLUS_CONV)
+    with pytest.raises(RTCVisException):
+        conv_at_x(a, b, 1, ConvType.MAX_PLUS_CONV, provenance=provenance)
+    with pytest.raises(RTCVisException):
+        conv_at_x(b, a, 1, ConvType.MIN_PLUS_CONV, provenance=provenance)
+
+
+def test_conv_without_provenance(monkeypatch: pytest.MonkeyPatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("conv must not record the provenance")
+
+    monkeypatch.setattr(conv_module, "plf_envelope_sources", fail)
+    for a, b in plf_pairs:
+        for conv_type in ConvType:
+            conv.__wrapped__(a, b, conv_type)
@@ -0,0 +1,48 @@
+import pytest
+
+from rtcvis import PLF, ConvSweep, ConvType, conv_at_x, conv_with_provenance
+
+plf_pairs = [
+    (PLF([(0, 2), (5, 4.5)]), PLF([(0, 0), (1, 0), (2, 1), (3, 1), (4, 2), (5, 2)])),
+    (PLF([(0, 0), (2.5, 1), (5, 6)]), PLF([(0, 0), (4, 2), (5, 3)])),
+    (
+        PLF([(0, 1.5), (0, 2), (1, 1), (2, 1)]),
+        PLF([(0, 0.5), (0.5, 1), (1, 0), (2, 0)]),
+    ),
+    (
+        PLF([(0, 0), (1, 0), (1, 1), (2, 1), (2, 2), (3, 2), (3, 3), (5, 3)]),
+        PLF([(0, 0), (1, 0), (8, 7)]),
+    ),
+    (PLF([(-1, 3), (2, -1), (4, 2)]), PLF([(1, 1), (2, -2), (2, 0), (3, 4)])),
+]
+
+# moves right in small and large steps, hits breakpoints and then moves back
+deltas = [0, 0.25, 1, 1.5, 3, 3.3, 7, 12, 2, -0.5, -4, -1, 0.5, 5, 5, 2.5, -10, 10]
+
+
+@pytest.mark.parametrize("a,b", plf_pairs)
+@pytest.mark.parametrize("conv_type", list(ConvType))
+@pytest.mark.parametrize("use_provenance", [True, False])
+def test_conv_sweep(a: PLF, b: PLF, conv_type: ConvType, use_provenance: bool):
+    provenance = conv_with_provenance(a, b, conv_type) if use_provenance else None
+    sweep = ConvSweep(a, b, conv_type, provenance=provenance)
+    for delta_x in deltas:
+        result = sweep.update(delta_x)
+        assert sweep.delta_x == delta_x
+        expected = conv_at_x(a, b, delta_x, conv_type)
+        assert result.result.y == pytest.approx(expected.result.y)
+        assert result.transformed_a == expected.transformed_a
+        assert result.sum.x == pytest.approx(expected.sum.x)
+        assert result.sum.y == pytest.approx(expected.sum.y)
+
+
+@pytest.mark.parametrize("conv_type", list(ConvType))
+def test_conv_sweep_outdated_result(conv_type: ConvType):
+    a, b = plf_pairs[1]
+    sweep = ConvSweep(a, b, conv_type, provenance=conv_with_provenance(a, b, conv_type))
+    result = sweep.update(1.5)
+    sweep.update(4)
+    # the curves of an older result are still computed for its own delta
+    expected = conv_at_x(a, b, 1.5, conv_type)
+    assert result.transformed_a == expected.transformed_a
+    assert result.sum.y == pytest.approx(expected.sum.y)
@@ -0,0 +1,69 @@
+import math
+
+import pytest
+
+from rtcvis import PLF, ConvType, conv
+from rtcvis.deviation import Deviation, horizontal_deviation, vertical_deviation
+from rtcvis.exceptions import RTCVisException, ValidationException
+
+token_bucket = PLF([(0, 0), (0, 2), (10, 7)])
+rate_latency = PLF([(0, 0), (2, 0), (10, 8)])
+staircase = PLF([(0, 0), (0, 1), (2, 1), (2, 2), (4, 2), (4, 3), (6, 3)])
+
+
+@pytest.mark.parametrize(
+    "a,b,expected",
+    [
+        (token_bucket, rate_latency, Deviation(3, 2, 3)),
+        (rate_latency, token_bucket, Deviation(1, 10, 8)),
+        (staircase, rate_latency, Deviation(2, 2, 2)),
+        (PLF([(1, 1), (3, 3)]), rate_latency, Deviation(2, 2, 2)),
+        (PLF([(0, 5)]), PLF([(0, 1), (1, 2)]), Deviation(4, 0, 5)),
+        # the jump at the end of the common domain is ignored
+        (PLF([(0, 0), (2, 1), (2, 3)]), PLF([(0, 0), (2, 0)]), Deviation(1, 2, 1)),
+        (PLF([(0, 0), (2, 0)]), PLF([(0, 0), (2, 1), (2, -3)]), Deviation(0, 0, 0)),
+    ],
+)
+def test_vertical_deviation(a: PLF, b: PLF, expected: Deviation):
+    assert vertical_deviation(a, b) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize(
+    "a,b",
+    [
+        (token_bucket, rate_latency),
+        (staircase, staircase),
+        # discontinuities at the end
+        (PLF([(0, 0), (2, 1), (2, 3)]), PLF([(0, 0), (2, 0)])),
+        (PLF([(0, 0), (0, 2), (10, 7), (10, 12)]), rate_latency),
+    ],
+)
+def test_vertical_deviation_deconv(a: PLF, b: PLF):
+    expected = conv(a, b, ConvType.MIN_PLUS_DECONV).get_value(0)
+    assert vertical_deviation(a, b).value == pytest.approx(expected)
+
+
+def test_vertical_deviation_no_overlap():
+    with pytest.raises(RTCVisException):
+        vertical_deviation(PLF([(0, 0), (1, 1)]), PLF([(2, 0), (3, 1)]))
+
+
+@pytest.mark.parametrize(
+    "a,b,expected",
+    [
+        # the burst at 0 is served when the rate-latency curve reaches 2
+        (token_bucket, rate_latency, Deviation(4, 0, 2)),
+        (staircase, rate_latency, Deviation(3, 0, 1)),
+        (PLF([(0, 0), (10, 2)]), rate_latency, Deviation(2, 0, 0)),
+        (PLF([(2, 0), (6, 4)]), token_bucket, Deviation(0, 2, 0)),
+        (rate_latency, token_bucket, Deviation(math.inf, 9, 7)),
+        (PLF([(0, 0), (0, 9)]), rate_latency, Deviation(math.inf, 0, 8)),
+    ],
+)
+def test_horizontal_deviation(a: PLF, b: PLF, expected: Deviation):
+    assert horizontal_deviation(a, b) == pytest.approx(expected)
+
+
+def test_horizontal_deviation_decreasing():
+    with pytest.raises(ValidationException):
+        horizontal_deviation(PLF([(0, 1), (1, 0)]), rate_latency)
@@ -0,0 +1,140 @@
+import sys
+
+import pytest
+from helpers import assert_plf_approx
+
+from rtcvis import PLF, ConvType, RateLatency, TokenBucket, conv, iter_conv
+from rtcvis.exceptions import ValidationException
+from rtcvis.plf import plf_min_max
+
+conv_module = sys.modules["rtcvis.conv"]
+
+
+def _plain(plf: PLF) -> PLF:
+    return PLF(plf.points)
+
+
+@pytest.mark.parametrize(
+    "curve,expected",
+    [
+        (RateLatency(2, 1, 3), PLF([(0, 0), (1, 0), (3, 4)])),
+        (RateLatency(2, 0, 3), PLF([(0, 0), (3, 6)])),
+        (RateLatency(2, 3, 3), PLF([(0, 0), (3, 0)])),
+        (TokenBucket(1, 0.5, 4), PLF([(0, 0), (0, 1), (4, 3)])),
+        (TokenBucket(0, 0.5, 4), PLF([(0, 0), (4, 2)])),
+        (TokenBucket(1, 0.5, 0), PLF([(0, 0), (0, 1)])),
+    ],
+)
+def test_family_points(curve: PLF, expected: PLF):
+    assert curve == expected
+
+
+def test_family_parameters():
+    rl = RateLatency(2, 1, 3)
+    assert (rl.rate, rl.latency, rl.x_end) == (2, 1, 3)
+    assert repr(rl) == "RateLatency(2, 1, 3)"
+    tb = TokenBucket(1, 0.5, 4)
+    assert (tb.burst, tb.rate, tb.x_end) == (1, 0.5, 4)
+    assert repr(tb) == "TokenBucket(1, 0.5, 4)"
+
+
+@pytest.mark.parametrize(
+    "create",
+    [
+        lambda: RateLatency(-1, 1, 3),
+        lambda: RateLatency(1, -1, 3),
+        lambda: RateLatency(1, 2, 1),
+        lambda: TokenBucket(-1, 1, 3),
+        lambda: TokenBucket(1, -1, 3),
+        lambda: TokenBucket(1, 1, -3),
+    ],
+)
+def test_family_validation(create):
+    with pytest.raises(ValidationException):
+        create()
+
+
+@pytest.mark.parametrize("family", [RateLatency, TokenBucket])
+def test_family_from_rtctoolbox(family: type[PLF]):
+    # the inherited constructors create plain PLFs, since the families take their
+    # parameters instead of points
+    expected = PLF([(0, 0), (1, 0), (3, 4)])
+    result = family.from_rtctoolbox([(0, 0, 0), (1, 0, 2)], 3)
+    assert type(result) is PLF and result == expected
+    result = family.from_rtctoolbox_str("[(0, 0, 0), (1, 0, 2)], 3")
+    assert type(result) is PLF and result == expected
+
+
+curves = [
+    RateLatency(2, 1, 5),
+    RateLatency(0.5, 3, 6),
+    RateLatency(2, 0, 2),
+    RateLatency(1, 2, 2),
+    TokenBucket(3, 0.5, 10),
+    TokenBucket(1, 2, 4),
+    TokenBucket(0, 1, 3),
+    TokenBucket(2, 1, 0),
+]
+
+
+@pytest.mark.parametrize(
+    "a,b,conv_type",
+    [
+        (curves[0], curves[1], ConvType.MIN_PLUS_CONV),
+        (curves[1], curves[2], ConvType.MIN_PLUS_CONV),
+        (curves[0], curves[3], ConvType.MIN_PLUS_CONV),
+        (curves[4], curves[5], ConvType.MIN_PLUS_CONV),
+        (curves[5], curves[6], ConvType.MIN_PLUS_CONV),
+        (curves[4], curves[7], ConvType.MIN_PLUS_CONV),
+        (curves[4], curves[0], ConvType.MIN_PLUS_DECONV),
+        (curves[5], curves[1], ConvType.MIN_PLUS_DECONV),
+        (curves[6], curves[2], ConvType.MIN_PLUS_DECONV),
+        (curves[7], curves[3], ConvType.MIN_PLUS_DECONV),
+        # no closed forms
+        (curves[0], curves[1], ConvType.MAX_PLUS_CONV),
+        (curves[4], curves[0], ConvType.MIN_PLUS_CONV),
+        (curves[0], curves[4], ConvType.MIN_PLUS_DECONV),
+    ],
+)
+def test_family_conv(a: PLF, b: PLF, conv_type: ConvType):
+    expected = conv_module._conv_general(_plain(a), _plain(b), conv_type)
+    assert_plf_approx(conv(a, b, conv_type), expected)
+    assert_plf_approx(PLF(list(iter_conv(a, b, conv_type))), expected)
+    assert_plf_approx(conv(a, b, conv_type, stop=2), expected.end_truncated(2))
+
+
+@pytest.mark.parametrize(
+    "a,b,expected",
+    [
+        (RateLatency(1, 1, 5), RateLatency(1, 2, 5), RateLatency(1, 3, 10)),
+        (RateLatency(1, 1, 5), RateLatency(2, 2, 2), RateLatency(1, 3, 7)),
+        (RateLatency(3, 1, 1), RateLatency(2, 2, 5), RateLatency(2, 3, 6)),
+    ],
+)
+def test_rate_latency_conv_keeps_family(a: RateLatency, b: RateLatency, expected):
+    result = conv(a, b, ConvType.MIN_PLUS_CONV)
+    assert isinstance(result, RateLatency)
+    assert (result.rate, result.latency) == (expected.rate, expected.latency)
+    assert result == expected
+
+
+@pytest.mark.parametrize(
+    "a,b,compute_min,expected_index",
+    [
+        (RateLatency(1, 1, 5), RateLatency(2, 0, 5), True, 0),
+        (RateLatency(1, 1, 5), RateLatency(2, 0, 5), False, 1),
+        (RateLatency(1, 2, 5), RateLatency(3, 3, 5), True, None),
+        (RateLatency(1, 2, 5), RateLatency(3, 3, 6), False, None),
+        (TokenBucket(1, 1, 5), TokenBucket(2, 1, 5), True, 0),
+        (TokenBucket(1, 1, 5), TokenBucket(2, 1, 5), False, 1),
+        (TokenBucket(1, 1, 5), TokenBucket(2, 0.5, 5), True, None),
+        (TokenBucket(1, 1, 5), TokenBucket(2, 0.5, 5), False, None),
+        (TokenBucket(0, 1, 5), TokenBucket(2, 0.5, 5), True, None),
+        (TokenBucket(1, 1, 5), RateLatency(2, 1, 5), True, None),
+    ],
+)
+def test_family_min_max(a: PLF, b: PLF, compute_min: bool, expected_index: int | None):
+    result = plf_min_max(a, b, compute_min)
+    assert_plf_approx(result, plf_min_max(_plain(a), _plain(b), compute_min))
+    if expected_index is not None:
+        assert result is (a, b)[expected_index]
@@ -0,0 +1,13 @@
+import rtcvis
+
+
+def test_all_names_exist():
+    # optional parts are only exported if they could be imported
+    for name in rtcvis.__all__:
+        assert hasattr(rtcvis, name), name
+
+
+def test_star_import():
+    namespace: dict = {}
+    exec("from rtcvis import *", namespace)
+    assert "PLF" in namespace and "conv" in namespace
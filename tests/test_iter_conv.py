@@ -0,0 +1,70 @@
+import sys
+
+import pytest
+from helpers import assert_plf_approx
+
+from rtcvis import PLF, ConvType, conv, iter_conv
+
+conv_module = sys.modules["rtcvis.conv"]
+
+plf_pairs = [
+    (PLF([(0, 2), (5, 4.5)]), PLF([(0, 0), (1, 0), (2, 1), (3, 1), (4, 2), (5, 2)])),
+    (PLF([(0, 0), (2.5, 1), (5, 6)]), PLF([(0, 0), (4, 2), (5, 3)])),
+    (
+        PLF([(0, 1.5), (0, 2), (1, 1), (2, 1)]),
+        PLF([(0, 0.5), (0.5, 1), (1, 0), (2, 0)]),
+    ),
+    (
+        PLF([(0, 0), (1, 0), (1, 1), (2, 1), (2, 2), (3, 2), (3, 3), (5, 3)]),
+        PLF([(0, 0), (1, 0), (8, 7)]),
+    ),
+    (PLF([(-1, 3), (2, -1), (4, 2)]), PLF([(1, 1), (2, -2), (2, 0), (3, 4)])),
+    (PLF([(1, 2)]), PLF([(0, 0), (1, 3), (2, 1)])),
+    # continuous results whose values at the window borders have rounding errors
+    (PLF([(1, 2), (2, 0), (3, 5), (6, 5)]), PLF([(0, 1), (3, 3), (6, 5)])),
+    (PLF([(1, 1), (2, 1), (4, 1), (7, 0)]), PLF([(0, 0), (3, 6), (6, 4)])),
+    (PLF([(0, 5), (3, 1), (4, 3)]), PLF([(2, 4), (3, 1), (4, 5), (5, 4)])),
+]
+
+
+@pytest.mark.parametrize("a,b", plf_pairs)
+@pytest.mark.parametrize("conv_type", list(ConvType))
+@pytest.mark.parametrize("windows", [None, 1, 2, 3, 5, 13])
+def test_iter_conv(a: PLF, b: PLF, conv_type: ConvType, windows):
+    result = PLF(list(iter_conv(a, b, conv_type, windows=windows)))
+    expected = conv(a, b, conv_type)
+    assert_plf_approx(result, expected)
+    assert result.is_continuous == expected.is_continuous
+    # no redundant points are left
+    assert result.simplified() == result
+
+
+@pytest.mark.parametrize("conv_type", list(ConvType))
+def test_iter_conv_empty(conv_type: ConvType):
+    assert list(iter_conv(PLF([]), PLF([(0, 0), (1, 1)]), conv_type)) == []
+
+
+@pytest.mark.parametrize("windows", [0, -1])
+def test_iter_conv_invalid_windows(windows: int):
+    a, b = plf_pairs[0]
+    with pytest.raises(ValueError):
+        iter_conv(a, b, ConvType.MIN_PLUS_CONV, windows=windows)
+
+
+@pytest.mark.parametrize(
+    "a,b,conv_type",
+    [
+        # constant and convex (or concave) at the same time
+        (PLF([(0, 1), (2, 1)]), PLF([(0, 0), (1, 0), (3, 2)]), ConvType.MIN_PLUS_CONV),
+        (PLF([(0, 2), (1, 3), (3, 3)]), PLF([(0, 1), (2, 1)]), ConvType.MAX_PLUS_CONV),
+    ],
+)
+def test_iter_conv_same_path(
+    monkeypatch: pytest.MonkeyPatch, a: PLF, b: PLF, conv_type: ConvType
+):
+    # like conv, iter_conv prefers the sliding window over the slope merge
+    def fail(*args, **kwargs):
+        raise AssertionError("the slope merge must not be used")
+
+    monkeypatch.setattr(conv_module, "_conv_slope_merge", fail)
+    assert list(iter_conv(a, b, conv_type)) == conv.__wrapped__(a, b, conv_type).points
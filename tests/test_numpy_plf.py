@@ -0,0 +1,134 @@
+import pytest
+
+from rtcvis import PLF, Point
+from rtcvis.exceptions import ValidationException
+
+np = pytest.importorskip("numpy")
+
+from rtcvis.numpy_plf import NumpyPLF, match_numpy_plf  # noqa: E402
+from rtcvis.plf import match_plf  # noqa: E402
+
+plfs = [
+    PLF([]),
+    PLF([(1, 2)]),
+    PLF([(0, 0), (1, 1), (2, 1), (3, 0)]),
+    PLF([(0, 1.5), (0, 2), (1, 1), (2, 1)]),
+    PLF([(0, 0), (1, 0), (1, 1), (2, 1), (2, 2), (3, 2), (3, 3), (5, 3)]),
+    PLF([(-1, 0), (0, 1), (1, -1), (1, 0.5)]),
+]
+
+
+@pytest.mark.parametrize("plf", plfs)
+def test_numpy_plf_init(plf: PLF):
+    result = NumpyPLF(plf.points)
+    assert result == plf
+    assert result.points == plf.points
+    assert result.x_start == plf.x_start
+    assert result.x_end == plf.x_end
+    assert result.min == plf.min
+    assert result.max == plf.max
+    assert isinstance(result.x, np.ndarray) and result.x.dtype == np.float64
+
+
+@pytest.mark.parametrize(
+    "points",
+    [
+        [(1, 0), (0, 0)],
+        [(0, 0), (0, 1), (0, 2)],
+    ],
+)
+def test_numpy_plf_init_invalid(points):
+    with pytest.raises(ValidationException):
+        NumpyPLF(points)
+
+
+def test_numpy_plf_conversion():
+    plf = PLF([(0, 1.5), (0, 2), (1, 1), (2, 1)])
+    converted = NumpyPLF.from_plf(plf)
+    assert type(converted) is NumpyPLF
+    assert type(converted.to_plf()) is PLF
+    assert converted.to_plf() == plf
+    assert NumpyPLF.from_plf(converted) is converted
+    assert NumpyPLF.from_arrays(plf.x, plf.y) == plf
+
+
+def test_numpy_plf_points_are_lazy():
+    plf = NumpyPLF.from_arrays([0, 1, 2], [0, 1, 0])
+    assert plf._lazy_points is None
+    assert plf.points == [Point(0, 0), Point(1, 1), Point(2, 0)]
+
+
+@pytest.mark.parametrize("plf", plfs)
+@pytest.mark.parametrize("mirror", [True, False])
+@pytest.mark.parametrize("offset", [0, 1.5, -3])
+def test_numpy_plf_transformed(plf: PLF, mirror: bool, offset: float):
+    result = NumpyPLF.from_plf(plf).transformed(mirror=mirror, offset=offset)
+    assert type(result) is NumpyPLF
+    assert result == plf.transformed(mirror=mirror, offset=offset)
+
+
+@pytest.mark.parametrize("plf", plfs)
+@pytest.mark.parametrize("x", [-1, -0.5, 0, 0.5, 1, 2.5, 7])
+def test_numpy_plf_truncated(plf: PLF, x: float):
+    numpy_plf = NumpyPLF.from_plf(plf)
+    assert numpy_plf.start_truncated(x) == plf.start_truncated(x)
+    assert numpy_plf.end_truncated(x) == plf.end_truncated(x)
+
+
+@pytest.mark.parametrize("plf", plfs)
+@pytest.mark.parametrize("subtract_x", [True, False])
+@pytest.mark.parametrize("subtract_y", [True, False])
+def test_numpy_plf_add_point(plf: PLF, subtract_x: bool, subtract_y: bool):
+    p = Point(1.5, -2)
+    result = NumpyPLF.from_plf(plf).add_point(p, subtract_x, subtract_y)
+    assert result == plf.add_point(p, subtract_x, subtract_y)
+
+
+@pytest.mark.parametrize("a", plfs)
+@pytest.mark.parametrize("b", plfs)
+def test_numpy_plf_match(a: PLF, b: PLF):
+    a_matched, b_matched = match_numpy_plf(NumpyPLF.from_plf(a), NumpyPLF.from_plf(b))
+    a_expected, b_expected = match_plf(a, b)
+    assert a_matched == a_expected
+    assert b_matched == b_expected
+
+
+@pytest.mark.parametrize("a", plfs)
+@pytest.mark.parametrize("b", plfs)
+def test_numpy_plf_add_sub(a: PLF, b: PLF):
+    numpy_a = NumpyPLF.from_plf(a)
+    assert numpy_a + b == a + b
+    assert numpy_a - b == a - b
+    assert type(numpy_a + b) is NumpyPLF
+
+
+@pytest.mark.parametrize(
+    "plf",
+    plfs
+    + [
+        PLF([(0, 0), (1, 1), (2, 2), (2, 3), (3, 3), (4, 3), (4, 0), (5, 1), (6, 2)]),
+        PLF([(0, 2.0), (0, 2.0), (0.25, 2.25), (0.5, 2.0), (1, 1.5), (1, 1.5)]),
+    ],
+)
+def test_numpy_plf_simplified(plf: PLF):
+    assert NumpyPLF.from_plf(plf).simplified() == plf.simplified()
+
+
+@pytest.mark.parametrize("plf", plfs)
+def test_numpy_plf_shape(plf: PLF):
+    result = NumpyPLF.from_plf(plf)
+    assert result.slopes == plf.slopes
+    assert (result.is_continuous, result.is_convex, result.is_staircase) == (
+        plf.is_continuous,
+        plf.is_convex,
+        plf.is_staircase,
+    )
+
+
+@pytest.mark.parametrize("x", [-1, -0.5, -0.1, 0, 0.5, 0.75, 1])
+def test_numpy_plf_get_value(x: float):
+    plf = PLF([(-1, 0), (0, 1), (1, -1), (1, 0.5)])
+    assert NumpyPLF.from_plf(plf).get_value(x) == plf.get_value(x)
+    assert NumpyPLF.from_plf(plf).get_value(x, right=True) == plf.get_value(
+        x, right=True
+    )
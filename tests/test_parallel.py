@@ -0,0 +1,149 @@
+import pytest
+from helpers import assert_plf_approx
+
+from rtcvis import PLF, ConvPool, ConvType, conv, conv_many
+from rtcvis.conv import _chunk_borders, _conv_breakpoints
+from rtcvis.parallel import (
+    conv_many_unordered,
+    decode_plf,
+    encode_plf,
+    parallel_add,
+    parallel_conv,
+    parallel_min_max,
+)
+from rtcvis.plf import plf_min_max
+
+plfs = [
+    PLF([]),
+    PLF([(1, 2)]),
+    PLF([(0, 2), (5, 4.5)]),
+    PLF([(0, 1.5), (0, 2), (1, 1), (2, 1)]),
+    PLF([(0, 0), (1, 0), (1, 1), (2, 1), (2, 2), (3, 2), (3, 3), (5, 3)]),
+    PLF([(-1, 3), (2, -1), (4, 2)]),
+]
+
+jobs = [(a, b, conv_type) for a in plfs[2:] for b in plfs[2:] for conv_type in ConvType]
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with ConvPool(max_workers=2) as pool:
+        yield pool
+
+
+@pytest.mark.parametrize("plf", plfs)
+def test_encode_plf(plf: PLF):
+    encoded = encode_plf(plf)
+    assert len(encoded) == 2 * len(plf.points)
+    assert decode_plf(encoded) == plf
+
+
+@pytest.mark.parametrize("chunksize", [None, 1, 7, 1000])
+def test_conv_pool_ordered(pool: ConvPool, chunksize):
+    results = list(pool.conv_many(jobs, chunksize=chunksize))
+    assert results == [conv(a, b, conv_type) for a, b, conv_type in jobs]
+
+
+@pytest.mark.parametrize("chunksize", [None, 3])
+def test_conv_pool_unordered(pool: ConvPool, chunksize):
+    results = list(pool.conv_many_unordered(jobs, chunksize=chunksize))
+    assert sorted(i for i, _ in results) == list(range(len(jobs)))
+    for i, result in results:
+        a, b, conv_type = jobs[i]
+        assert result == conv(a, b, conv_type)
+
+
+def test_conv_pool_empty(pool: ConvPool):
+    assert list(pool.conv_many([])) == []
+
+
+def test_conv_many():
+    results = list(conv_many(jobs[:10], max_workers=2))
+    assert results == [conv(a, b, conv_type) for a, b, conv_type in jobs[:10]]
+
+
+def test_conv_many_unordered():
+    results = dict(conv_many_unordered(jobs[:10], max_workers=2))
+    assert [results[i] for i in range(10)] == [
+        conv(a, b, conv_type) for a, b, conv_type in jobs[:10]
+    ]
+
+
+large_plfs = [
+    PLF([(0, 1), (1, 3), (1, 0), (2, 2), (3, 2), (4, 0), (5, 4), (6, 1), (7, 1)]),
+    PLF([(-1, 2), (0, 0), (0.5, 4), (2, 1), (2, 3), (4, 3), (5, 0), (8, 2)]),
+    PLF([(1, 0), (3, 3), (3, 1), (6, 4)]),
+]
+
+
+@pytest.mark.parametrize("a", large_plfs)
+@pytest.mark.parametrize("b", large_plfs)
+@pytest.mark.parametrize("chunks", [2, 3, 100])
+def test_conv_pool_min_max_add(pool: ConvPool, a: PLF, b: PLF, chunks: int):
+    for compute_min in (True, False):
+        assert_plf_approx(
+            pool.min_max(a, b, compute_min, chunks=chunks),
+            plf_min_max(a, b, compute_min),
+        )
+    for subtract_y in (True, False):
+        assert_plf_approx(
+            pool.add(a, b, subtract_y, chunks=chunks), a.add_plf(b, subtract_y)
+        )
+
+
+@pytest.mark.parametrize("a", large_plfs)
+@pytest.mark.parametrize("b", large_plfs)
+@pytest.mark.parametrize("conv_type", list(ConvType))
+def test_conv_pool_conv(pool: ConvPool, a: PLF, b: PLF, conv_type: ConvType):
+    assert_plf_approx(pool.conv(a, b, conv_type, chunks=3), conv(a, b, conv_type))
+
+
+# continuous results whose values at the window borders have rounding errors
+continuous_jobs = [
+    (
+        PLF([(1, 2), (2, 0), (3, 5), (6, 5)]),
+        PLF([(0, 1), (3, 3), (6, 5)]),
+        ConvType.MIN_PLUS_DECONV,
+    ),
+    (
+        PLF([(1, 1), (2, 1), (4, 1), (7, 0)]),
+        PLF([(0, 0), (3, 6), (6, 4)]),
+        ConvType.MAX_PLUS_DECONV,
+    ),
+    (
+        PLF([(0, 5), (3, 1), (4, 3)]),
+        PLF([(2, 4), (3, 1), (4, 5), (5, 4)]),
+        ConvType.MAX_PLUS_DECONV,
+    ),
+]
+
+
+@pytest.mark.parametrize("a,b,conv_type", continuous_jobs)
+@pytest.mark.parametrize("chunks", [2, 3, 4])
+def test_conv_pool_conv_continuous(
+    pool: ConvPool, a: PLF, b: PLF, conv_type: ConvType, chunks: int
+):
+    result = pool.conv(a, b, conv_type, chunks=chunks)
+    assert result.is_continuous
+    assert_plf_approx(result, conv(a, b, conv_type))
+
+
+def test_conv_pool_conv_borders():
+    # almost all breakpoints of a are located in [0, 1]
+    a = PLF([(i / 20, i % 2) for i in range(21)] + [(10, 0)])
+    b = PLF([(0, 0), (1, 1)])
+    borders = _chunk_borders(_conv_breakpoints(a, b, ConvType.MIN_PLUS_CONV), 0, 11, 4)
+    assert len(borders) == 5
+    assert borders[-2] <= 2
+
+
+def test_parallel_functions():
+    a, b = large_plfs[:2]
+    assert_plf_approx(
+        parallel_conv(a, b, ConvType.MIN_PLUS_CONV, max_workers=2),
+        conv(a, b, ConvType.MIN_PLUS_CONV),
+    )
+    assert_plf_approx(
+        parallel_min_max(a, b, True, max_workers=2), plf_min_max(a, b, True)
+    )
+    assert_plf_approx(parallel_add(a, b, max_workers=2), a + b)
@@ -0,0 +1,44 @@
+import pytest
+
+from rtcvis import PLF
+from rtcvis.exceptions import RTCVisException
+from rtcvis.plf import plf_compose
+
+f_jump = PLF([(0, 0), (1, 1), (1, 3), (2, 4)])
+
+
+@pytest.mark.parametrize(
+    "f,g,expected",
+    [
+        (PLF([]), PLF([(0, 0)]), PLF([])),
+        (PLF([(0, 0), (2, 4)]), PLF([(0, 0), (1, 2)]), PLF([(0, 0), (1, 4)])),
+        (PLF([(0, 0), (2, 4)]), PLF([(3, 1)]), PLF([(3, 2)])),
+        (f_jump, PLF([(0, 0), (2, 2)]), f_jump),
+        # g crosses the discontinuity of f downwards
+        (f_jump, PLF([(0, 2), (2, 0)]), PLF([(0, 4), (1, 3), (1, 1), (2, 0)])),
+        # g stays at the discontinuity of f
+        (
+            f_jump,
+            PLF([(0, 0), (1, 1), (2, 1), (3, 2)]),
+            PLF([(0, 0), (1, 1), (2, 1), (2, 3), (3, 4)]),
+        ),
+        # g has a discontinuity
+        (
+            PLF([(0, 0), (2, 4)]),
+            PLF([(0, 0), (1, 1), (1, 2), (2, 2)]),
+            PLF([(0, 0), (1, 2), (1, 4), (2, 4)]),
+        ),
+        (
+            PLF([(0, 0), (1, 2), (2, 0), (3, 2)]),
+            PLF([(0, 0), (3, 3), (6, 0)]),
+            PLF([(0, 0), (1, 2), (2, 0), (3, 2), (4, 0), (5, 2), (6, 0)]),
+        ),
+    ],
+)
+def test_plf_compose(f: PLF, g: PLF, expected: PLF):
+    assert plf_compose(f, g) == expected
+
+
+def test_plf_compose_undefined():
+    with pytest.raises(RTCVisException):
+        plf_compose(PLF([(0, 0), (2, 4)]), PLF([(0, 1), (1, 3)]))
@@ -0,0 +1,87 @@
+import math
+
+import pytest
+
+from rtcvis import PLF
+
+
+@pytest.mark.parametrize(
+    "plf,convex,concave",
+    [
+        (PLF([]), False, False),
+        (PLF([(1, 2)]), True, True),
+        (PLF([(0, 0), (3, 3)]), True, True),
+        (PLF([(0, 0), (1, 0), (3, 4)]), True, False),
+        (PLF([(0, 0), (1, 0), (1, 0), (3, 4)]), True, False),
+        (PLF([(0, 0), (2, 2), (4, 3)]), False, True),
+        (PLF([(0, 0), (1, 1), (2, 1), (3, 0)]), False, True),
+        (PLF([(0, 0), (1, 1), (2, 1), (3, 2)]), False, False),
+        (PLF([(0, 0), (0, 1), (2, 2)]), False, False),
+        (PLF([(0, 0), (1, 0), (1, 1), (2, 1)]), False, False),
+    ],
+)
+def test_plf_convexity(plf: PLF, convex: bool, concave: bool):
+    assert plf.is_convex == convex
+    assert plf.is_concave == concave
+
+
+@pytest.mark.parametrize(
+    "plf,nondecreasing",
+    [
+        (PLF([]), False),
+        (PLF([(1, 2)]), True),
+        (PLF([(0, 0), (1, 0), (3, 4)]), True),
+        (PLF([(0, 0), (0, 1), (2, 1)]), True),
+        (PLF([(0, 1), (0, 0), (2, 1)]), False),
+        (PLF([(0, 0), (1, 1), (2, 0.5)]), False),
+    ],
+)
+def test_plf_nondecreasing(plf: PLF, nondecreasing: bool):
+    assert plf.is_nondecreasing == nondecreasing
+
+
+@pytest.mark.parametrize(
+    "plf,constant",
+    [
+        (PLF([]), False),
+        (PLF([(1, 2)]), True),
+        (PLF([(0, 1), (1, 1), (3, 1)]), True),
+        (PLF([(0, 1), (1, 1), (1, 2)]), False),
+    ],
+)
+def test_plf_constant(plf: PLF, constant: bool):
+    assert plf.is_constant == constant
+
+
+@pytest.mark.parametrize(
+    "plf,continuous,staircase",
+    [
+        (PLF([]), False, False),
+        (PLF([(1, 2)]), True, True),
+        (PLF([(0, 1), (2, 1)]), True, True),
+        (PLF([(0, 0), (1, 0), (1, 0), (3, 4)]), True, False),
+        (PLF([(0, 0), (1, 0), (1, 2), (3, 2), (3, 1)]), False, True),
+        (PLF([(0, 0), (0, 1), (2, 2)]), False, False),
+    ],
+)
+def test_plf_continuous_staircase(plf: PLF, continuous: bool, staircase: bool):
+    assert plf.is_continuous == continuous
+    assert plf.is_staircase == staircase
+
+
+@pytest.mark.parametrize(
+    "plf,slopes",
+    [
+        (PLF([]), []),
+        (PLF([(1, 2)]), []),
+        (PLF([(0, 0), (2, 1), (2, 3), (3, 3), (3, 0)]), [0.5, math.inf, 0, -math.inf]),
+    ],
+)
+def test_plf_slopes(plf: PLF, slopes: list[float]):
+    assert plf.slopes == slopes
+    assert plf.slopes is plf.slopes
+
+
+def test_plf_slopes_identical_points():
+    slopes = PLF([(0, 0), (1, 1), (1, 1), (2, 1)]).slopes
+    assert slopes[0] == 1 and math.isnan(slopes[1]) and slopes[2] == 0
@@ -0,0 +1,163 @@
+import pytest
+
+from rtcvis import PLF
+from rtcvis.envelope import find_dominated, plf_envelope
+from rtcvis.exceptions import RTCVisException
+from rtcvis.plf import plf_list_min_max
+
+
+@pytest.mark.parametrize(
+    "plfs,compute_min,expected",
+    [
+        ([], True, PLF([])),
+        ([PLF([(0, 1), (1, 2)])], True, PLF([(0, 1), (1, 2)])),
+        # crossing lines
+        (
+            [PLF([(0, 0), (2, 2)]), PLF([(0, 2), (2, 0)])],
+            True,
+            PLF([(0, 0), (1, 1), (2, 0)]),
+        ),
+        (
+            [PLF([(0, 0), (2, 2)]), PLF([(0, 2), (2, 0)])],
+            False,
+            PLF([(0, 2), (1, 1), (2, 2)]),
+        ),
+        # partial domains
+        (
+            [
+                PLF([(0, 0), (1, 2), (2, 2)]),
+                PLF([(0, 0.5), (1.5, 0.5), (2, 2.5), (2.5, 2.5)]),
+            ],
+            True,
+            PLF(
+                [
+                    (0, 0),
+                    (0.25, 0.5),
+                    (1.5, 0.5),
+                    (1.875, 2),
+                    (2, 2),
+                    (2, 2.5),
+                    (2.5, 2.5),
+                ]
+            ),
+        ),
+        # one PLF ends where the other one starts
+        (
+            [PLF([(0, 5), (1, 5)]), PLF([(1, 0), (2, 0)])],
+            True,
+            PLF([(0, 5), (1, 5), (1, 0), (2, 0)]),
+        ),
+        # discontinuities
+        (
+            [
+                PLF([(0, 0), (2, 0), (3, -1), (4, -1), (4, -2)]),
+                PLF([(0, -2), (0, 1), (1, 0), (4, 0), (4, 2)]),
+            ],
+            False,
+            PLF([(0, 0), (0, 1), (1, 0), (4, 0), (4, 2)]),
+        ),
+        (
+            [PLF([(0, 5), (2, 5)]), PLF([(1, 0), (1, 7), (2, 7)])],
+            True,
+            PLF([(0, 5), (2, 5)]),
+        ),
+        # many PLFs touching the envelope at a single point
+        (
+            [PLF([(0, 0), (1, 1), (2, 0)]), PLF([(0, 2), (1, 1), (2, 2)])] * 3,
+            True,
+            PLF([(0, 0), (1, 1), (2, 0)]),
+        ),
+    ],
+)
+def test_plf_envelope(plfs: list[PLF], compute_min: bool, expected: PLF):
+    result = plf_envelope(plfs, compute_min=compute_min)
+    assert result == expected
+
+
+@pytest.mark.parametrize(
+    "plfs",
+    [
+        [
+            PLF([(0, 1), (2, -1), (3, 0), (4, -1), (5, 0), (6, -1), (7, 0)]),
+            PLF([(0, 0), (7, 0)]),
+            PLF([(1, 3), (3, -2), (3, 1), (6, 1)]),
+        ],
+        [
+            PLF([(0, -1), (1, 1), (2, 1), (3, 0), (4, 1), (5, 0), (6, 1)]),
+            PLF([(2, 0), (4, 0.5)]),
+            PLF([(-1, 0.5), (0, 0.5), (0, 0), (3, 3)]),
+        ],
+    ],
+)
+@pytest.mark.parametrize("compute_min", [True, False])
+def test_plf_envelope_matches_fold(plfs: list[PLF], compute_min: bool):
+    result = plf_envelope(plfs, compute_min=compute_min)
+    expected = plf_list_min_max(plfs, compute_min=compute_min)
+    assert result.x_start == expected.x_start and result.x_end == expected.x_end
+    # the fold may leave redundant points, so compare the values between all points
+    xs = sorted(set(result.x + expected.x))
+    for x0, x1 in zip(xs, xs[1:]):
+        for x in (x0, (x0 + x1) / 2, x1):
+            assert result.get_value(x) == pytest.approx(expected.get_value(x))
+
+
+def test_plf_envelope_gap():
+    with pytest.raises(RTCVisException):
+        plf_envelope([PLF([(0, 0), (1, 0)]), PLF([(2, 0), (3, 0)])], compute_min=True)
+
+
+@pytest.mark.parametrize(
+    "plfs,compute_min,expected,n_dominated",
+    [
+        ([], True, [], 0),
+        ([PLF([]), PLF([(0, 0)])], True, [PLF([]), PLF([(0, 0)])], 0),
+        # the second PLF is completely above the first one
+        (
+            [PLF([(0, 0), (4, 1)]), PLF([(1, 2), (2, 3)])],
+            True,
+            [PLF([(0, 0), (4, 1)])],
+            1,
+        ),
+        (
+            [PLF([(0, 0), (4, 1)]), PLF([(1, 2), (2, 3)])],
+            False,
+            [PLF([(0, 0), (4, 1)]), PLF([(1, 2), (2, 3)])],
+            0,
+        ),
+        # the lower PLF doesn't cover the whole domain of the other one
+        (
+            [PLF([(0, 0), (2, 1)]), PLF([(1, 2), (3, 3)])],
+            True,
+            [PLF([(0, 0), (2, 1)]), PLF([(1, 2), (3, 3)])],
+            0,
+        ),
+        # the ranges of the y values overlap
+        (
+            [PLF([(0, 0), (4, 3)]), PLF([(1, 2), (2, 3)])],
+            True,
+            [PLF([(0, 0), (4, 3)]), PLF([(1, 2), (2, 3)])],
+            0,
+        ),
+        # identical PLFs only keep the first one
+        ([PLF([(0, 1), (1, 1)])] * 3, True, [PLF([(0, 1), (1, 1)])], 2),
+        # dominated by a PLF with the same start
+        (
+            [PLF([(0, 5), (1, 5)]), PLF([(0, 1), (0, 0), (2, 0)])],
+            False,
+            [PLF([(0, 5), (1, 5)]), PLF([(0, 1), (0, 0), (2, 0)])],
+            0,
+        ),
+        (
+            [PLF([(0, 5), (1, 5)]), PLF([(0, 1), (0, 0), (2, 0)])],
+            True,
+            [PLF([(0, 1), (0, 0), (2, 0)])],
+            1,
+        ),
+    ],
+)
+def test_find_dominated(
+    plfs: list[PLF], compute_min: bool, expected: list[PLF], n_dominated: int
+):
+    dominated = find_dominated(plfs, compute_min=compute_min)
+    assert [plf for i, plf in enumerate(plfs) if i not in dominated] == expected
+    assert len(dominated) == n_dominated
@@ -16,3 +16,12 @@ def test_plf_eq():
     assert a == a
     assert b == b
     assert a != b
+
+
+def test_plf_hash():
+    a = PLF([(0, 0), (2, 1), (5, 3)])
+    b = PLF([(0.0, 0.0), (2.0, 1.0), (5.0, 3.0)])
+    c = PLF([(0, 0), (2, 2), (5, 3)])
+    assert hash(a) == hash(b)
+    assert hash(a) != hash(c)
+    assert len({a, b, c}) == 2
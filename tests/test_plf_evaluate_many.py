@@ -0,0 +1,45 @@
+import pytest
+
+from rtcvis import PLF
+from rtcvis.exceptions import RTCVisException
+
+plf = PLF([(-1, 0), (0, 1), (1, -1), (1, 0.5), (2, 0.5), (2, 3)])
+xs = [1, -1, 0.5, -0.5, 2, 0, 1.5, 0.75, 1]
+
+
+def test_plf_evaluate_many():
+    assert plf.evaluate_many(xs) == [plf.get_value(x) for x in xs]
+    assert plf.evaluate_many_left(xs) == [plf.get_value(x) for x in xs]
+    assert plf.evaluate_many([]) == []
+    assert PLF.evaluate_many is PLF.evaluate_many_left
+
+
+def test_plf_evaluate_many_right():
+    assert plf.evaluate_many_right(xs) == [0.5, 0, 0, 0.5, 3, 1, 0.5, -0.5, 0.5]
+
+
+@pytest.mark.parametrize(
+    "plf,xs",
+    [
+        (PLF([]), [0]),
+        (PLF([(1, 0), (3, 5)]), [1, 2, 0.9]),
+        (PLF([(1, 0), (3, 5)]), [3.1, 2]),
+    ],
+)
+def test_plf_evaluate_many_invalid(plf: PLF, xs: list[float]):
+    with pytest.raises(RTCVisException):
+        plf.evaluate_many(xs)
+
+
+def test_numpy_plf_evaluate_many():
+    np = pytest.importorskip("numpy")
+    from rtcvis.numpy_plf import NumpyPLF
+
+    numpy_plf = NumpyPLF.from_plf(plf)
+    result = numpy_plf.evaluate_many(np.array(xs))
+    assert isinstance(result, np.ndarray)
+    assert result.tolist() == plf.evaluate_many(xs)
+    assert numpy_plf.evaluate_many_left(xs).tolist() == plf.evaluate_many_left(xs)
+    assert numpy_plf.evaluate_many_right(xs).tolist() == plf.evaluate_many_right(xs)
+    with pytest.raises(RTCVisException):
+        numpy_plf.evaluate_many([3])
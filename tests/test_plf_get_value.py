@@ -28,3 +28,14 @@ def test_plf_get_value():
     assert a.get_value(0.5) == 0
     assert a.get_value(0.75) == -0.5
     assert a.get_value(1) == -1
+
+
+def test_plf_get_value_discontinuity():
+    a = PLF([(0, 0), (0, 1), (1, 1), (1, 2), (2, 2), (2, 3)])
+    assert a.get_value(0) == 0
+    assert a.get_value(1) == 1
+    assert a.get_value(2) == 2
+    assert a.get_value(0, right=True) == 1
+    assert a.get_value(1, right=True) == 2
+    assert a.get_value(2, right=True) == 3
+    assert a.get_value(0.5, right=True) == 1
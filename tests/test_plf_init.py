@@ -32,3 +32,20 @@ def test_plf_init(plf_points):
 def test_plf_init_invalid(plf_points):
     with pytest.raises(ValidationException):
         PLF(plf_points)
+
+
+@pytest.mark.parametrize(
+    "plf_points",
+    [
+        [],
+        [(0, 0)],
+        [(-1, 0), (0.5, 1), (0.5, 2), (2, 0)],
+    ],
+)
+def test_plf_from_points(plf_points):
+    plf = PLF(plf_points)
+    trusted = PLF._from_points(plf.points)
+    assert trusted == plf
+    assert trusted.x_start == plf.x_start and trusted.x_end == plf.x_end
+    assert trusted._min is None and trusted._max is None
+    assert trusted.min == plf.min and trusted.max == plf.max
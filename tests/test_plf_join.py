@@ -0,0 +1,55 @@
+import pytest
+
+from rtcvis import PLF
+from rtcvis.exceptions import RTCVisException
+from rtcvis.plf import plf_join
+
+
+@pytest.mark.parametrize(
+    "plfs,expected",
+    [
+        ([], PLF([])),
+        ([PLF([]), PLF([(0, 1), (1, 2)]), PLF([])], PLF([(0, 1), (1, 2)])),
+        # continuous at the border, the redundant point is removed
+        ([PLF([(0, 0), (1, 1)]), PLF([(1, 1), (2, 2)])], PLF([(0, 0), (2, 2)])),
+        (
+            [PLF([(0, 0), (1, 1)]), PLF([(1, 1), (2, 0)]), PLF([(2, 0), (3, 0)])],
+            PLF([(0, 0), (1, 1), (2, 0), (3, 0)]),
+        ),
+        # discontinuity at the border
+        (
+            [PLF([(0, 0), (1, 1)]), PLF([(1, 3), (2, 3)])],
+            PLF([(0, 0), (1, 1), (1, 3), (2, 3)]),
+        ),
+        # both PLFs contain the same discontinuity at the border
+        (
+            [PLF([(0, 0), (1, 1), (1, 3)]), PLF([(1, 1), (1, 3), (2, 3)])],
+            PLF([(0, 0), (1, 1), (1, 3), (2, 3)]),
+        ),
+        # values at the border that only differ by rounding errors
+        (
+            [PLF([(0, 0), (1, 0.1 + 0.2)]), PLF([(1, 0.3), (2, 0.6)])],
+            PLF([(0, 0), (2, 0.6)]),
+        ),
+        (
+            [PLF([(0, 0), (1, 0.3)]), PLF([(1, 0.1 + 0.2), (2, 0)])],
+            PLF([(0, 0), (1, 0.3), (2, 0)]),
+        ),
+        # single points
+        ([PLF([(0, 0), (1, 1)]), PLF([(1, 1)])], PLF([(0, 0), (1, 1)])),
+        ([PLF([(1, 1)]), PLF([(1, 2), (2, 2)])], PLF([(1, 1), (1, 2), (2, 2)])),
+    ],
+)
+def test_plf_join(plfs: list[PLF], expected: PLF):
+    assert plf_join(plfs) == expected
+
+
+def test_plf_join_gap():
+    with pytest.raises(RTCVisException):
+        plf_join([PLF([(0, 0), (1, 1)]), PLF([(2, 1), (3, 1)])])
+
+
+def test_plf_join_rounding_errors():
+    result = plf_join([PLF([(0, 1), (1, 1 + 1e-15)]), PLF([(1, 1), (2, 2)])])
+    assert result.is_continuous
+    assert result.x == [0, 1, 2]
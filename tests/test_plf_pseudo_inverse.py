@@ -0,0 +1,66 @@
+import pytest
+
+from rtcvis import PLF
+from rtcvis.exceptions import ValidationException
+
+
+@pytest.mark.parametrize(
+    "plf,lower,upper",
+    [
+        (PLF([]), PLF([]), PLF([])),
+        (PLF([(1, 2)]), PLF([(2, 1)]), PLF([(2, 1)])),
+        (PLF([(0, 0), (2, 4)]), PLF([(0, 0), (4, 2)]), PLF([(0, 0), (4, 2)])),
+        # flat segments become discontinuities and vice versa
+        (
+            PLF([(0, 0), (1, 0), (3, 2), (3, 4), (5, 4), (6, 5)]),
+            PLF([(0, 0), (0, 1), (2, 3), (4, 3), (4, 5), (5, 6)]),
+            PLF([(0, 1), (2, 3), (4, 3), (4, 5), (5, 6)]),
+        ),
+        (
+            PLF([(0, 1), (1, 1), (2, 1), (3, 2)]),
+            PLF([(1, 0), (1, 2), (2, 3)]),
+            PLF([(1, 2), (2, 3)]),
+        ),
+        (
+            PLF([(0, 0), (2, 2), (3, 2)]),
+            PLF([(0, 0), (2, 2)]),
+            PLF([(0, 0), (2, 2), (2, 3)]),
+        ),
+    ],
+)
+def test_plf_pseudo_inverse(plf: PLF, lower: PLF, upper: PLF):
+    assert plf.pseudo_inverse() == lower
+    assert plf.pseudo_inverse(lower=False) == upper
+
+
+@pytest.mark.parametrize(
+    "plf,y,lower,upper",
+    [
+        (PLF([(0, 0), (1, 0), (3, 2), (3, 4), (5, 4), (6, 5)]), 0, 0, 1),
+        (PLF([(0, 0), (1, 0), (3, 2), (3, 4), (5, 4), (6, 5)]), 3, 3, 3),
+        (PLF([(0, 0), (1, 0), (3, 2), (3, 4), (5, 4), (6, 5)]), 4, 3, 5),
+        (PLF([(0, 0), (1, 0), (3, 2), (3, 4), (5, 4), (6, 5)]), 4.5, 5.5, 5.5),
+        # interior plateaus
+        (PLF([(0, 0), (1, 2), (3, 2), (4, 4)]), 2, 1, 3),
+        (PLF([(0, 0), (1, 2), (3, 2), (4, 4)]), 1, 0.5, 0.5),
+        (PLF([(0, 0), (1, 2), (3, 2), (4, 4)]), 3, 3.5, 3.5),
+        (PLF([(0, 1), (1, 1), (2, 3), (4, 3), (5, 3), (6, 5)]), 1, 0, 1),
+        (PLF([(0, 1), (1, 1), (2, 3), (4, 3), (5, 3), (6, 5)]), 3, 2, 5),
+        (PLF([(0, 1), (1, 1), (2, 3), (4, 3), (5, 3), (6, 5)]), 2, 1.5, 1.5),
+        # a flat segment at the end becomes a discontinuity at the end
+        (PLF([(0, 0), (1, 2), (3, 2)]), 2, 1, 3),
+        (PLF([(0, 0), (1, 2), (3, 2)]), 1.5, 0.75, 0.75),
+    ],
+)
+def test_plf_pseudo_inverse_values(plf: PLF, y: float, lower: float, upper: float):
+    lower_inverse = plf.pseudo_inverse()
+    upper_inverse = plf.pseudo_inverse(lower=False)
+    assert lower_inverse.get_value(y) == lower
+    # the upper pseudo-inverse is right-continuous
+    assert upper_inverse.get_value(y, right=True) == upper
+    assert upper_inverse.evaluate_many_right([y]) == [upper]
+
+
+def test_plf_pseudo_inverse_decreasing():
+    with pytest.raises(ValidationException):
+        PLF([(0, 1), (1, 0)]).pseudo_inverse()
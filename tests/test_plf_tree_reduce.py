@@ -0,0 +1,47 @@
+import functools
+import operator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+from helpers import assert_plf_approx
+
+from rtcvis import PLF
+from rtcvis.exceptions import RTCVisException
+from rtcvis.plf import plf_list_min_max, plf_min_max_merged, plf_tree_reduce
+
+plfs = [
+    PLF([(0, 1), (2, -1), (3, 0), (4, -1), (5, 0), (6, -1), (7, 0)]),
+    PLF([(0, 0), (7, 0)]),
+    PLF([(1, 3), (3, -2), (3, 1), (6, 1)]),
+    PLF([(-1, 0.5), (0, 0.5), (0, 0), (3, 3)]),
+    PLF([(2, 0), (4, 0.5)]),
+]
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 4, 5])
+@pytest.mark.parametrize("compute_min", [True, False])
+def test_plf_tree_reduce_min_max(n: int, compute_min: bool):
+    op = functools.partial(plf_min_max_merged, compute_min=compute_min)
+    result = plf_tree_reduce(plfs[:n], op)
+    assert_plf_approx(result, plf_list_min_max(plfs[:n], compute_min=compute_min))
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 5])
+def test_plf_tree_reduce_add(n: int):
+    expected = plfs[0]
+    for plf in plfs[1:n]:
+        expected = expected + plf
+    assert_plf_approx(plf_tree_reduce(plfs[:n], operator.add), expected)
+
+
+@pytest.mark.parametrize("executor_type", [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_plf_tree_reduce_executor(executor_type):
+    op = functools.partial(plf_min_max_merged, compute_min=True)
+    with executor_type(max_workers=2) as executor:
+        result = plf_tree_reduce(plfs, op, executor=executor)
+    assert result == plf_tree_reduce(plfs, op)
+
+
+def test_plf_tree_reduce_empty():
+    with pytest.raises(RTCVisException):
+        plf_tree_reduce([], operator.add)
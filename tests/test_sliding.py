@@ -0,0 +1,64 @@
+import sys
+
+import pytest
+from helpers import assert_plf_approx
+
+from rtcvis import PLF, ConvType, conv
+from rtcvis.exceptions import ValidationException
+from rtcvis.sliding import sliding_window_extremum
+
+conv_module = sys.modules["rtcvis.conv"]
+
+plfs = [
+    PLF([(0, 0), (1, 2), (2, 1), (4, 3)]),
+    PLF([(0, 1), (1, 1), (1, 3), (2, 3), (2, 0), (3, 2)]),
+    PLF([(0, 4), (0, 5), (0.5, 5), (0.5, 0), (2.5, 0), (4.5, 1)]),
+    PLF([(1, 0), (3, 0), (5, 4), (6, 4), (6, 1)]),
+    PLF([(2, 3)]),
+]
+
+
+@pytest.mark.parametrize(
+    "plf,width,compute_min,expected",
+    [
+        (
+            plfs[0],
+            1,
+            True,
+            PLF([(0, 0), (1, 0), (5 / 3, 4 / 3), (2, 1), (3, 1), (5, 3)]),
+        ),
+        (
+            plfs[0],
+            1,
+            False,
+            PLF([(0, 0), (1, 2), (2, 2), (2.5, 1.5), (4, 3), (5, 3)]),
+        ),
+        (plfs[0], 10, True, PLF([(0, 0), (10, 0), (10.5, 1), (12, 1), (14, 3)])),
+        (plfs[0], 0, True, plfs[0]),
+        (plfs[4], 2, False, PLF([(2, 3), (4, 3)])),
+    ],
+)
+def test_sliding_window_extremum(
+    plf: PLF, width: float, compute_min: bool, expected: PLF
+):
+    result = sliding_window_extremum(plf, width, compute_min)
+    assert result.x == pytest.approx(expected.x)
+    assert result.y == pytest.approx(expected.y)
+
+
+def test_sliding_window_extremum_negative_width():
+    with pytest.raises(ValidationException):
+        sliding_window_extremum(plfs[0], -1, True)
+
+
+@pytest.mark.parametrize("plf", plfs)
+@pytest.mark.parametrize(
+    "constant",
+    [PLF([(0, 0), (1, 0)]), PLF([(1, 2), (3.5, 2)]), PLF([(-1, -1), (0, -1)])],
+)
+@pytest.mark.parametrize("conv_type", list(ConvType))
+@pytest.mark.parametrize("swap", [False, True])
+def test_conv_constant(plf: PLF, constant: PLF, conv_type: ConvType, swap: bool):
+    a, b = (constant, plf) if swap else (plf, constant)
+    result = conv(a, b, conv_type)
+    assert_plf_approx(result, conv_module._conv_general(a, b, conv_type))
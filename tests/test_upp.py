@@ -0,0 +1,111 @@
+import pytest
+
+from rtcvis import PLF, ConvType, conv
+from rtcvis.exceptions import RTCVisException, ValidationException
+from rtcvis.plf import plf_min_max
+from rtcvis.upp import UltimatelyPeriodicPLF, upp_conv, upp_min_max
+
+# a staircase with a burst, a rate-latency-like curve and a curve with a transient
+curves = [
+    UltimatelyPeriodicPLF(PLF([]), PLF([(0, 2), (1, 2), (1, 3), (2, 3)]), 1),
+    UltimatelyPeriodicPLF(PLF([(0, 0), (2, 0)]), PLF([(2, 0), (3, 2)]), 2),
+    UltimatelyPeriodicPLF(
+        PLF([(0, 1), (1, 4), (1, 0), (1.5, 1)]), PLF([(1.5, 1), (2, 3), (3, 2.5)]), 1.5
+    ),
+    UltimatelyPeriodicPLF(PLF([(0, 5)]), PLF([(0, 0), (0.5, 1), (1.5, 0)]), 0.5),
+]
+HORIZON = 20
+
+
+def assert_equal_until(result: UltimatelyPeriodicPLF, expected: PLF, horizon: float):
+    x_start = expected.x_start
+    finite = result.to_finite(horizon)
+    assert finite.x_start == x_start
+    for i in range(400):
+        x = min(x_start + (horizon - x_start) * (i + 0.5) / 400, horizon)
+        assert result.get_value(x) == pytest.approx(expected.get_value(x))
+        assert finite.get_value(x) == pytest.approx(expected.get_value(x))
+
+
+@pytest.mark.parametrize(
+    "x,expected",
+    [(0, 2), (0.5, 2), (1, 2), (1.5, 3), (2, 3), (2.5, 3), (3, 3), (3.5, 4), (10, 7)],
+)
+def test_upp_get_value(x: float, expected: float):
+    assert curves[0].get_value(x) == expected
+
+
+def test_upp_get_value_transient():
+    curve = curves[3]
+    assert curve(0) == 5
+    assert curve(0.5) == 1
+    assert curve(2) == 1.5
+    with pytest.raises(RTCVisException):
+        curve(-1)
+
+
+@pytest.mark.parametrize("curve", curves)
+def test_upp_to_finite(curve: UltimatelyPeriodicPLF):
+    finite = curve.to_finite(HORIZON)
+    assert finite.x_start == curve.x_start and finite.x_end == HORIZON
+    assert_equal_until(curve, finite, HORIZON)
+    assert curve.to_finite(curve.periodic_start) == curve.transient
+
+
+@pytest.mark.parametrize("a", curves)
+@pytest.mark.parametrize("b", curves)
+def test_upp_add(a: UltimatelyPeriodicPLF, b: UltimatelyPeriodicPLF):
+    expected = a.to_finite(HORIZON) + b.to_finite(HORIZON)
+    assert_equal_until(a + b, expected, HORIZON)
+
+
+@pytest.mark.parametrize("a", curves)
+@pytest.mark.parametrize("b", curves)
+@pytest.mark.parametrize("compute_min", [True, False])
+def test_upp_min_max(
+    a: UltimatelyPeriodicPLF, b: UltimatelyPeriodicPLF, compute_min: bool
+):
+    expected = plf_min_max(a.to_finite(HORIZON), b.to_finite(HORIZON), compute_min)
+    assert_equal_until(upp_min_max(a, b, compute_min), expected, HORIZON)
+
+
+@pytest.mark.parametrize("a", curves)
+@pytest.mark.parametrize("b", curves)
+@pytest.mark.parametrize("conv_type", [ConvType.MIN_PLUS_CONV, ConvType.MAX_PLUS_CONV])
+def test_upp_conv(
+    a: UltimatelyPeriodicPLF, b: UltimatelyPeriodicPLF, conv_type: ConvType
+):
+    result = upp_conv(a, b, conv_type)
+    # the finite inputs must be long enough for the result to be exact
+    horizon = HORIZON + a.x_start + b.x_start
+    expected = conv(
+        a.to_finite(horizon - b.x_start), b.to_finite(horizon - a.x_start), conv_type
+    ).end_truncated(horizon)
+    assert_equal_until(result, expected, horizon)
+
+
+def test_upp_conv_deconv():
+    with pytest.raises(RTCVisException):
+        upp_conv(curves[0], curves[1], ConvType.MIN_PLUS_DECONV)
+
+
+@pytest.mark.parametrize(
+    "transient,pattern",
+    [
+        (PLF([]), PLF([(0, 0)])),
+        (PLF([]), PLF([(0, 0), (0, 1)])),
+        (PLF([(0, 0), (1, 0)]), PLF([(2, 0), (3, 0)])),
+    ],
+)
+def test_upp_invalid(transient: PLF, pattern: PLF):
+    with pytest.raises(ValidationException):
+        UltimatelyPeriodicPLF(transient, pattern, 1)
+
+
+def test_upp_from_finite():
+    plf = PLF([(0, 0), (1, 1), (1, 2), (2, 2), (3, 3), (3, 4), (4, 4)])
+    curve = UltimatelyPeriodicPLF.from_finite(plf, 0, 2, 2)
+    assert curve.transient == PLF([])
+    assert curve.pattern == PLF([(0, 0), (1, 1), (1, 2), (2, 2)])
+    assert curve.rate == 1
+    assert_equal_until(curve, plf, 4)
@@ -11,10 +11,10 @@ const title = document.querySelector("#title");
 const exportButton = document.querySelector("#export-button");
 
 // python function and classes
-let conv_at_x;
+let ConvSweep;
 let ConvType;
 let PLF;
-let ConvProperties;
+let conv_properties;
 
 // initial values
 let initialPLFAStr = "[(0, 0, 0), (1, 1, 0), (2, 2, 0), (3, 3, 0)], 5";
@@ -149,12 +149,12 @@ async function initializePyodide() {
   const micropip = pyodide.pyimport("micropip");
   await micropip.install("dist/rtcvis-0.3.0-py3-none-any.whl");
   pyodide.runPython(
-    "from rtcvis import PLF, conv_at_x, ConvType, ConvProperties"
+    "from rtcvis import PLF, ConvSweep, ConvType, conv_properties"
   );
-  conv_at_x = pyodide.globals.get("conv_at_x");
+  ConvSweep = pyodide.globals.get("ConvSweep");
   ConvType = pyodide.globals.get("ConvType");
   PLF = pyodide.globals.get("PLF");
-  ConvProperties = pyodide.globals.get("ConvProperties");
+  conv_properties = pyodide.globals.get("conv_properties");
 }
 
 /**
@@ -301,12 +301,7 @@ function setupPlot() {
  */
 function currentXChanged() {
   // compute the next convAtXResult
-  state.convAtXResult = conv_at_x(
-    state.plfA,
-    state.plfB,
-    state.currentX,
-    state.convType
-  );
+  state.convAtXResult = state.convSweep.update(state.currentX);
 
   // update the plot
   let x = [];
@@ -352,7 +347,13 @@ function currentXChanged() {
  */
 function redrawPlot() {
   // Recompute the convolution
-  state.convProperties = ConvProperties(state.plfA, state.plfB, state.convType);
+  state.convProperties = conv_properties(state.plfA, state.plfB, state.convType);
+  state.convSweep = ConvSweep(
+    state.plfA,
+    state.plfB,
+    state.convType,
+    state.convProperties.provenance
+  );
   state.currentX = Math.min(
     state.convProperties.slider_max,
     Math.max(state.convProperties.slider_min, state.currentX)